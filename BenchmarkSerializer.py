@@ -0,0 +1,47 @@
+import json
+import sys
+import time
+
+from Core.Notebook import Notebook
+from SaveAndLoad.JSONSerializer import Decoder, JSONSerializer
+
+
+def BenchmarkSerializer(NotebookPath, Repetitions=5):
+    # Benchmark Functions
+    def GetBestTime(Function):
+        BestTime = None
+        for Repetition in range(Repetitions):
+            StartTime = time.perf_counter()
+            Function()
+            ElapsedTime = time.perf_counter() - StartTime
+            BestTime = ElapsedTime if BestTime is None else min(BestTime, ElapsedTime)
+        return BestTime
+
+    def PrintResult(Description, BestTime, BaselineTime):
+        print(Description.ljust(40) + ("%.1f ms" % (BestTime * 1000)).rjust(12) + ("%.2fx" % (BaselineTime / BestTime)).rjust(10))
+
+    # Load Notebook
+    Serializer = JSONSerializer((Notebook,))
+    with open(NotebookPath, "r") as NotebookFile:
+        NotebookString = NotebookFile.read()
+    LoadedNotebook = Serializer.DeserializeDataFromJSONString(NotebookString)
+    IndentedString = Serializer.SerializeDataToJSONString(LoadedNotebook)
+    CompactString = Serializer.SerializeDataToJSONString(LoadedNotebook, Compact=True)
+    print(NotebookPath + ":  " + str(len(LoadedNotebook.PagesByID)) + " pages, best of " + str(Repetitions))
+    print("Indented size:  " + str(len(IndentedString.encode("utf-8"))) + " bytes")
+    print("Compact size:  " + str(len(CompactString.encode("utf-8"))) + " bytes")
+
+    # Load Times
+    HookedLoadTime = GetBestTime(lambda: json.loads(IndentedString, cls=lambda: Decoder(Serializer.ObjectTypeCalls)))
+    PrintResult("Load with object hook", HookedLoadTime, HookedLoadTime)
+    PrintResult("Load without object hook", GetBestTime(lambda: Serializer.DeserializeDataFromJSONString(IndentedString)), HookedLoadTime)
+    PrintResult("Load compact without object hook", GetBestTime(lambda: Serializer.DeserializeDataFromJSONString(CompactString)), HookedLoadTime)
+
+    # Save Times
+    IndentedSaveTime = GetBestTime(lambda: Serializer.SerializeDataToJSONString(LoadedNotebook))
+    PrintResult("Save indented", IndentedSaveTime, IndentedSaveTime)
+    PrintResult("Save compact", GetBestTime(lambda: Serializer.SerializeDataToJSONString(LoadedNotebook, Compact=True)), IndentedSaveTime)
+
+
+if __name__ == "__main__":
+    BenchmarkSerializer(sys.argv[1] if len(sys.argv) > 1 else "TestNotebook.ntbk")
@@ -0,0 +1,97 @@
+from Core import Base64Converters
+
+
+class ChangeTracker:
+    def __init__(self):
+        # Variables
+        self.Clear()
+
+    def Clear(self):
+        self.Records = []
+        self.DirtyPages = {}
+        self.DirtyImages = set()
+        self.DirtyTemplates = set()
+        self.ClearCheckpoint()
+
+    def HasChanges(self):
+        return len(self.Records) > 0 or len(self.DirtyPages) > 0 or len(self.DirtyImages) > 0 or len(self.DirtyTemplates) > 0
+
+    # Recording Methods
+    def RecordOperation(self, Record):
+        self.Records.append(Record)
+
+    def MarkPageDirty(self, Page):
+        self.DirtyPages[Page["PageID"]] = Page
+
+    def MarkImageDirty(self, FileName):
+        self.DirtyImages.add(FileName)
+
+    def RenameDirtyImage(self, FileName, NewFileName):
+        if FileName in self.DirtyImages:
+            self.DirtyImages.remove(FileName)
+            self.DirtyImages.add(NewFileName)
+        if FileName in self.CheckpointImages:
+            self.CheckpointImages.remove(FileName)
+            self.CheckpointImages.add(NewFileName)
+
+    def DiscardDirtyImage(self, FileName):
+        self.DirtyImages.discard(FileName)
+        self.CheckpointImages.discard(FileName)
+
+    def MarkTemplateDirty(self, TemplateName):
+        self.DirtyTemplates.add(TemplateName)
+
+    def RenameDirtyTemplate(self, TemplateName, NewTemplateName):
+        if TemplateName in self.DirtyTemplates:
+            self.DirtyTemplates.remove(TemplateName)
+            self.DirtyTemplates.add(NewTemplateName)
+        if TemplateName in self.CheckpointTemplates:
+            self.CheckpointTemplates.remove(TemplateName)
+            self.CheckpointTemplates.add(NewTemplateName)
+
+    def DiscardDirtyTemplate(self, TemplateName):
+        self.DirtyTemplates.discard(TemplateName)
+        self.CheckpointTemplates.discard(TemplateName)
+
+    # Checkpoint Methods
+    def Checkpoint(self):
+        # Changes are set aside until a save settles, so a failed save can hand them back
+        self.CheckpointRecords = self.CheckpointRecords + self.Records
+        self.CheckpointPages.update(self.DirtyPages)
+        self.CheckpointImages.update(self.DirtyImages)
+        self.CheckpointTemplates.update(self.DirtyTemplates)
+        self.Records = []
+        self.DirtyPages = {}
+        self.DirtyImages = set()
+        self.DirtyTemplates = set()
+
+    def RestoreCheckpoint(self):
+        self.Records = self.CheckpointRecords + self.Records
+        self.DirtyPages = {**self.CheckpointPages, **self.DirtyPages}
+        self.DirtyImages.update(self.CheckpointImages)
+        self.DirtyTemplates.update(self.CheckpointTemplates)
+        self.ClearCheckpoint()
+
+    def ClearCheckpoint(self):
+        self.CheckpointRecords = []
+        self.CheckpointPages = {}
+        self.CheckpointImages = set()
+        self.CheckpointTemplates = set()
+
+    # Record Methods
+    def TakeRecords(self, Notebook, EncodeImages=True):
+        Records = self.Records
+        for PageID, Page in self.DirtyPages.items():
+            if Notebook.GetPageFromPageID(PageID) is Page:
+                Records.append({"Operation": "SetPageContent", "PageID": PageID, "Content": Page["Content"]})
+        for FileName in sorted(self.DirtyImages):
+            if Notebook.HasImage(FileName):
+                if EncodeImages:
+                    Records.append({"Operation": "SetImage", "FileName": FileName, "Base64String": Base64Converters.GetBase64StringFromBinary(Notebook.GetImage(FileName))})
+                else:
+                    Records.append({"Operation": "SetImage", "FileName": FileName, "Data": Notebook.GetImage(FileName)})
+        for TemplateName in sorted(self.DirtyTemplates):
+            if Notebook.HasTemplate(TemplateName):
+                Records.append({"Operation": "AddTemplate", "TemplateName": TemplateName, "TemplateContent": Notebook.GetTemplate(TemplateName)})
+        self.Clear()
+        return Records
@@ -0,0 +1,128 @@
+import hashlib
+
+from Core import Base64Converters
+from Core.LazyContent import DeferredValue, LazyDict, LazyValue
+
+
+class ImageStore:
+    ProvisionalKeyPrefix = "file:"
+
+    def __init__(self, Images=None):
+        # Variables
+        self.ImageKeys = {}
+        self.Payloads = LazyDict()
+
+        # Add Images
+        if Images is not None:
+            DecodedKeys = {}
+            for FileName, Data in dict.items(Images):
+                if isinstance(Data, LazyValue):
+                    # The hash of a lazily loaded image is only known once it is loaded
+                    Key = self.ProvisionalKeyPrefix + FileName
+                    self.ImageKeys[FileName] = Key
+                    self.Payloads[Key] = Data
+                elif isinstance(Data, str) and Data in DecodedKeys:
+                    self.ImageKeys[FileName] = DecodedKeys[Data]
+                else:
+                    self.SetImage(FileName, Data)
+                    if isinstance(Data, str):
+                        DecodedKeys[Data] = self.ImageKeys[FileName]
+
+    def __contains__(self, FileName):
+        return FileName in self.ImageKeys
+
+    def __len__(self):
+        return len(self.ImageKeys)
+
+    def __iter__(self):
+        return iter(self.ImageKeys)
+
+    @classmethod
+    def CreateFromPayloads(cls, ImageKeys, Payloads):
+        NewImageStore = cls()
+        NewImageStore.ImageKeys = dict(ImageKeys)
+        NewImageStore.Payloads = LazyDict(dict.items(Payloads))
+        return NewImageStore
+
+    # Image Methods
+    def GetImageNames(self):
+        return sorted(self.ImageKeys.keys())
+
+    def GetImage(self, FileName):
+        Key = self.ImageKeys[FileName]
+        Data = self.Payloads[Key]
+        if self.IsProvisionalKey(Key):
+            del self.Payloads[Key]
+            Data = self.DecodeImage(Data)
+            Key = self.GetContentHash(Data)
+            self.ImageKeys[FileName] = Key
+            if Key in self.Payloads:
+                return self.Payloads[Key]
+            self.Payloads[Key] = Data
+        return Data
+
+    def PeekImage(self, FileName):
+        return self.DecodeImage(self.Payloads.PeekItem(self.ImageKeys[FileName]))
+
+    def GetImageKey(self, FileName):
+        Key = self.ImageKeys[FileName]
+        return Key if not self.IsProvisionalKey(Key) else self.GetContentHash(self.PeekImage(FileName))
+
+    def HasPayload(self, Key):
+        return Key in self.Payloads
+
+    def SetImage(self, FileName, Data):
+        Data = self.DecodeImage(Data)
+        Key = self.GetContentHash(Data)
+        if Key not in self.Payloads:
+            self.Payloads[Key] = Data
+        self.SetImageKey(FileName, Key)
+
+    def RenameImage(self, FileName, NewFileName):
+        self.SetImageKey(NewFileName, self.ImageKeys.pop(FileName))
+
+    def DeleteImage(self, FileName):
+        self.ReleasePayload(self.ImageKeys.pop(FileName))
+
+    def SetImageKey(self, FileName, Key):
+        PreviousKey = self.ImageKeys.get(FileName)
+        self.ImageKeys[FileName] = Key
+        if PreviousKey is not None and PreviousKey != Key:
+            self.ReleasePayload(PreviousKey)
+
+    def ReleasePayload(self, Key):
+        if Key in self.Payloads and Key not in self.ImageKeys.values():
+            del self.Payloads[Key]
+
+    def IsLoaded(self, FileName):
+        return self.Payloads.IsLoaded(self.ImageKeys[FileName])
+
+    def DetachAll(self):
+        self.Payloads.DetachAll()
+
+    def GetStoredPayload(self, FileName):
+        return self.Payloads.GetStoredItem(self.ImageKeys[FileName])
+
+    def GetPayloadItems(self):
+        return [(self.Payloads, Key) for Key in self.Payloads]
+
+    def copy(self):
+        return self.CreateFromPayloads(self.ImageKeys, self.Payloads)
+
+    def IsProvisionalKey(self, Key):
+        return Key.startswith(self.ProvisionalKeyPrefix)
+
+    def DecodeImage(self, Data):
+        # Images from legacy files arrive as base64
+        return Base64Converters.GetBinaryFromBase64String(Data) if isinstance(Data, str) else bytes(Data)
+
+    def GetContentHash(self, Data):
+        return hashlib.sha256(Data).hexdigest()
+
+    # Base64 Methods
+    def GetBase64String(self, FileName):
+        Data = self.Payloads.PeekItem(self.ImageKeys[FileName])
+        return Data if isinstance(Data, str) else Base64Converters.GetBase64StringFromBinary(Data)
+
+    def GetBase64Images(self):
+        return LazyDict((FileName, DeferredValue(self.GetBase64String, FileName)) for FileName in self.ImageKeys)
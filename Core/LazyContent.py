@@ -0,0 +1,130 @@
+import abc
+import copy
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+class LazyValue(metaclass=abc.ABCMeta):
+    ParallelLoad = False
+
+    @abc.abstractmethod
+    def Load(self):
+        pass
+
+    def Detach(self):
+        # Values that can be kept without their source file return a copy here; the rest are loaded instead
+        return None
+
+    def __deepcopy__(self, Memo):
+        return self
+
+
+class MappedString(LazyValue):
+    def __init__(self, Buffer, Start, End):
+        # Store Parameters
+        self.Buffer = Buffer
+        self.Start = Start
+        self.End = End
+
+    def Load(self):
+        return json.loads(self.Buffer[self.Start:self.End])
+
+    def Detach(self):
+        StoredData = bytes(self.Buffer[self.Start:self.End])
+        return MappedString(StoredData, 0, len(StoredData))
+
+
+class DeferredValue(LazyValue):
+    def __init__(self, Loader, Key):
+        # Store Parameters
+        self.Loader = Loader
+        self.Key = Key
+
+    def Load(self):
+        return self.Loader(self.Key)
+
+
+class LazyDict(dict):
+    def __getitem__(self, Key):
+        Value = super().__getitem__(Key)
+        if isinstance(Value, LazyValue):
+            Value = Value.Load()
+            super().__setitem__(Key, Value)
+        return Value
+
+    def PeekItem(self, Key):
+        Value = super().__getitem__(Key)
+        return Value.Load() if isinstance(Value, LazyValue) else Value
+
+    def IsLoaded(self, Key):
+        return not isinstance(super().__getitem__(Key), LazyValue)
+
+    def DetachAll(self):
+        for Key, Value in list(super().items()):
+            if isinstance(Value, LazyValue):
+                DetachedValue = Value.Detach()
+                super().__setitem__(Key, DetachedValue if DetachedValue is not None else Value.Load())
+
+    def GetStoredItem(self, Key):
+        return super().__getitem__(Key)
+
+    def RenameItem(self, Key, NewKey):
+        super().__setitem__(NewKey, super().pop(Key))
+
+    def get(self, Key, Default=None):
+        return self[Key] if Key in self else Default
+
+    def items(self):
+        return [(Key, self[Key]) for Key in self]
+
+    def values(self):
+        return [self[Key] for Key in self]
+
+    def pop(self, Key, *Default):
+        if Key not in self:
+            return super().pop(Key, *Default)
+        Value = self[Key]
+        super().__delitem__(Key)
+        return Value
+
+    def copy(self):
+        return self.__class__(super().items())
+
+    def __deepcopy__(self, Memo):
+        DictionaryCopy = self.__class__()
+        Memo[id(self)] = DictionaryCopy
+        for Key, Value in super().items():
+            dict.__setitem__(DictionaryCopy, Key, copy.deepcopy(Value, Memo))
+        return DictionaryCopy
+
+    def __eq__(self, Other):
+        return dict(self.items()) == (dict(Other.items()) if isinstance(Other, LazyDict) else Other)
+
+    def __ne__(self, Other):
+        return not self == Other
+
+    __hash__ = None
+
+
+def PeekPageContent(Page):
+    return Page.PeekItem("Content") if isinstance(Page, LazyDict) else Page["Content"]
+
+
+@contextmanager
+def ParallelLoadedItems(Items):
+    # Values that release the GIL while loading are loaded together on a thread pool, then put back unloaded afterwards if unchanged
+    PendingItems = [(Dictionary, Key, dict.get(Dictionary, Key)) for Dictionary, Key in Items if isinstance(Dictionary, LazyDict) and getattr(dict.get(Dictionary, Key), "ParallelLoad", False)]
+    LoadedValues = []
+    if len(PendingItems) > 1:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as Executor:
+            LoadedValues = list(Executor.map(lambda PendingItem: PendingItem[2].Load(), PendingItems))
+        for (Dictionary, Key, Value), LoadedValue in zip(PendingItems, LoadedValues):
+            dict.__setitem__(Dictionary, Key, LoadedValue)
+    try:
+        yield
+    finally:
+        for (Dictionary, Key, Value), LoadedValue in zip(PendingItems, LoadedValues):
+            if dict.get(Dictionary, Key) is LoadedValue:
+                dict.__setitem__(Dictionary, Key, Value)
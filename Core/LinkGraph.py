@@ -0,0 +1,98 @@
+import re
+
+from Core.LazyContent import PeekPageContent
+
+
+class LinkGraph:
+    def __init__(self, PageLinkPrefix):
+        # Variables
+        self.LinkPattern = re.compile(r"\]\(" + re.escape(PageLinkPrefix) + r"(\d+)\)")
+        self.Pages = {}
+        self.OutgoingLinks = {}
+        self.IncomingLinks = {}
+        self.StalePages = {}
+        self.Generation = 0
+
+    # Graph Methods
+    def Build(self, RootPage):
+        self.Clear()
+        self.AddPageAndSubPages(RootPage)
+        self.Generation += 1
+
+    def Clear(self):
+        self.Pages.clear()
+        self.OutgoingLinks.clear()
+        self.IncomingLinks.clear()
+        self.StalePages.clear()
+
+    def AddPageAndSubPages(self, Page):
+        self.AddPage(Page)
+        for SubPage in Page["SubPages"]:
+            self.AddPageAndSubPages(SubPage)
+
+    def RemovePageAndSubPages(self, Page):
+        self.RemovePage(Page)
+        for SubPage in Page["SubPages"]:
+            self.RemovePageAndSubPages(SubPage)
+
+    def MarkPageStale(self, Page):
+        if Page["PageID"] in self.Pages:
+            self.StalePages[Page["PageID"]] = Page
+
+    def RefreshStalePages(self):
+        StalePages = list(self.StalePages.values())
+        self.StalePages.clear()
+        for Page in StalePages:
+            PreviousOutgoingLinks = self.OutgoingLinks[Page["PageID"]]
+            self.RemovePage(Page)
+            self.AddPage(Page)
+            if self.OutgoingLinks[Page["PageID"]] != PreviousOutgoingLinks:
+                self.Generation += 1
+
+    def AddPage(self, Page):
+        PageID = Page["PageID"]
+        self.Pages[PageID] = Page
+        OutgoingLinks = {}
+        Content = PeekPageContent(Page)
+        if "](" in Content:
+            for LinkedPageIDString in self.LinkPattern.findall(Content):
+                LinkedPageID = int(LinkedPageIDString)
+                OutgoingLinks[LinkedPageID] = OutgoingLinks.get(LinkedPageID, 0) + 1
+        self.OutgoingLinks[PageID] = OutgoingLinks
+        for LinkedPageID, LinkCount in OutgoingLinks.items():
+            if LinkedPageID in self.IncomingLinks:
+                self.IncomingLinks[LinkedPageID][PageID] = LinkCount
+            else:
+                self.IncomingLinks[LinkedPageID] = {PageID: LinkCount}
+
+    def RemovePage(self, Page):
+        PageID = Page["PageID"]
+        if PageID not in self.Pages:
+            return
+        for LinkedPageID in self.OutgoingLinks[PageID]:
+            LinkingPageCounts = self.IncomingLinks[LinkedPageID]
+            del LinkingPageCounts[PageID]
+            if len(LinkingPageCounts) < 1:
+                del self.IncomingLinks[LinkedPageID]
+        del self.Pages[PageID]
+        del self.OutgoingLinks[PageID]
+        self.StalePages.pop(PageID, None)
+
+    # Query Methods
+    def GetLinkingPages(self, Page):
+        self.RefreshStalePages()
+        LinkingPageCounts = self.IncomingLinks.get(Page["PageID"], {})
+        LinkingPages = [(self.Pages[LinkingPageID], LinkCount) for LinkingPageID, LinkCount in LinkingPageCounts.items()]
+        LinkingPages.sort(key=lambda LinkingPage: (-LinkingPage[1], LinkingPage[0]["IndexPath"]))
+        return [LinkingPage[0] for LinkingPage in LinkingPages]
+
+    def GetBrokenLinks(self):
+        self.RefreshStalePages()
+        BrokenLinks = []
+        for LinkedPageID, LinkingPageCounts in self.IncomingLinks.items():
+            if LinkedPageID in self.Pages:
+                continue
+            for LinkingPageID, LinkCount in LinkingPageCounts.items():
+                BrokenLinks.append((self.Pages[LinkingPageID], LinkedPageID, LinkCount))
+        BrokenLinks.sort(key=lambda BrokenLink: (BrokenLink[0]["IndexPath"], BrokenLink[1]))
+        return BrokenLinks
@@ -0,0 +1,93 @@
+from collections import deque
+
+
+class LinkRewriter:
+    def __init__(self, Replacements):
+        # Variables
+        self.Replacements = {SearchString: ReplaceString for SearchString, ReplaceString in Replacements.items() if SearchString != ""}
+        self.Transitions = [{}]
+        self.Failures = [0]
+        self.Outputs = [[]]
+        self.FirstCharacters = {SearchString[0] for SearchString in self.Replacements}
+
+        # Build Automaton
+        for SearchString in self.Replacements:
+            self.AddSearchString(SearchString)
+        self.BuildFailures()
+
+    # Automaton Methods
+    def AddSearchString(self, SearchString):
+        State = 0
+        for Character in SearchString:
+            if Character not in self.Transitions[State]:
+                self.Transitions.append({})
+                self.Failures.append(0)
+                self.Outputs.append([])
+                self.Transitions[State][Character] = len(self.Transitions) - 1
+            State = self.Transitions[State][Character]
+        self.Outputs[State].append(SearchString)
+
+    def BuildFailures(self):
+        Queue = deque(self.Transitions[0].values())
+        while len(Queue) > 0:
+            State = Queue.popleft()
+            for Character, NextState in self.Transitions[State].items():
+                Queue.append(NextState)
+                FailureState = self.Failures[State]
+                while FailureState != 0 and Character not in self.Transitions[FailureState]:
+                    FailureState = self.Failures[FailureState]
+                self.Failures[NextState] = self.Transitions[FailureState].get(Character, 0)
+                self.Outputs[NextState] = self.Outputs[NextState] + self.Outputs[self.Failures[NextState]]
+
+    def FindMatches(self, String):
+        Matches = []
+        JumpCharacter = next(iter(self.FirstCharacters)) if len(self.FirstCharacters) == 1 else None
+        State = 0
+        Position = 0
+        StringLength = len(String)
+        while Position < StringLength:
+            if State == 0 and JumpCharacter is not None:
+                Position = String.find(JumpCharacter, Position)
+                if Position == -1:
+                    break
+            Character = String[Position]
+            while State != 0 and Character not in self.Transitions[State]:
+                State = self.Failures[State]
+            State = self.Transitions[State].get(Character, 0)
+            for SearchString in self.Outputs[State]:
+                Matches.append((Position - len(SearchString) + 1, len(SearchString)))
+            Position += 1
+        return Matches
+
+    # Rewrite Methods
+    def Rewrite(self, String):
+        if len(self.Replacements) < 1:
+            return String
+        Matches = self.FindMatches(String)
+        if len(Matches) < 1:
+            return String
+
+        # Leftmost, then longest, non-overlapping matches are replaced
+        Matches.sort(key=lambda Match: (Match[0], -Match[1]))
+        Pieces = []
+        CopiedUpTo = 0
+        for Start, Length in Matches:
+            if Start < CopiedUpTo:
+                continue
+            Pieces.append(String[CopiedUpTo:Start])
+            Pieces.append(self.Replacements[String[Start:Start + Length]])
+            CopiedUpTo = Start + Length
+        Pieces.append(String[CopiedUpTo:])
+        return "".join(Pieces)
+
+    def RewritePageAndSubPages(self, Page, RewrittenPages=None):
+        if RewrittenPages is None:
+            RewrittenPages = []
+        if "](" in Page["Content"]:
+            RewrittenContent = self.Rewrite(Page["Content"])
+            if RewrittenContent != Page["Content"]:
+                Page["Content"] = RewrittenContent
+                RewrittenPages.append(Page)
+        for SubPage in Page["SubPages"]:
+            self.RewritePageAndSubPages(SubPage, RewrittenPages)
+        return RewrittenPages
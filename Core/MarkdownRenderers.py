@@ -1,18 +1,21 @@
 import json
 import os
+from urllib.parse import quote
 
 import mistune
 
 from Core import Base64Converters
 
 class Renderer(mistune.Renderer):
+    ImageResourceScheme = "notebook-image"
+
     def __init__(self, Notebook):
         super().__init__()
         self.Notebook = Notebook
 
     def link(self, Link, Title, Text):
         Link = mistune.escape_link(Link)
-        if Link.startswith("[0,") and not self.Notebook.StringIsValidIndexPath(Link):
+        if self.Notebook.StringIsPageLinkTarget(Link) and self.Notebook.GetPageFromLinkTarget(Link) is None:
             return Text + " (LINKED PAGE NOT FOUND)"
         if not Title:
             return "<a href=\"" + Link + "\">" + Text + "</a>"
@@ -42,7 +45,7 @@ class Renderer(mistune.Renderer):
 
     def image(self, Source, Title, AltText):
         if self.Notebook.HasImage(Source):
-            Source = "data:image/" + os.path.splitext(Source)[1] + ";base64, " + self.Notebook.GetImage(Source)
+            Source = self.GetImageSource(Source)
             AltText = mistune.escape(AltText, quote=True)
             if Title is not None:
                 Title = mistune.escape(Title, quote=True)
@@ -55,6 +58,9 @@ class Renderer(mistune.Renderer):
         else:
             return "IMAGE NOT FOUND|" + Source + (("|" + AltText) if AltText != "" else "") + (("|" + Title) if Title is not None and Title != "" else "")
 
+    def GetImageSource(self, Source):
+        return self.ImageResourceScheme + ":///" + quote(Source)
+
 
 class HTMLExportRenderer(Renderer):
     def __init__(self, Notebook):
@@ -62,43 +68,55 @@ class HTMLExportRenderer(Renderer):
 
     def link(self, Link, Title, Text):
         Link = mistune.escape_link(Link)
-        ValidIndexPath = self.Notebook.StringIsValidIndexPath(Link)
-        if Link.startswith("[0,") and not ValidIndexPath:
+        LinkedPage = self.Notebook.GetPageFromLinkTarget(Link)
+        if self.Notebook.StringIsPageLinkTarget(Link) and LinkedPage is None:
             return Text + " (LINKED PAGE NOT FOUND)"
         if Title:
             Title = mistune.escape(Title, quote=True)
-        if ValidIndexPath:
+        if LinkedPage is not None:
+            LinkedIndexPath = str(LinkedPage["IndexPath"])
             if not Title:
-                return "<a href=\"\" onclick=\"return SelectPage(&quot;" + Link + "&quot;);\">" + Text + "</a>"
-            return "<a href=\"\" onclick=\"return SelectPage(&quot;" + Link + "&quot;);\" title=\"" + Title + "\">" + Text + "</a>"
+                return "<a href=\"\" onclick=\"return SelectPage(&quot;" + LinkedIndexPath + "&quot;);\">" + Text + "</a>"
+            return "<a href=\"\" onclick=\"return SelectPage(&quot;" + LinkedIndexPath + "&quot;);\" title=\"" + Title + "\">" + Text + "</a>"
         else:
             if not Title:
                 return "<a href=\"" + Link + "\" target=\"_blank\">" + Text + "</a>"
             return "<a href=\"" + Link + "\" title=\"" + Title + "\" target=\"_blank\">" + Text + "</a>"
 
+    def GetImageSource(self, Source):
+        return "data:image/" + os.path.splitext(Source)[1] + ";base64, " + self.Notebook.GetImageBase64String(Source)
+
 
 def ConstructMarkdownStringFromPage(Page, Notebook):
-    HeaderString = Notebook.Header + "\n\n"
-    HeaderString = HeaderString.replace("{PAGETITLE}", Page["Title"])
-    HeaderString = HeaderString.replace("{SUBPAGELINKS}", ConstructSubPageLinks(Page))
-    HeaderString = HeaderString.replace("{SUBPAGEOFLINK}", ConstructSubPageOfLink(Page, Notebook))
-    HeaderString = HeaderString.replace("{LINKINGPAGES}", ConstructLinkingPagesLinks(Page, Notebook))
-    FooterString = "\n\n" + Notebook.Footer
-    FooterString = FooterString.replace("{PAGETITLE}", Page["Title"])
-    FooterString = FooterString.replace("{SUBPAGELINKS}", ConstructSubPageLinks(Page))
-    FooterString = FooterString.replace("{SUBPAGEOFLINK}", ConstructSubPageOfLink(Page, Notebook))
-    FooterString = FooterString.replace("{LINKINGPAGES}", ConstructLinkingPagesLinks(Page, Notebook))
+    PlaceholderValues = {}
+    HeaderString = ConstructHeaderOrFooterString(Notebook.CompiledHeader, Page, Notebook, PlaceholderValues) + "\n\n"
+    FooterString = "\n\n" + ConstructHeaderOrFooterString(Notebook.CompiledFooter, Page, Notebook, PlaceholderValues)
     MarkdownString = HeaderString + Page["Content"] + FooterString
     return MarkdownString
 
 
-def ConstructSubPageLinks(Page):
+def ConstructHeaderOrFooterString(CompiledHeaderOrFooter, Page, Notebook, PlaceholderValues):
+    HeaderOrFooterString = ""
+    for Text, Placeholder in CompiledHeaderOrFooter:
+        HeaderOrFooterString += Text
+        if Placeholder is not None:
+            if Placeholder not in PlaceholderValues:
+                PlaceholderValues[Placeholder] = PlaceholderConstructors[Placeholder](Page, Notebook)
+            HeaderOrFooterString += PlaceholderValues[Placeholder]
+    return HeaderOrFooterString
+
+
+def ConstructPageTitle(Page, Notebook):
+    return Page["Title"]
+
+
+def ConstructSubPageLinks(Page, Notebook):
     if len(Page["SubPages"]) < 1:
         LinksString = "No sub pages."
     else:
         LinksString = ""
         for SubPage in Page["SubPages"]:
-            LinksString += "[" + SubPage["Title"] + "](" + json.dumps(SubPage["IndexPath"]) + ")  \n"
+            LinksString += "[" + SubPage["Title"] + "](" + Notebook.GetPageLinkTarget(SubPage) + ")  \n"
         LinksString = LinksString.rstrip()
     return LinksString
 
@@ -108,21 +126,24 @@ def ConstructSubPageOfLink(Page, Notebook):
         LinkString = "This is the root page."
     else:
         SuperPage = Notebook.GetSuperOfPageFromIndexPath(Page["IndexPath"])
-        LinkString = "[" + SuperPage["Title"] + "](" + json.dumps(SuperPage["IndexPath"]) + ")"
+        LinkString = "[" + SuperPage["Title"] + "](" + Notebook.GetPageLinkTarget(SuperPage) + ")"
     return LinkString
 
 def ConstructLinkingPagesLinks(Page, Notebook):
-    SearchResults = Notebook.GetSearchResults("](" + json.dumps(Page["IndexPath"]) + ")")
-    if len(SearchResults) < 1:
+    LinkingPages = Notebook.GetLinkingPages(Page)
+    if len(LinkingPages) < 1:
         LinksString = "No linking pages."
     else:
         LinksString = ""
-        for Result in SearchResults:
-            LinksString += "[" + Result[0] + "](" + json.dumps(Result[1]) + ")  \n"
+        for LinkingPage in LinkingPages:
+            LinksString += "[" + LinkingPage["Title"] + "](" + Notebook.GetPageLinkTarget(LinkingPage) + ")  \n"
         LinksString = LinksString.rstrip()
     return LinksString
 
 
+PlaceholderConstructors = {"PAGETITLE": ConstructPageTitle, "SUBPAGELINKS": ConstructSubPageLinks, "SUBPAGEOFLINK": ConstructSubPageOfLink, "LINKINGPAGES": ConstructLinkingPagesLinks}
+
+
 def ConstructHTMLExportString(Notebook, AssetPaths):
     with open(AssetPaths["TemplatePath"], "r") as TemplateFile:
         TemplateText = TemplateFile.read()
@@ -1,22 +1,48 @@
 import json
 import os
+import re
+import uuid
 
 from Core import Base64Converters
+from Core.ChangeTracker import ChangeTracker
+from Core.ImageStore import ImageStore
+from Core.LazyContent import LazyDict, ParallelLoadedItems
+from Core.LinkGraph import LinkGraph
+from Core.LinkRewriter import LinkRewriter
+from Core.SearchIndex import DatabaseSearchIndex, SearchEngines
 from SaveAndLoad.JSONSerializer import SerializableMixin
 
 
 class Notebook(SerializableMixin):
+    StateContainsObjects = False
+
     def __init__(self):
         # Variables
+        self.JournalingEnabled = False
+        self.JournalID = None
+        self.JournalChanges = ChangeTracker()
+        self.AutosaveChanges = ChangeTracker()
+        self.ChangeTrackers = [self.JournalChanges, self.AutosaveChanges]
         self.DefaultHeader = "# {PAGETITLE}"
         self.DefaultFooter = "***\n\nSub Pages:\n\n{SUBPAGELINKS}\n\nSub Page Of:  {SUBPAGEOFLINK}\n\nLinking Pages:\n\n{LINKINGPAGES}"
-        self.Header = self.DefaultHeader
-        self.Footer = self.DefaultFooter
+        self.HeaderAndFooterPlaceholderPattern = re.compile(r"\{(PAGETITLE|SUBPAGELINKS|SUBPAGEOFLINK|LINKINGPAGES)\}")
+        self.SetHeader(self.DefaultHeader)
+        self.SetFooter(self.DefaultFooter)
+        self.PageLinkPrefix = "page:"
+        self.NextPageID = 0
+        self.PagesByID = {}
+        self.LinkGeneration = 0
         self.RootPage = self.CreatePage("New Notebook")
-        self.Images = {}
+        self.RegisterPageAndSubPages(self.RootPage)
+        self.Images = ImageStore()
         self.PageTemplates = {}
+        self.SearchEngine = "Token"
+        self.SearchDatabase = None
         self.SearchIndexUpToDate = False
-        self.SearchIndex = []
+        self.SearchIndex = self.CreateSearchIndex()
+        self.LinkGraphUpToDate = False
+        self.LinkGraph = LinkGraph(self.PageLinkPrefix)
+        self.JournalingEnabled = True
 
     # Page Methods
     def CreatePage(self, Title="New Page", Content="", IndexPath=None):
@@ -25,6 +51,7 @@ class Notebook(SerializableMixin):
         Page = {}
         Page["Title"] = Title
         Page["Content"] = Content
+        Page["PageID"] = self.GetNewPageID()
         Page["IndexPath"] = IndexPath
         Page["SubPages"] = []
         return Page
@@ -39,13 +66,25 @@ class Notebook(SerializableMixin):
             return
         SuperPage["SubPages"].append(PageToAdd)
         self.UpdateIndexPaths()
+        self.RegisterPageAndSubPages(PageToAdd)
+        if self.SearchIndexUpToDate:
+            self.SearchIndex.AddPageAndSubPages(PageToAdd)
+        if self.LinkGraphUpToDate:
+            self.LinkGraph.AddPageAndSubPages(PageToAdd)
+        self.RecordJournalOperation("AddSubPage", SuperPageID=SuperPage["PageID"], Page=self.CopyPageAndSubPages(PageToAdd), NextPageID=self.NextPageID)
 
     def DeleteSubPage(self, IndexPath):
         SuperPage = self.GetSuperOfPageFromIndexPath(IndexPath)
         if SuperPage is None:
             return
-        del SuperPage["SubPages"][IndexPath[-1]]
+        DeletedPage = SuperPage["SubPages"].pop(IndexPath[-1])
         self.UpdateIndexPaths()
+        self.UnregisterPageAndSubPages(DeletedPage)
+        if self.SearchIndexUpToDate:
+            self.SearchIndex.RemovePageAndSubPages(DeletedPage)
+        if self.LinkGraphUpToDate:
+            self.LinkGraph.RemovePageAndSubPages(DeletedPage)
+        self.RecordJournalOperation("DeleteSubPage", PageID=DeletedPage["PageID"])
 
     def MoveSubPage(self, IndexPath, Delta):
         SuperPage = self.GetSuperOfPageFromIndexPath(IndexPath)
@@ -60,24 +99,60 @@ class Notebook(SerializableMixin):
         SuperPage["SubPages"][PageToMoveIndex] = TargetPage
         SuperPage["SubPages"][TargetPageIndex] = PageToMove
         self.UpdateIndexPaths()
+        self.RecordJournalOperation("MoveSubPage", PageID=PageToMove["PageID"], Delta=Delta)
         return True
 
     def PromoteSubPage(self, IndexPath):
         SuperPage = self.GetSuperOfPageFromIndexPath(IndexPath)
         if SuperPage["IndexPath"] == [0] or IndexPath == [0]:
             return
-        CurrentPage = self.GetPageFromIndexPath(IndexPath)
-        self.DeleteSubPage(IndexPath)
-        SuperOfSuperIndexPath = self.GetSuperOfPageFromIndexPath(self.GetSuperOfPageFromIndexPath(IndexPath)["IndexPath"])["IndexPath"]
-        self.AddSubPage(SuperPageIndexPath=SuperOfSuperIndexPath, PageToAdd=CurrentPage)
+        SuperOfSuperPage = self.GetSuperOfPageFromIndexPath(SuperPage["IndexPath"])
+        CurrentPage = SuperPage["SubPages"].pop(IndexPath[-1])
+        SuperOfSuperPage["SubPages"].append(CurrentPage)
+        self.UpdateIndexPaths()
+        self.RecordJournalOperation("PromoteSubPage", PageID=CurrentPage["PageID"])
 
     def DemoteSubPage(self, IndexPath, SiblingPageIndex):
         if IndexPath == [0]:
             return
-        CurrentPage = self.GetPageFromIndexPath(IndexPath)
-        TargetSiblingPage = self.GetPageFromIndexPath(IndexPath[:-1] + [SiblingPageIndex])
-        self.DeleteSubPage(IndexPath)
-        self.AddSubPage(SuperPageIndexPath=TargetSiblingPage["IndexPath"], PageToAdd=CurrentPage)
+        SuperPage = self.GetSuperOfPageFromIndexPath(IndexPath)
+        TargetSiblingPage = SuperPage["SubPages"][SiblingPageIndex]
+        CurrentPage = SuperPage["SubPages"].pop(IndexPath[-1])
+        TargetSiblingPage["SubPages"].append(CurrentPage)
+        self.UpdateIndexPaths()
+        self.RecordJournalOperation("DemoteSubPage", PageID=CurrentPage["PageID"], SiblingPageID=TargetSiblingPage["PageID"])
+
+    def ImportPage(self, PageToImport, SuperPageIndexPath=None):
+        LinkTargets = {}
+        self.AssignImportedPageIDs(PageToImport, LinkTargets)
+        self.GetLinkRewriter(LinkTargets).RewritePageAndSubPages(PageToImport)
+        self.AddSubPage(SuperPageIndexPath=SuperPageIndexPath, PageToAdd=PageToImport)
+
+    def AssignImportedPageIDs(self, Page, LinkTargets):
+        OldLinkTargets = [json.dumps(Page["IndexPath"], indent=None)]
+        if "PageID" in Page:
+            OldLinkTargets.append(self.GetPageLinkTarget(Page))
+        Page["PageID"] = self.GetNewPageID()
+        Page["SubPages"] = Page.pop("SubPages")
+        for OldLinkTarget in OldLinkTargets:
+            LinkTargets[OldLinkTarget] = self.GetPageLinkTarget(Page)
+        for SubPage in Page["SubPages"]:
+            self.AssignImportedPageIDs(SubPage, LinkTargets)
+
+    def RenamePage(self, IndexPath, NewTitle):
+        Page = self.GetPageFromIndexPath(IndexPath)
+        if Page is None:
+            return
+        Page["Title"] = NewTitle
+        self.SearchIndex.MarkPageStale(Page)
+        self.LinkGeneration += 1
+        self.RecordJournalOperation("RenamePage", PageID=Page["PageID"], Title=NewTitle)
+
+    def SetPageContent(self, Page, Content):
+        Page["Content"] = Content
+        self.SearchIndex.MarkPageStale(Page)
+        self.LinkGraph.MarkPageStale(Page)
+        self.MarkPageDirty(Page)
 
     def GetPageFromIndexPath(self, IndexPath):
         if len(IndexPath) < 1:
@@ -94,6 +169,7 @@ class Notebook(SerializableMixin):
         return self.GetPageFromIndexPath(IndexPath[:-1])
 
     def UpdateIndexPaths(self):
+        self.LinkGeneration += 1
         self.RootPage["IndexPath"] = [0]
         self.UpdateSubPageIndexPaths(self.RootPage["IndexPath"], self.RootPage["SubPages"])
 
@@ -102,6 +178,74 @@ class Notebook(SerializableMixin):
             SubPagesList[Index]["IndexPath"] = CurrentIndexPath + [Index]
             self.UpdateSubPageIndexPaths(SubPagesList[Index]["IndexPath"], SubPagesList[Index]["SubPages"])
 
+    # Page ID and Link Methods
+    def GetNewPageID(self):
+        PageID = self.NextPageID
+        self.NextPageID += 1
+        return PageID
+
+    def RegisterPageAndSubPages(self, Page):
+        self.PagesByID[Page["PageID"]] = Page
+        for SubPage in Page["SubPages"]:
+            self.RegisterPageAndSubPages(SubPage)
+
+    def UnregisterPageAndSubPages(self, Page):
+        del self.PagesByID[Page["PageID"]]
+        for SubPage in Page["SubPages"]:
+            self.UnregisterPageAndSubPages(SubPage)
+
+    def GetPageFromPageID(self, PageID):
+        return self.PagesByID.get(PageID)
+
+    def GetPageLinkTarget(self, Page):
+        return self.PageLinkPrefix + str(Page["PageID"])
+
+    def GetPageFromLinkTarget(self, LinkTarget):
+        if LinkTarget.startswith(self.PageLinkPrefix):
+            try:
+                PageID = int(LinkTarget[len(self.PageLinkPrefix):])
+            except ValueError:
+                return None
+            return self.GetPageFromPageID(PageID)
+        if self.StringIsValidIndexPath(LinkTarget):
+            return self.GetPageFromIndexPath(json.loads(LinkTarget))
+        return None
+
+    def StringIsPageLinkTarget(self, LinkTarget):
+        return LinkTarget.startswith(self.PageLinkPrefix) or LinkTarget.startswith("[0,")
+
+    def GetLinkRewriter(self, LinkTargets):
+        return LinkRewriter({"](" + OldLinkTarget + ")": "](" + NewLinkTarget + ")" for OldLinkTarget, NewLinkTarget in LinkTargets.items()})
+
+    def RewriteLinks(self, LinkTargets, RewriteTemplates=True):
+        Rewriter = self.GetLinkRewriter(LinkTargets)
+        RewrittenPages = Rewriter.RewritePageAndSubPages(self.RootPage)
+        for RewrittenPage in RewrittenPages:
+            self.SearchIndex.MarkPageStale(RewrittenPage)
+            self.LinkGraph.MarkPageStale(RewrittenPage)
+            self.MarkPageDirty(RewrittenPage)
+        self.LinkGeneration += 1
+        if RewriteTemplates:
+            for TemplateName, TemplateContent in self.PageTemplates.items():
+                RewrittenTemplateContent = Rewriter.Rewrite(TemplateContent)
+                if RewrittenTemplateContent != TemplateContent:
+                    self.PageTemplates[TemplateName] = RewrittenTemplateContent
+                    self.MarkTemplateDirty(TemplateName)
+        return RewrittenPages
+
+    def MigrateIndexPathLinks(self):
+        LinkTargets = {}
+        self.AssignLegacyPageIDs(self.RootPage, LinkTargets)
+        self.RewriteLinks(LinkTargets)
+
+    def AssignLegacyPageIDs(self, Page, LinkTargets):
+        Page["PageID"] = self.GetNewPageID()
+        # Keep SubPages last so streamed loads see the page's PageID before its subpages
+        Page["SubPages"] = Page.pop("SubPages")
+        LinkTargets[json.dumps(Page["IndexPath"], indent=None)] = self.GetPageLinkTarget(Page)
+        for SubPage in Page["SubPages"]:
+            self.AssignLegacyPageIDs(SubPage, LinkTargets)
+
     def StringIsValidIndexPath(self, IndexPathString):
         try:
             IndexPath = json.loads(IndexPathString)
@@ -133,16 +277,48 @@ class Notebook(SerializableMixin):
     def AddImage(self, FilePath, FileName=None):
         if FileName is None:
             FileName = os.path.basename(FilePath)
-        Base64String = Base64Converters.GetBase64StringFromFilePath(FilePath)
-        self.Images[FileName] = Base64String
+        with open(FilePath, "rb") as ImageFile:
+            Data = ImageFile.read()
+        self.SetImage(FileName, Data)
+
+    def SetImage(self, FileName, Data):
+        self.Images.SetImage(FileName, Data)
+        self.LinkGeneration += 1
+        self.MarkImageDirty(FileName)
+
+    def RenameImage(self, FileName, NewFileName):
+        self.Images.RenameImage(FileName, NewFileName)
+        self.LinkGeneration += 1
+        self.RecordJournalOperation("RenameImage", FileName=FileName, NewFileName=NewFileName)
+        if self.JournalingEnabled:
+            for Tracker in self.ChangeTrackers:
+                Tracker.RenameDirtyImage(FileName, NewFileName)
+
+    def DeleteImage(self, FileName):
+        self.Images.DeleteImage(FileName)
+        self.LinkGeneration += 1
+        self.RecordJournalOperation("DeleteImage", FileName=FileName)
+        if self.JournalingEnabled:
+            for Tracker in self.ChangeTrackers:
+                Tracker.DiscardDirtyImage(FileName)
 
     def GetImage(self, FileName):
         if not self.HasImage(FileName):
             return None
-        return self.Images[FileName]
+        return self.Images.GetImage(FileName)
+
+    def GetImageKey(self, FileName):
+        if not self.HasImage(FileName):
+            return None
+        return self.Images.GetImageKey(FileName)
+
+    def GetImageBase64String(self, FileName):
+        if not self.HasImage(FileName):
+            return None
+        return self.Images.GetBase64String(FileName)
 
     def GetImageNames(self):
-        return sorted(self.Images.keys())
+        return self.Images.GetImageNames()
 
     # Template Methods
     def HasTemplate(self, TemplateName):
@@ -150,6 +326,21 @@ class Notebook(SerializableMixin):
 
     def AddTemplate(self, TemplateName, TemplateContent):
         self.PageTemplates[TemplateName] = TemplateContent
+        self.MarkTemplateDirty(TemplateName)
+
+    def RenameTemplate(self, TemplateName, NewTemplateName):
+        self.PageTemplates[NewTemplateName] = self.PageTemplates.pop(TemplateName)
+        self.RecordJournalOperation("RenameTemplate", TemplateName=TemplateName, NewTemplateName=NewTemplateName)
+        if self.JournalingEnabled:
+            for Tracker in self.ChangeTrackers:
+                Tracker.RenameDirtyTemplate(TemplateName, NewTemplateName)
+
+    def DeleteTemplate(self, TemplateName):
+        del self.PageTemplates[TemplateName]
+        self.RecordJournalOperation("DeleteTemplate", TemplateName=TemplateName)
+        if self.JournalingEnabled:
+            for Tracker in self.ChangeTrackers:
+                Tracker.DiscardDirtyTemplate(TemplateName)
 
     def GetTemplate(self, TemplateName):
         if not self.HasTemplate(TemplateName):
@@ -160,48 +351,268 @@ class Notebook(SerializableMixin):
         return sorted(self.PageTemplates.keys(), key=lambda TemplateName: TemplateName.lower())
 
     # Search Methods
+    def SetSearchEngine(self, SearchEngine):
+        if SearchEngine == self.SearchEngine:
+            return
+        self.SearchEngine = SearchEngine
+        # The database index does not depend on the engine, and rebuilding it would forget renames not yet saved
+        if self.SearchDatabase is None:
+            self.SearchIndex = self.CreateSearchIndex()
+            self.SearchIndexUpToDate = False
+
+    def SetSearchDatabase(self, SearchDatabase):
+        self.SearchDatabase = SearchDatabase
+        self.SearchIndex = self.CreateSearchIndex()
+        self.SearchIndexUpToDate = False
+
+    def CreateSearchIndex(self):
+        return DatabaseSearchIndex(self.SearchDatabase) if self.SearchDatabase is not None else SearchEngines[self.SearchEngine]()
+
+    def SearchDatabaseSynced(self):
+        if self.SearchDatabase is not None:
+            self.SearchIndex.MarkAllSynced()
+
     def BuildSearchIndex(self):
-        self.SearchIndex.clear()
-        self.AddPageToSearchIndex(self.RootPage)
+        with self.ParallelLoadedContent():
+            self.SearchIndex.Build(self.RootPage)
         self.SearchIndexUpToDate = True
 
-    def AddPageToSearchIndex(self, Page):
-        self.SearchIndex.append((Page["Title"], Page["Content"], Page["IndexPath"]))
-        for SubPage in Page["SubPages"]:
-            self.AddPageToSearchIndex(SubPage)
-
     def GetSearchResults(self, SearchTermString, MatchCase=False, ExactTitleOnly=False):
-        if not MatchCase:
-            SearchTermString = SearchTermString.casefold()
         if not self.SearchIndexUpToDate:
             self.BuildSearchIndex()
-        Results = []
-        for PageData in self.SearchIndex:
-            ExactTitle = (PageData[0].casefold() if not MatchCase else PageData[0]) == SearchTermString
-            TitleHits = (PageData[0].casefold() if not MatchCase else PageData[0]).count(SearchTermString)
-            ContentHits = (PageData[1].casefold() if not MatchCase else PageData[1]).count(SearchTermString)
-            if (ExactTitleOnly and ExactTitle) or (not ExactTitleOnly and (TitleHits > 0 or ContentHits > 0)):
-                Results.append((PageData[0], PageData[2], ExactTitle, TitleHits, ContentHits))
-        Results = sorted(Results, key=lambda Result: (Result[2], Result[3], Result[4]), reverse=True)
-        return Results
+        return self.SearchIndex.GetSearchResults(SearchTermString, MatchCase=MatchCase, ExactTitleOnly=ExactTitleOnly)
+
+    def GetPagesWithTitle(self, Title, MatchCase=False):
+        if not self.SearchIndexUpToDate:
+            self.BuildSearchIndex()
+        return self.SearchIndex.GetPagesWithTitle(Title, MatchCase=MatchCase)
+
+    # Link Graph Methods
+    def BuildLinkGraph(self):
+        with self.ParallelLoadedContent():
+            self.LinkGraph.Build(self.RootPage)
+        self.LinkGraphUpToDate = True
+
+    def GetLinkingPages(self, Page):
+        if not self.LinkGraphUpToDate:
+            self.BuildLinkGraph()
+        return self.LinkGraph.GetLinkingPages(Page)
+
+    def GetBrokenLinks(self):
+        if not self.LinkGraphUpToDate:
+            self.BuildLinkGraph()
+        return self.LinkGraph.GetBrokenLinks()
+
+    def GetRenderVersionKey(self, Page):
+        # Only linking pages lists depend on the link graph, so without one no page content has to be loaded and link edits elsewhere keep renders cached
+        LinkGraphGeneration = None
+        if self.HeaderOrFooterUsesPlaceholder("LINKINGPAGES"):
+            if not self.LinkGraphUpToDate:
+                self.BuildLinkGraph()
+            self.LinkGraph.RefreshStalePages()
+            LinkGraphGeneration = self.LinkGraph.Generation
+        return (Page["Title"], Page["Content"], tuple(SubPage["PageID"] for SubPage in Page["SubPages"]), self.Header, self.Footer, self.LinkGeneration, LinkGraphGeneration)
+
+    # Header and Footer Methods
+    def SetHeader(self, Header):
+        self.Header = Header
+        self.CompiledHeader = self.CompileHeaderOrFooter(self.Header)
+        self.RecordJournalOperation("SetHeader", Header=Header)
+
+    def SetFooter(self, Footer):
+        self.Footer = Footer
+        self.CompiledFooter = self.CompileHeaderOrFooter(self.Footer)
+        self.RecordJournalOperation("SetFooter", Footer=Footer)
+
+    def CompileHeaderOrFooter(self, HeaderOrFooterString):
+        Segments = self.HeaderAndFooterPlaceholderPattern.split(HeaderOrFooterString)
+        return [(Segments[Index], Segments[Index + 1] if Index + 1 < len(Segments) else None) for Index in range(0, len(Segments), 2)]
+
+    def HeaderOrFooterUsesPlaceholder(self, Placeholder):
+        return any(SegmentPlaceholder == Placeholder for Text, SegmentPlaceholder in self.CompiledHeader + self.CompiledFooter)
+
+    # Journal Methods
+    def RecordJournalOperation(self, Operation, **Arguments):
+        if not self.JournalingEnabled:
+            return
+        Record = {"Operation": Operation}
+        Record.update(Arguments)
+        for Tracker in self.ChangeTrackers:
+            Tracker.RecordOperation(Record)
+
+    def MarkPageDirty(self, Page):
+        if self.JournalingEnabled:
+            for Tracker in self.ChangeTrackers:
+                Tracker.MarkPageDirty(Page)
+
+    def MarkImageDirty(self, FileName):
+        if self.JournalingEnabled:
+            for Tracker in self.ChangeTrackers:
+                Tracker.MarkImageDirty(FileName)
+
+    def MarkTemplateDirty(self, TemplateName):
+        if self.JournalingEnabled:
+            for Tracker in self.ChangeTrackers:
+                Tracker.MarkTemplateDirty(TemplateName)
+
+    def StartNewJournal(self):
+        self.JournalID = uuid.uuid4().hex
+        self.ClearJournalRecords()
+
+    def ClearJournalRecords(self):
+        self.JournalChanges.Clear()
+
+    def TakeJournalRecords(self):
+        return self.JournalChanges.TakeRecords(self)
+
+    # Autosave Methods
+    def HasAutosaveChanges(self):
+        return self.AutosaveChanges.HasChanges()
+
+    def ClearAutosaveRecords(self):
+        self.AutosaveChanges.Clear()
+
+    def TakeAutosaveRecords(self):
+        # Images are left raw so the autosave worker encodes them off the UI thread
+        return self.AutosaveChanges.TakeRecords(self, EncodeImages=False)
+
+    def CheckpointAutosaveRecords(self):
+        self.AutosaveChanges.Checkpoint()
+
+    def RestoreAutosaveCheckpoint(self):
+        self.AutosaveChanges.RestoreCheckpoint()
+
+    def ClearAutosaveCheckpoint(self):
+        self.AutosaveChanges.ClearCheckpoint()
+
+    def ApplyJournalRecords(self, Records):
+        self.JournalingEnabled = False
+        for Record in Records:
+            self.ApplyJournalRecord(Record)
+        self.JournalingEnabled = True
+
+    def ApplyJournalRecord(self, Record):
+        Operation = Record["Operation"]
+        Page = self.GetPageFromPageID(Record["PageID"]) if "PageID" in Record else None
+        if Operation == "AddSubPage":
+            SuperPage = self.GetPageFromPageID(Record["SuperPageID"])
+            if SuperPage is not None:
+                self.AddSubPage(SuperPageIndexPath=SuperPage["IndexPath"], PageToAdd=Record["Page"])
+            self.NextPageID = max(self.NextPageID, Record["NextPageID"])
+        elif Operation == "DeleteSubPage":
+            if Page is not None and Page is not self.RootPage:
+                self.DeleteSubPage(Page["IndexPath"])
+        elif Operation == "MoveSubPage":
+            if Page is not None:
+                self.MoveSubPage(Page["IndexPath"], Record["Delta"])
+        elif Operation == "PromoteSubPage":
+            if Page is not None:
+                self.PromoteSubPage(Page["IndexPath"])
+        elif Operation == "DemoteSubPage":
+            SiblingPage = self.GetPageFromPageID(Record["SiblingPageID"])
+            if Page is not None and SiblingPage is not None:
+                self.DemoteSubPage(Page["IndexPath"], SiblingPage["IndexPath"][-1])
+        elif Operation == "RenamePage":
+            if Page is not None:
+                self.RenamePage(Page["IndexPath"], Record["Title"])
+        elif Operation == "SetPageContent":
+            if Page is not None:
+                self.SetPageContent(Page, Record["Content"])
+        elif Operation == "SetHeader":
+            self.SetHeader(Record["Header"])
+        elif Operation == "SetFooter":
+            self.SetFooter(Record["Footer"])
+        elif Operation == "SetImage":
+            self.SetImage(Record["FileName"], Base64Converters.GetBinaryFromBase64String(Record["Base64String"]))
+        elif Operation == "RenameImage":
+            if self.HasImage(Record["FileName"]):
+                self.RenameImage(Record["FileName"], Record["NewFileName"])
+        elif Operation == "DeleteImage":
+            if self.HasImage(Record["FileName"]):
+                self.DeleteImage(Record["FileName"])
+        elif Operation == "AddTemplate":
+            self.AddTemplate(Record["TemplateName"], Record["TemplateContent"])
+        elif Operation == "RenameTemplate":
+            if self.HasTemplate(Record["TemplateName"]):
+                self.RenameTemplate(Record["TemplateName"], Record["NewTemplateName"])
+        elif Operation == "DeleteTemplate":
+            if self.HasTemplate(Record["TemplateName"]):
+                self.DeleteTemplate(Record["TemplateName"])
 
     # Serialization Methods
     def SetState(self, NewState):
-        self.Header = NewState["Header"]
-        self.Footer = NewState["Footer"]
+        self.JournalingEnabled = False
+        self.SetHeader(NewState["Header"])
+        self.SetFooter(NewState["Footer"])
         self.RootPage = NewState["RootPage"]
-        self.Images = NewState["Images"]
+        self.Images = NewState["Images"] if isinstance(NewState["Images"], ImageStore) else ImageStore(NewState["Images"])
         self.PageTemplates = NewState["PageTemplates"]
+        if "NextPageID" in NewState:
+            self.NextPageID = NewState["NextPageID"]
+            if "IndexPath" not in self.RootPage:
+                self.UpdateIndexPaths()
+        else:
+            self.NextPageID = 0
+            self.UpdateIndexPaths()
+            self.MigrateIndexPathLinks()
+        self.PagesByID.clear()
+        self.RegisterPageAndSubPages(self.RootPage)
+        self.SearchIndexUpToDate = False
+        self.LinkGraphUpToDate = False
+        self.LinkGeneration += 1
+        self.JournalID = NewState.get("JournalID")
+        self.ClearJournalRecords()
+        self.ClearAutosaveRecords()
+        self.JournalingEnabled = True
 
     def GetState(self):
         State = {}
         State["Header"] = self.Header
         State["Footer"] = self.Footer
         State["RootPage"] = self.RootPage
-        State["Images"] = self.Images
+        State["Images"] = self.Images.GetBase64Images()
         State["PageTemplates"] = self.PageTemplates
+        State["NextPageID"] = self.NextPageID
+        if self.JournalID is not None:
+            State["JournalID"] = self.JournalID
         return State
 
+    def GetCompactState(self):
+        State = self.GetState()
+        State["RootPage"] = self.GetCompactPage(self.RootPage)
+        return State
+
+    def GetCompactPage(self, Page):
+        # Index paths are recomputed on load, and copies of lazy pages stay lazy so serializing does not load the originals
+        CompactPage = Page.__class__((Key, Value) for Key, Value in dict.items(Page) if Key != "IndexPath")
+        CompactPage["SubPages"] = [self.GetCompactPage(SubPage) for SubPage in Page["SubPages"]]
+        return CompactPage
+
+    def DetachContent(self):
+        for Page in self.PagesByID.values():
+            if isinstance(Page, LazyDict):
+                Page.DetachAll()
+        self.Images.DetachAll()
+
+    def ParallelLoadedContent(self, IncludeImages=False):
+        Items = [(Page, "Content") for Page in self.PagesByID.values()]
+        if IncludeImages:
+            Items += self.Images.GetPayloadItems()
+        return ParallelLoadedItems(Items)
+
+    def GetSnapshot(self):
+        SnapshotState = self.GetState()
+        SnapshotState["RootPage"] = self.CopyPageAndSubPages(self.RootPage)
+        SnapshotState["Images"] = self.Images.copy()
+        SnapshotState["PageTemplates"] = self.PageTemplates.copy()
+        return self.__class__.CreateFromState(SnapshotState)
+
+    def CopyPageAndSubPages(self, Page):
+        PageCopy = Page.copy()
+        PageCopy["IndexPath"] = Page["IndexPath"].copy()
+        PageCopy["SubPages"] = [self.CopyPageAndSubPages(SubPage) for SubPage in Page["SubPages"]]
+        return PageCopy
+
     @classmethod
     def CreateFromState(cls, State):
         NewNotebook = cls()
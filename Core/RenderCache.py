@@ -0,0 +1,69 @@
+import sys
+from collections import OrderedDict
+
+
+class RenderCache:
+    def __init__(self, ByteBudget=32 * 1024 * 1024):
+        # Variables
+        self.ByteBudget = ByteBudget
+        self.Entries = OrderedDict()
+        self.CurrentBytes = 0
+        self.Hits = 0
+        self.Misses = 0
+        self.Evictions = 0
+
+    # Cache Methods
+    def Get(self, PageID, VersionKey):
+        Entry = self.Entries.get(PageID)
+        if Entry is None or Entry[0] != VersionKey:
+            self.Misses += 1
+            return None
+        self.Entries.move_to_end(PageID)
+        self.Hits += 1
+        return Entry[1]
+
+    def Store(self, PageID, VersionKey, HTML):
+        self.Discard(PageID)
+        EntryBytes = self.GetEntryBytes(VersionKey, HTML)
+        if EntryBytes > self.ByteBudget:
+            return
+        self.Entries[PageID] = (VersionKey, HTML, EntryBytes)
+        self.CurrentBytes += EntryBytes
+        while self.CurrentBytes > self.ByteBudget:
+            self.CurrentBytes -= self.Entries.popitem(last=False)[1][2]
+            self.Evictions += 1
+
+    def Discard(self, PageID):
+        Entry = self.Entries.pop(PageID, None)
+        if Entry is not None:
+            self.CurrentBytes -= Entry[2]
+
+    def Clear(self):
+        self.Entries.clear()
+        self.CurrentBytes = 0
+
+    def SetByteBudget(self, ByteBudget):
+        self.ByteBudget = ByteBudget
+        while self.CurrentBytes > self.ByteBudget:
+            self.CurrentBytes -= self.Entries.popitem(last=False)[1][2]
+            self.Evictions += 1
+
+    def GetEntryBytes(self, VersionKey, HTML):
+        return sys.getsizeof(HTML) + sum(sys.getsizeof(Element) for Element in VersionKey if isinstance(Element, str))
+
+    # Stats Methods
+    def GetStats(self):
+        Stats = {}
+        Stats["Entries"] = len(self.Entries)
+        Stats["Bytes"] = self.CurrentBytes
+        Stats["ByteBudget"] = self.ByteBudget
+        Stats["Hits"] = self.Hits
+        Stats["Misses"] = self.Misses
+        Stats["Evictions"] = self.Evictions
+        Stats["HitRate"] = self.Hits / (self.Hits + self.Misses) if self.Hits + self.Misses > 0 else 0.0
+        return Stats
+
+    def ResetStats(self):
+        self.Hits = 0
+        self.Misses = 0
+        self.Evictions = 0
@@ -0,0 +1,528 @@
+import bisect
+import re
+
+from Core.LazyContent import LazyDict, PeekPageContent
+
+
+class SearchIndex:
+    def __init__(self):
+        # Variables
+        self.Pages = {}
+        self.CasefoldedTitles = {}
+        self.CasefoldedContents = {}
+        self.StalePages = {}
+        self.TitleIndex = {}
+
+    # Index Methods
+    def Build(self, RootPage):
+        self.Clear()
+        self.AddPageAndSubPages(RootPage)
+
+    def Clear(self):
+        self.Pages.clear()
+        self.CasefoldedTitles.clear()
+        self.CasefoldedContents.clear()
+        self.StalePages.clear()
+        self.TitleIndex.clear()
+
+    def AddPageAndSubPages(self, Page):
+        self.IndexPage(Page)
+        for SubPage in Page["SubPages"]:
+            self.AddPageAndSubPages(SubPage)
+
+    def RemovePageAndSubPages(self, Page):
+        self.UnindexPage(Page)
+        for SubPage in Page["SubPages"]:
+            self.RemovePageAndSubPages(SubPage)
+
+    def MarkPageStale(self, Page):
+        if id(Page) in self.Pages:
+            self.StalePages[id(Page)] = Page
+
+    def RefreshStalePages(self):
+        StalePages = list(self.StalePages.values())
+        self.StalePages.clear()
+        for Page in StalePages:
+            self.ReindexPage(Page)
+
+    def ReindexPage(self, Page):
+        self.UnindexPage(Page)
+        self.IndexPage(Page)
+
+    def IndexPage(self, Page):
+        PageKey = id(Page)
+        self.Pages[PageKey] = Page
+        self.CasefoldedTitles[PageKey] = Page["Title"].casefold()
+        self.CasefoldedContents[PageKey] = PeekPageContent(Page).casefold()
+        self.AddToTitleIndex(PageKey)
+
+    def UnindexPage(self, Page):
+        PageKey = id(Page)
+        if PageKey not in self.Pages:
+            return
+        self.RemoveFromTitleIndex(PageKey)
+        del self.Pages[PageKey]
+        del self.CasefoldedTitles[PageKey]
+        self.CasefoldedContents.pop(PageKey, None)
+        self.StalePages.pop(PageKey, None)
+
+    def AddToTitleIndex(self, PageKey):
+        CasefoldedTitle = self.CasefoldedTitles[PageKey]
+        if CasefoldedTitle in self.TitleIndex:
+            self.TitleIndex[CasefoldedTitle].add(PageKey)
+        else:
+            self.TitleIndex[CasefoldedTitle] = {PageKey}
+
+    def RemoveFromTitleIndex(self, PageKey):
+        CasefoldedTitle = self.CasefoldedTitles[PageKey]
+        TitlePageKeys = self.TitleIndex[CasefoldedTitle]
+        TitlePageKeys.discard(PageKey)
+        if len(TitlePageKeys) < 1:
+            del self.TitleIndex[CasefoldedTitle]
+
+    def GetTrigrams(self, String):
+        return set(zip(String, String[1:], String[2:]))
+
+    # Search Methods
+    def GetCandidatePageKeys(self, CasefoldedSearchTermString):
+        return None
+
+    def GetPagesWithTitle(self, Title, MatchCase=False):
+        self.RefreshStalePages()
+        Pages = [self.Pages[PageKey] for PageKey in self.TitleIndex.get(Title.casefold(), ())]
+        if MatchCase:
+            Pages = [Page for Page in Pages if Page["Title"] == Title]
+        return sorted(Pages, key=lambda Page: Page["IndexPath"])
+
+    def GetSearchResults(self, SearchTermString, MatchCase=False, ExactTitleOnly=False):
+        self.RefreshStalePages()
+        CasefoldedSearchTermString = SearchTermString.casefold()
+        if not MatchCase:
+            SearchTermString = CasefoldedSearchTermString
+        if ExactTitleOnly:
+            CandidatePageKeys = self.TitleIndex.get(CasefoldedSearchTermString, ())
+        else:
+            CandidatePageKeys = self.GetCandidatePageKeys(CasefoldedSearchTermString)
+        if CandidatePageKeys is None:
+            CandidatePageKeys = self.Pages.keys()
+        Results = []
+        for PageKey in CandidatePageKeys:
+            Page = self.Pages[PageKey]
+            Title = Page["Title"] if MatchCase else self.CasefoldedTitles[PageKey]
+            Content = PeekPageContent(Page) if MatchCase else self.GetCasefoldedContent(PageKey)
+            ExactTitle = Title == SearchTermString
+            if ExactTitleOnly and not ExactTitle:
+                continue
+            TitleHits = Title.count(SearchTermString)
+            ContentHits = Content.count(SearchTermString)
+            if ExactTitleOnly or TitleHits > 0 or ContentHits > 0:
+                Results.append((Page["Title"], Page["IndexPath"], ExactTitle, TitleHits, ContentHits))
+        return self.SortSearchResults(Results)
+
+    def GetCasefoldedContent(self, PageKey):
+        return self.CasefoldedContents[PageKey]
+
+    def SortSearchResults(self, Results):
+        # Ties keep notebook order, which is the lexicographic order of index paths
+        return sorted(Results, key=lambda Result: (not Result[2], -Result[3], -Result[4], Result[1]))
+
+
+class TokenSearchIndex(SearchIndex):
+    def __init__(self):
+        super().__init__()
+
+        # Variables
+        self.TokenPattern = re.compile(r"\w+")
+        self.Postings = {}
+        self.PageTokens = {}
+        self.VocabularyIndexUpToDate = False
+        self.SortedTokens = []
+        self.SortedReversedTokens = []
+        self.TokenTrigramIndex = {}
+
+    # Index Methods
+    def Clear(self):
+        super().Clear()
+        self.Postings.clear()
+        self.PageTokens.clear()
+        self.VocabularyIndexUpToDate = False
+
+    def IndexPage(self, Page):
+        super().IndexPage(Page)
+        PageKey = id(Page)
+        Tokens = self.GetPageTokens(PageKey)
+        self.PageTokens[PageKey] = Tokens
+        for Token in Tokens:
+            self.AddPosting(Token, PageKey)
+
+    def UnindexPage(self, Page):
+        PageKey = id(Page)
+        for Token in self.PageTokens.pop(PageKey, ()):
+            self.RemovePosting(Token, PageKey)
+        super().UnindexPage(Page)
+
+    def ReindexPage(self, Page):
+        # Only tokens the edit added or removed touch the postings and the vocabulary index
+        PageKey = id(Page)
+        if PageKey not in self.PageTokens:
+            super().ReindexPage(Page)
+            return
+        OldTokens = self.PageTokens[PageKey]
+        SearchIndex.UnindexPage(self, Page)
+        SearchIndex.IndexPage(self, Page)
+        Tokens = self.GetPageTokens(PageKey)
+        self.PageTokens[PageKey] = Tokens
+        for Token in OldTokens - Tokens:
+            self.RemovePosting(Token, PageKey)
+        for Token in Tokens - OldTokens:
+            self.AddPosting(Token, PageKey)
+
+    def GetPageTokens(self, PageKey):
+        Tokens = set(self.TokenPattern.findall(self.CasefoldedTitles[PageKey]))
+        Tokens.update(self.TokenPattern.findall(self.CasefoldedContents[PageKey]))
+        return Tokens
+
+    def AddPosting(self, Token, PageKey):
+        if Token in self.Postings:
+            self.Postings[Token].add(PageKey)
+        else:
+            self.Postings[Token] = {PageKey}
+            self.AddToVocabularyIndex(Token)
+
+    def RemovePosting(self, Token, PageKey):
+        TokenPostings = self.Postings[Token]
+        TokenPostings.discard(PageKey)
+        if len(TokenPostings) < 1:
+            del self.Postings[Token]
+            self.RemoveFromVocabularyIndex(Token)
+
+    # Vocabulary Index Methods
+    def RefreshVocabularyIndex(self):
+        # Built on the first partial token search after a full index build, then kept up to date as tokens come and go
+        if self.VocabularyIndexUpToDate:
+            return
+        self.SortedTokens = sorted(self.Postings)
+        self.SortedReversedTokens = sorted(Token[::-1] for Token in self.Postings)
+        self.TokenTrigramIndex = {}
+        self.VocabularyIndexUpToDate = True
+        for Token in self.Postings:
+            self.AddToTokenTrigramIndex(Token)
+
+    def AddToVocabularyIndex(self, Token):
+        if not self.VocabularyIndexUpToDate:
+            return
+        bisect.insort(self.SortedTokens, Token)
+        bisect.insort(self.SortedReversedTokens, Token[::-1])
+        self.AddToTokenTrigramIndex(Token)
+
+    def RemoveFromVocabularyIndex(self, Token):
+        if not self.VocabularyIndexUpToDate:
+            return
+        del self.SortedTokens[bisect.bisect_left(self.SortedTokens, Token)]
+        del self.SortedReversedTokens[bisect.bisect_left(self.SortedReversedTokens, Token[::-1])]
+        for Trigram in self.GetTrigrams(Token):
+            TrigramTokens = self.TokenTrigramIndex[Trigram]
+            TrigramTokens.discard(Token)
+            if len(TrigramTokens) < 1:
+                del self.TokenTrigramIndex[Trigram]
+
+    def AddToTokenTrigramIndex(self, Token):
+        for Trigram in self.GetTrigrams(Token):
+            if Trigram in self.TokenTrigramIndex:
+                self.TokenTrigramIndex[Trigram].add(Token)
+            else:
+                self.TokenTrigramIndex[Trigram] = {Token}
+
+    # Search Methods
+    def GetCandidatePageKeys(self, CasefoldedSearchTermString):
+        # Inner tokens of the search term must match page tokens exactly; tokens at either end may be part of longer page tokens
+        ExactTokens = []
+        PartialTokens = []
+        for Match in self.TokenPattern.finditer(CasefoldedSearchTermString):
+            OpenStart = Match.start() == 0
+            OpenEnd = Match.end() == len(CasefoldedSearchTermString)
+            if OpenStart or OpenEnd:
+                PartialTokens.append((Match.group(), OpenStart, OpenEnd))
+            else:
+                ExactTokens.append(Match.group())
+        if len(ExactTokens) < 1 and len(PartialTokens) < 1:
+            return None
+        CandidatePageKeys = None
+        for Token in ExactTokens:
+            TokenPageKeys = self.Postings.get(Token, set())
+            CandidatePageKeys = set(TokenPageKeys) if CandidatePageKeys is None else CandidatePageKeys & TokenPageKeys
+            if len(CandidatePageKeys) < 1:
+                return CandidatePageKeys
+        if len(PartialTokens) > 0:
+            self.RefreshVocabularyIndex()
+        for PartialToken, OpenStart, OpenEnd in PartialTokens:
+            if OpenStart and OpenEnd:
+                MatchingTokens = self.GetTokensContaining(PartialToken)
+            elif OpenStart:
+                MatchingTokens = [ReversedToken[::-1] for ReversedToken in self.GetTokensWithPrefix(self.SortedReversedTokens, PartialToken[::-1])]
+            else:
+                MatchingTokens = self.GetTokensWithPrefix(self.SortedTokens, PartialToken)
+            TokenPageKeys = set()
+            for Token in MatchingTokens:
+                TokenPageKeys.update(self.Postings[Token])
+            CandidatePageKeys = TokenPageKeys if CandidatePageKeys is None else CandidatePageKeys & TokenPageKeys
+            if len(CandidatePageKeys) < 1:
+                return CandidatePageKeys
+        return CandidatePageKeys
+
+    def GetTokensWithPrefix(self, SortedTokens, Prefix):
+        Tokens = []
+        for Position in range(bisect.bisect_left(SortedTokens, Prefix), len(SortedTokens)):
+            if not SortedTokens[Position].startswith(Prefix):
+                break
+            Tokens.append(SortedTokens[Position])
+        return Tokens
+
+    def GetTokensContaining(self, PartialToken):
+        # Fragments shorter than a trigram have nothing to look up, so they are the one case that scans the vocabulary
+        Trigrams = self.GetTrigrams(PartialToken)
+        if len(Trigrams) < 1:
+            return [Token for Token in self.SortedTokens if PartialToken in Token]
+        RarestTrigramTokens = min((self.TokenTrigramIndex.get(Trigram, set()) for Trigram in Trigrams), key=len)
+        return [Token for Token in RarestTrigramTokens if PartialToken in Token]
+
+
+class TrigramSearchIndex(SearchIndex):
+    def __init__(self):
+        super().__init__()
+
+        # Variables
+        self.Postings = {}
+        self.PageTrigrams = {}
+
+    # Index Methods
+    def Clear(self):
+        super().Clear()
+        self.Postings.clear()
+        self.PageTrigrams.clear()
+
+    def IndexPage(self, Page):
+        super().IndexPage(Page)
+        PageKey = id(Page)
+        Trigrams = self.GetTrigrams(self.CasefoldedTitles[PageKey])
+        Trigrams.update(self.GetTrigrams(self.CasefoldedContents[PageKey]))
+        self.PageTrigrams[PageKey] = Trigrams
+        for Trigram in Trigrams:
+            if Trigram in self.Postings:
+                self.Postings[Trigram].add(PageKey)
+            else:
+                self.Postings[Trigram] = {PageKey}
+
+    def UnindexPage(self, Page):
+        PageKey = id(Page)
+        for Trigram in self.PageTrigrams.pop(PageKey, ()):
+            TrigramPostings = self.Postings[Trigram]
+            TrigramPostings.discard(PageKey)
+            if len(TrigramPostings) < 1:
+                del self.Postings[Trigram]
+        super().UnindexPage(Page)
+
+    # Search Methods
+    def GetCandidatePageKeys(self, CasefoldedSearchTermString):
+        SearchTrigrams = self.GetTrigrams(CasefoldedSearchTermString)
+        if len(SearchTrigrams) < 1:
+            return None
+        TrigramPostings = sorted((self.Postings.get(Trigram, set()) for Trigram in SearchTrigrams), key=len)
+        CandidatePageKeys = set(TrigramPostings[0])
+        for Postings in TrigramPostings[1:]:
+            if len(CandidatePageKeys) < 1:
+                break
+            CandidatePageKeys.intersection_update(Postings)
+        return CandidatePageKeys
+
+
+class CorpusSearchIndex(SearchIndex):
+    def __init__(self):
+        super().__init__()
+
+        # Variables
+        self.TitleCorpus = CasefoldedCorpus()
+        self.ContentCorpus = CasefoldedCorpus()
+        self.CorpusUpToDate = False
+
+    # Index Methods
+    def Clear(self):
+        super().Clear()
+        self.CorpusUpToDate = False
+
+    def IndexPage(self, Page):
+        super().IndexPage(Page)
+        self.CorpusUpToDate = False
+
+    def UnindexPage(self, Page):
+        super().UnindexPage(Page)
+        self.CorpusUpToDate = False
+
+    def ReindexPage(self, Page):
+        if not self.CorpusUpToDate:
+            super().ReindexPage(Page)
+            return
+        PageKey = id(Page)
+        self.RemoveFromTitleIndex(PageKey)
+        self.CasefoldedTitles[PageKey] = Page["Title"].casefold()
+        self.CasefoldedContents[PageKey] = PeekPageContent(Page).casefold()
+        self.AddToTitleIndex(PageKey)
+        self.TitleCorpus.ReplacePageString(PageKey, self.CasefoldedTitles[PageKey])
+        self.ContentCorpus.ReplacePageString(PageKey, self.CasefoldedContents[PageKey])
+
+    def RefreshCorpus(self):
+        if not self.CorpusUpToDate:
+            self.TitleCorpus.Build(self.CasefoldedTitles)
+            self.ContentCorpus.Build(self.CasefoldedContents)
+            self.CorpusUpToDate = True
+
+    # Search Methods
+    def GetCandidatePageKeys(self, CasefoldedSearchTermString):
+        if CasefoldedSearchTermString == "" or CasefoldedCorpus.Separator in CasefoldedSearchTermString:
+            return None
+        self.RefreshCorpus()
+        CandidatePageKeys = self.TitleCorpus.GetPageKeysContaining(CasefoldedSearchTermString)
+        CandidatePageKeys.update(self.ContentCorpus.GetPageKeysContaining(CasefoldedSearchTermString))
+        return CandidatePageKeys
+
+
+class DatabaseSearchIndex(SearchIndex):
+    def __init__(self, SearchDatabase):
+        super().__init__()
+
+        # Store Parameters
+        self.SearchDatabase = SearchDatabase
+
+        # Variables
+        self.PageKeysByID = {}
+        self.UnsyncedPageKeys = set()
+
+    # Index Methods
+    def Clear(self):
+        super().Clear()
+        self.PageKeysByID.clear()
+        self.UnsyncedPageKeys.clear()
+
+    def IndexPage(self, Page):
+        # Page text stays in the database; only pages whose loaded text may differ from it are scanned directly
+        PageKey = id(Page)
+        self.Pages[PageKey] = Page
+        self.CasefoldedTitles[PageKey] = Page["Title"].casefold()
+        self.AddToTitleIndex(PageKey)
+        self.PageKeysByID[Page["PageID"]] = PageKey
+        if not isinstance(Page, LazyDict) or Page.IsLoaded("Content"):
+            self.UnsyncedPageKeys.add(PageKey)
+
+    def ReindexPage(self, Page):
+        # A renamed title differs from the database until the next save, so the page is scanned directly
+        PageKey = id(Page)
+        Unsynced = PageKey in self.UnsyncedPageKeys or self.CasefoldedTitles.get(PageKey) != Page["Title"].casefold()
+        super().ReindexPage(Page)
+        if Unsynced:
+            self.UnsyncedPageKeys.add(PageKey)
+
+    def UnindexPage(self, Page):
+        PageKey = id(Page)
+        if self.PageKeysByID.get(Page["PageID"]) == PageKey:
+            del self.PageKeysByID[Page["PageID"]]
+        self.UnsyncedPageKeys.discard(PageKey)
+        super().UnindexPage(Page)
+
+    def MarkAllSynced(self):
+        self.UnsyncedPageKeys.clear()
+
+    # Search Methods
+    def GetCandidatePageKeys(self, CasefoldedSearchTermString):
+        PageIDs = self.SearchDatabase.FindPageIDs(CasefoldedSearchTermString)
+        if PageIDs is None:
+            return None
+        CandidatePageKeys = {self.PageKeysByID[PageID] for PageID in PageIDs if PageID in self.PageKeysByID}
+        CandidatePageKeys.update(self.UnsyncedPageKeys)
+        return CandidatePageKeys
+
+    def GetCasefoldedContent(self, PageKey):
+        return PeekPageContent(self.Pages[PageKey]).casefold()
+
+
+class CasefoldedCorpus:
+    Separator = "\x00"
+
+    # Pages are packed into chunks of about this many characters, so an edit only rebuilds its own chunk
+    ChunkSize = 1024 * 1024
+
+    def __init__(self):
+        # Variables
+        self.Chunks = []
+        self.PageChunks = {}
+
+    def Build(self, PageStrings):
+        self.Chunks = []
+        self.PageChunks = {}
+        Chunk = None
+        for PageKey, PageString in PageStrings.items():
+            if Chunk is None or Chunk.Size >= self.ChunkSize:
+                Chunk = CorpusChunk(self.Separator)
+                self.Chunks.append(Chunk)
+            Chunk.AddPageString(PageKey, PageString)
+            self.PageChunks[PageKey] = Chunk
+
+    def ReplacePageString(self, PageKey, PageString):
+        self.PageChunks[PageKey].ReplacePageString(PageKey, PageString)
+
+    def GetPageKeysContaining(self, SearchTermString):
+        PageKeys = set()
+        for Chunk in self.Chunks:
+            Chunk.AddPageKeysContaining(SearchTermString, PageKeys)
+        return PageKeys
+
+
+class CorpusChunk:
+    def __init__(self, Separator):
+        # Store Parameters
+        self.Separator = Separator
+
+        # Variables
+        self.PageKeys = []
+        self.PageStrings = []
+        self.Positions = {}
+        self.Size = 0
+        self.Buffer = None
+        self.Offsets = None
+
+    def AddPageString(self, PageKey, PageString):
+        self.Positions[PageKey] = len(self.PageKeys)
+        self.PageKeys.append(PageKey)
+        self.PageStrings.append(PageString)
+        self.Size += len(PageString) + 1
+        self.Buffer = None
+
+    def ReplacePageString(self, PageKey, PageString):
+        Position = self.Positions[PageKey]
+        self.Size += len(PageString) - len(self.PageStrings[Position])
+        self.PageStrings[Position] = PageString
+        self.Buffer = None
+
+    def RefreshBuffer(self):
+        if self.Buffer is not None:
+            return
+        self.Offsets = []
+        CurrentOffset = 0
+        for PageString in self.PageStrings:
+            self.Offsets.append(CurrentOffset)
+            CurrentOffset += len(PageString) + 1
+        self.Buffer = self.Separator.join(self.PageStrings)
+
+    def AddPageKeysContaining(self, SearchTermString, PageKeys):
+        # Once a page has a hit, skip straight to the next page; the separator keeps hits from spanning pages
+        self.RefreshBuffer()
+        HitOffset = self.Buffer.find(SearchTermString)
+        while HitOffset != -1:
+            Position = bisect.bisect_right(self.Offsets, HitOffset) - 1
+            PageKeys.add(self.PageKeys[Position])
+            HitOffset = self.Buffer.find(SearchTermString, self.Offsets[Position] + len(self.PageStrings[Position]) + 1)
+
+
+SearchEngines = {}
+SearchEngines["Token"] = TokenSearchIndex
+SearchEngines["Trigram"] = TrigramSearchIndex
+SearchEngines["Corpus"] = CorpusSearchIndex
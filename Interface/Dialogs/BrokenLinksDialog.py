@@ -0,0 +1,84 @@
+from PyQt5.QtWidgets import QDialog, QLabel, QListWidget, QPushButton, QGridLayout, QListWidgetItem
+
+
+class BrokenLinksDialog(QDialog):
+    def __init__(self, BrokenLinks, Notebook, MainWindow):
+        super().__init__(parent=MainWindow)
+
+        # Store Parameters
+        self.BrokenLinks = BrokenLinks
+        self.Notebook = Notebook
+        self.MainWindow = MainWindow
+
+        # Variables
+        self.SelectedIndexPath = None
+        self.Width = 400
+        self.Height = 300
+
+        # Label
+        self.Label = QLabel("The following pages contain links to pages that no longer exist:")
+
+        # Broken Links List
+        self.BrokenLinksList = QListWidget()
+        self.BrokenLinksList.itemDoubleClicked.connect(self.GoToPage)
+
+        # Buttons
+        self.GoToPageButton = QPushButton("Go to Page")
+        self.GoToPageButton.clicked.connect(self.GoToPage)
+        self.GoToPageButton.setDefault(True)
+        self.DoneButton = QPushButton("Done")
+        self.DoneButton.clicked.connect(self.Done)
+
+        # Create, Populate, and Set Layout
+        self.Layout = QGridLayout()
+        self.Layout.addWidget(self.Label, 0, 0, 1, 2)
+        self.Layout.addWidget(self.BrokenLinksList, 1, 0, 1, 2)
+        self.Layout.addWidget(self.GoToPageButton, 2, 0)
+        self.Layout.addWidget(self.DoneButton, 2, 1)
+        self.setLayout(self.Layout)
+
+        # Set Window Title and Icon
+        self.setWindowTitle("Broken Links")
+        self.setWindowIcon(self.MainWindow.WindowIcon)
+
+        # Window Resize
+        self.Resize()
+
+        # Populate Broken Links List
+        self.PopulateBrokenLinksList()
+
+        # Execute Dialog
+        self.exec_()
+
+    def GoToPage(self):
+        SelectedItems = self.BrokenLinksList.selectedItems()
+        if len(SelectedItems) > 0:
+            self.SelectedIndexPath = SelectedItems[0].Page["IndexPath"].copy()
+            self.close()
+
+    def Done(self):
+        self.close()
+
+    def Resize(self):
+        self.resize(self.Width, self.Height)
+
+    def PopulateBrokenLinksList(self):
+        self.BrokenLinksList.clear()
+        for LinkingPage, LinkedPageID, LinkCount in self.BrokenLinks:
+            self.BrokenLinksList.addItem(BrokenLinkItem(LinkingPage, self.Notebook.PageLinkPrefix + str(LinkedPageID), LinkCount))
+        if self.BrokenLinksList.count() > 0:
+            self.BrokenLinksList.setCurrentRow(0)
+            self.BrokenLinksList.setFocus()
+
+
+class BrokenLinkItem(QListWidgetItem):
+    def __init__(self, Page, LinkTarget, LinkCount):
+        super().__init__()
+
+        # Store Parameters
+        self.Page = Page
+        self.LinkTarget = LinkTarget
+        self.LinkCount = LinkCount
+
+        # Set Text
+        self.setText(self.Page["Title"] + ":  " + self.LinkTarget + ((" (" + str(self.LinkCount) + " links)") if self.LinkCount > 1 else ""))
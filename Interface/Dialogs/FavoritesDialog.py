@@ -67,7 +67,9 @@ class FavoritesDialog(QDialog):
         if CurrentOpenFileName == "":
             self.MainWindow.DisplayMessageBox("Save or open a notebook first.")
             return
-        CurrentModeExtension = ".ntbk" if not self.MainWindow.GzipMode else ".ntbk.gz"
+        CurrentModeExtension = self.MainWindow.GetCompressedExtension(self.MainWindow.FileExtension)
+        if self.MainWindow.GetFormatExtension(CurrentOpenFileName) is not None:
+            CurrentModeExtension = self.MainWindow.GetFormatExtension(CurrentOpenFileName)
         if not CurrentOpenFileName.endswith(CurrentModeExtension):
             self.MainWindow.DisplayMessageBox("The current file must be saved as a " + CurrentModeExtension + " file before it can be added to your favorites for the current mode.")
             return
@@ -3,8 +3,6 @@ import os
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import QDialog, QGridLayout, QListWidget, QPushButton, QListWidgetItem, QLabel, QFileDialog, QMessageBox, QScrollArea, QSplitter, QInputDialog
 
-from Core import Base64Converters
-
 
 class ImageManagerDialog(QDialog):
     def __init__(self, Notebook, MainWindow):
@@ -81,18 +79,16 @@ class ImageManagerDialog(QDialog):
     def ItemSelected(self):
         SelectedItems = self.ImageList.selectedItems()
         if len(SelectedItems) > 0:
-            CurrentFileContent = SelectedItems[0].Base64String
-            CurrentFileBinary = Base64Converters.GetBinaryFromBase64String(CurrentFileContent)
             ImagePixmap = QPixmap()
-            ImagePixmap.loadFromData(CurrentFileBinary)
+            ImagePixmap.loadFromData(self.Notebook.GetImage(SelectedItems[0].FileName))
             self.ImageDisplay.setPixmap(ImagePixmap)
             self.ImageDisplay.resize(self.ImageDisplay.pixmap().size())
 
     def PopulateImageList(self):
         self.ImageList.clear()
         self.ImageDisplay.clear()
-        for FileName, Base64String in sorted(self.Notebook.Images.items()):
-            self.ImageList.addItem(ImageListItem(FileName, Base64String))
+        for FileName in self.Notebook.GetImageNames():
+            self.ImageList.addItem(ImageListItem(FileName))
         self.ImageList.setCurrentRow(0)
         self.ImageList.setFocus()
 
@@ -121,12 +117,10 @@ class ImageManagerDialog(QDialog):
             if OK:
                 if NewName == "":
                     self.MainWindow.DisplayMessageBox("Image names cannot be blank.")
-                elif NewName + CurrentFileExtension in self.Notebook.Images:
+                elif self.Notebook.HasImage(NewName + CurrentFileExtension):
                     self.MainWindow.DisplayMessageBox("There is already an image by that name.")
                 else:
-                    ImageContent = self.Notebook.Images[CurrentFileName + CurrentFileExtension]
-                    self.Notebook.Images[NewName + CurrentFileExtension] = ImageContent
-                    del self.Notebook.Images[CurrentFileName + CurrentFileExtension]
+                    self.Notebook.RenameImage(CurrentFileName + CurrentFileExtension, NewName + CurrentFileExtension)
                     self.UnsavedChanges = True
                     self.PopulateImageList()
 
@@ -137,14 +131,15 @@ class ImageManagerDialog(QDialog):
             CurrentFileExtension = os.path.splitext(CurrentFileName)[1]
             ExportImagePath = QFileDialog.getSaveFileName(parent=self, caption="Export Image File", filter=self.ExportFilters[CurrentFileExtension])[0]
             if ExportImagePath != "":
-                Base64Converters.WriteFileFromBase64String(SelectedItems[0].Base64String, ExportImagePath)
+                with open(ExportImagePath, "wb") as ExportImageFile:
+                    ExportImageFile.write(self.Notebook.GetImage(CurrentFileName))
 
     def DeleteImage(self):
         SelectedItems = self.ImageList.selectedItems()
         if len(SelectedItems) > 0:
             CurrentFileName = SelectedItems[0].FileName
             if self.MainWindow.DisplayMessageBox("Are you sure you want to delete " + CurrentFileName + " from the notebook?  This cannot be undone.", Icon=QMessageBox.Question, Buttons=(QMessageBox.Yes | QMessageBox.No), Parent=self) == QMessageBox.Yes:
-                del self.Notebook.Images[CurrentFileName]
+                self.Notebook.DeleteImage(CurrentFileName)
                 self.UnsavedChanges = True
                 self.PopulateImageList()
 
@@ -156,10 +151,9 @@ class ImageManagerDialog(QDialog):
 
 
 class ImageListItem(QListWidgetItem):
-    def __init__(self, FileName, Base64String):
+    def __init__(self, FileName):
         super().__init__()
 
         self.FileName = FileName
-        self.Base64String = Base64String
 
         self.setText(self.FileName)
@@ -95,7 +95,7 @@ class TemplateManagerDialog(QDialog):
             CurrentTemplateContent = SelectedItems[0].TemplateContent
             EditTemplateDialogInst = AddTemplateDialog(self.Notebook, self.MainWindow, self, EditMode=True, TemplateTitle=CurrentTemplateName, TemplateContent=CurrentTemplateContent)
             if EditTemplateDialogInst.TemplateAdded:
-                self.Notebook.PageTemplates[CurrentTemplateName] = EditTemplateDialogInst.TemplateString
+                self.Notebook.AddTemplate(CurrentTemplateName, EditTemplateDialogInst.TemplateString)
                 self.UnsavedChanges = True
                 self.PopulateTemplateList()
                 self.TemplateList.setCurrentRow(self.GetTemplateIndexFromName(CurrentTemplateName))
@@ -111,9 +111,7 @@ class TemplateManagerDialog(QDialog):
                 elif NewName in self.Notebook.PageTemplates:
                     self.MainWindow.DisplayMessageBox("There is already a template by that name.")
                 else:
-                    TemplateContent = self.Notebook.PageTemplates[CurrentTemplateName]
-                    self.Notebook.PageTemplates[NewName] = TemplateContent
-                    del self.Notebook.PageTemplates[CurrentTemplateName]
+                    self.Notebook.RenameTemplate(CurrentTemplateName, NewName)
                     self.UnsavedChanges = True
                     self.PopulateTemplateList()
                     self.TemplateList.setCurrentRow(self.GetTemplateIndexFromName(NewName))
@@ -124,7 +122,7 @@ class TemplateManagerDialog(QDialog):
             CurrentTemplateName = SelectedItems[0].TemplateName
             CurrentTemplateRow = self.TemplateList.currentRow()
             if self.MainWindow.DisplayMessageBox("Are you sure you want to delete the template " + CurrentTemplateName + " from the notebook?  This cannot be undone.", Icon=QMessageBox.Question, Buttons=(QMessageBox.Yes | QMessageBox.No), Parent=self) == QMessageBox.Yes:
-                del self.Notebook.PageTemplates[CurrentTemplateName]
+                self.Notebook.DeleteTemplate(CurrentTemplateName)
                 self.UnsavedChanges = True
                 self.PopulateTemplateList()
                 if self.TemplateList.count() == 0:
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+
+from PyQt5.QtGui import QImage
+
+from Core.MarkdownRenderers import Renderer
+
+
+class ImageResourceCache:
+    def __init__(self, ByteBudget=64 * 1024 * 1024):
+        # Variables
+        self.ByteBudget = ByteBudget
+        self.Images = OrderedDict()
+        self.CurrentBytes = 0
+        self.Hits = 0
+        self.Misses = 0
+        self.Evictions = 0
+
+    # Resource Methods
+    def URLIsImageResource(self, URL):
+        return URL.scheme() == Renderer.ImageResourceScheme
+
+    def GetImageFromURL(self, URL, Notebook):
+        return self.GetImage(URL.path()[1:], Notebook)
+
+    def GetImage(self, FileName, Notebook):
+        # Images are cached by content, so identical attachments are decoded once
+        Data = Notebook.GetImage(FileName)
+        if Data is None:
+            return None
+        ImageKey = Notebook.GetImageKey(FileName)
+        if ImageKey in self.Images:
+            self.Images.move_to_end(ImageKey)
+            self.Hits += 1
+            return self.Images[ImageKey]
+        self.Misses += 1
+        for CachedImageKey in [CachedImageKey for CachedImageKey in self.Images if not Notebook.Images.HasPayload(CachedImageKey)]:
+            self.Discard(CachedImageKey)
+        Image = QImage()
+        Image.loadFromData(Data)
+        self.Store(ImageKey, Image)
+        return Image
+
+    # Cache Methods
+    def Store(self, ImageKey, Image):
+        if Image.sizeInBytes() > self.ByteBudget:
+            return
+        self.Images[ImageKey] = Image
+        self.CurrentBytes += Image.sizeInBytes()
+        self.EvictToBudget()
+
+    def Discard(self, ImageKey):
+        Image = self.Images.pop(ImageKey, None)
+        if Image is not None:
+            self.CurrentBytes -= Image.sizeInBytes()
+
+    def Clear(self):
+        self.Images.clear()
+        self.CurrentBytes = 0
+
+    def SetByteBudget(self, ByteBudget):
+        self.ByteBudget = ByteBudget
+        self.EvictToBudget()
+
+    def EvictToBudget(self):
+        while self.CurrentBytes > self.ByteBudget:
+            self.CurrentBytes -= self.Images.popitem(last=False)[1].sizeInBytes()
+            self.Evictions += 1
+
+    # Stats Methods
+    def GetStats(self):
+        Stats = {}
+        Stats["Entries"] = len(self.Images)
+        Stats["Bytes"] = self.CurrentBytes
+        Stats["ByteBudget"] = self.ByteBudget
+        Stats["Hits"] = self.Hits
+        Stats["Misses"] = self.Misses
+        Stats["Evictions"] = self.Evictions
+        Stats["HitRate"] = self.Hits / (self.Hits + self.Misses) if self.Hits + self.Misses > 0 else 0.0
+        return Stats
+
+    def ResetStats(self):
+        self.Hits = 0
+        self.Misses = 0
+        self.Evictions = 0
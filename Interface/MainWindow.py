@@ -4,10 +4,11 @@ import os
 
 from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtGui import QIcon
-from PyQt5.QtWidgets import QMainWindow, QInputDialog, QMessageBox, QAction, QSplitter, QApplication
+from PyQt5.QtWidgets import QMainWindow, QInputDialog, QMessageBox, QAction, QActionGroup, QSplitter, QApplication
 
 from Core.MarkdownRenderers import ConstructHTMLExportString
 from Core.Notebook import Notebook
+from Interface.Dialogs.BrokenLinksDialog import BrokenLinksDialog
 from Interface.Dialogs.DemotePageDialog import DemotePageDialog
 from Interface.Dialogs.EditHeaderOrFooterDialog import EditHeaderOrFooterDialog
 from Interface.Dialogs.FavoritesDialog import FavoritesDialog
@@ -17,6 +18,7 @@ from Interface.Dialogs.TemplateManagerDialog import TemplateManagerDialog
 from Interface.Widgets.NotebookDisplayWidget import NotebookDisplayWidget
 from Interface.Widgets.SearchWidget import SearchWidget
 from Interface.Widgets.TextWidget import TextWidget
+from SaveAndLoad import Compression
 from SaveAndLoad.SaveAndOpenMixin import SaveAndOpenMixin
 
 
@@ -36,9 +38,10 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.ForwardList = []
         self.BackNavigation = False
         self.AutoScrollQueue = None
+        self.SearchEngine = "Token"
 
         # Set Up Save and Open
-        self.SetUpSaveAndOpen(".ntbk", "Notebook", (Notebook,))
+        self.SetUpSaveAndOpen(".ntbk", "Notebook", (Notebook,), DatabaseExtension=".ntbkdb", BinaryExtension=".ntbkb")
 
         # Create Notebook
         self.Notebook = Notebook()
@@ -50,6 +53,11 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         # Load Configs
         self.LoadConfigs()
 
+        # Start Autosave Timer
+        self.AutosaveTimer = QTimer(self)
+        self.AutosaveTimer.timeout.connect(self.AutosaveNotebook)
+        self.AutosaveTimer.start(self.AutosaveInterval)
+
     def CreateInterface(self):
         # Create Icons
         self.CreateIcons()
@@ -63,11 +71,10 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
 
         # Create Notebook Display Widget
         self.NotebookDisplayWidgetInst = NotebookDisplayWidget(self.Notebook, self)
-        self.NotebookDisplayWidgetInst.itemSelectionChanged.connect(self.PageSelected)
+        self.NotebookDisplayWidgetInst.PageSelectionChanged.connect(self.PageSelected)
 
         # Create Text Widget
         self.TextWidgetInst = TextWidget(self.Notebook, self)
-        self.TextWidgetInst.textChanged.connect(self.TextChanged)
 
         # Create Search Widget
         self.SearchWidgetInst = SearchWidget(self.Notebook, self)
@@ -174,10 +181,40 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.ImportPageAction.triggered.connect(self.ImportPage)
         self.ToggleReadModeActionsList.append(self.ImportPageAction)
 
-        self.GzipModeAction = QAction("Gzip Mode (Smaller Files)")
-        self.GzipModeAction.setCheckable(True)
-        self.GzipModeAction.setChecked(self.GzipMode)
-        self.GzipModeAction.triggered.connect(self.ToggleGzipMode)
+        self.CompressionActionGroup = QActionGroup(self)
+        self.CompressionActions = {}
+        self.CompressionActions[None] = QAction("No Compression")
+        self.CompressionActions["Gzip"] = QAction("Gzip (.gz)")
+        self.CompressionActions["Bzip2"] = QAction("Bzip2 (.bz2)")
+        self.CompressionActions["LZMA"] = QAction("LZMA (.xz)")
+        for CodecName, CompressionAction in self.CompressionActions.items():
+            CompressionAction.setCheckable(True)
+            CompressionAction.setChecked(CodecName == self.CompressionCodec)
+            CompressionAction.triggered.connect(lambda Checked, CodecName=CodecName: self.SetCompressionCodec(CodecName))
+            self.CompressionActionGroup.addAction(CompressionAction)
+
+        self.CompressionLevelAction = QAction("Compression Level")
+        self.CompressionLevelAction.triggered.connect(self.SetCompressionLevel)
+
+        self.ParallelCompressionAction = QAction("Parallel Compression (Faster Saves)")
+        self.ParallelCompressionAction.setCheckable(True)
+        self.ParallelCompressionAction.setChecked(self.ParallelCompression)
+        self.ParallelCompressionAction.triggered.connect(self.ToggleParallelCompression)
+
+        self.JournalModeAction = QAction("Journal Mode (Faster Saves)")
+        self.JournalModeAction.setCheckable(True)
+        self.JournalModeAction.setChecked(self.JournalMode)
+        self.JournalModeAction.triggered.connect(self.ToggleJournalMode)
+
+        self.LazyLoadModeAction = QAction("Lazy Loading (Large Notebooks)")
+        self.LazyLoadModeAction.setCheckable(True)
+        self.LazyLoadModeAction.setChecked(self.LazyLoadMode)
+        self.LazyLoadModeAction.triggered.connect(self.ToggleLazyLoadMode)
+
+        self.CompactModeAction = QAction("Compact Files (Faster Saves)")
+        self.CompactModeAction.setCheckable(True)
+        self.CompactModeAction.setChecked(self.CompactMode)
+        self.CompactModeAction.triggered.connect(self.ToggleCompactMode)
 
         self.ExitAction = QAction("Exit")
         self.ExitAction.triggered.connect(self.close)
@@ -361,6 +398,20 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.SearchForLinkingPagesAction = QAction("Search for Linking Pages")
         self.SearchForLinkingPagesAction.triggered.connect(self.SearchForLinkingPages)
 
+        self.BrokenLinksAction = QAction("Broken Links")
+        self.BrokenLinksAction.triggered.connect(self.ShowBrokenLinks)
+
+        self.SearchEngineActionGroup = QActionGroup(self)
+        self.SearchEngineActions = {}
+        self.SearchEngineActions["Token"] = QAction("Token Index")
+        self.SearchEngineActions["Trigram"] = QAction("Trigram Index")
+        self.SearchEngineActions["Corpus"] = QAction("Corpus Buffer")
+        for SearchEngine, SearchEngineAction in self.SearchEngineActions.items():
+            SearchEngineAction.setCheckable(True)
+            SearchEngineAction.setChecked(SearchEngine == self.SearchEngine)
+            SearchEngineAction.triggered.connect(lambda Checked, SearchEngine=SearchEngine: self.SetSearchEngine(SearchEngine))
+            self.SearchEngineActionGroup.addAction(SearchEngineAction)
+
     def CreateMenuBar(self):
         self.MenuBar = self.menuBar()
 
@@ -377,7 +428,15 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.FileMenu.addAction(self.ExportPageAction)
         self.FileMenu.addAction(self.ImportPageAction)
         self.FileMenu.addSeparator()
-        self.FileMenu.addAction(self.GzipModeAction)
+        self.CompressionMenu = self.FileMenu.addMenu("Compression")
+        for CompressionAction in self.CompressionActions.values():
+            self.CompressionMenu.addAction(CompressionAction)
+        self.CompressionMenu.addSeparator()
+        self.CompressionMenu.addAction(self.CompressionLevelAction)
+        self.CompressionMenu.addAction(self.ParallelCompressionAction)
+        self.FileMenu.addAction(self.JournalModeAction)
+        self.FileMenu.addAction(self.LazyLoadModeAction)
+        self.FileMenu.addAction(self.CompactModeAction)
         self.FileMenu.addSeparator()
         self.FileMenu.addAction(self.ExitAction)
 
@@ -422,6 +481,10 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.ViewMenu.addAction(self.SearchAction)
         self.ViewMenu.addAction(self.ToggleSearchAction)
         self.ViewMenu.addAction(self.SearchForLinkingPagesAction)
+        self.ViewMenu.addAction(self.BrokenLinksAction)
+        self.SearchEngineMenu = self.ViewMenu.addMenu("Search Engine")
+        for SearchEngineAction in self.SearchEngineActions.values():
+            self.SearchEngineMenu.addAction(SearchEngineAction)
         self.ViewMenu.addSeparator()
         self.ViewMenu.addAction(self.ZoomOutAction)
         self.ViewMenu.addAction(self.ZoomInAction)
@@ -532,12 +595,16 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                 self.FavoritesData = json.loads(ConfigFile.read())
         else:
             self.FavoritesData = {}
+        CompressedFavoritesFile = self.GetResourcePath("CompressedFavorites.cfg")
         GzipFavoritesFile = self.GetResourcePath("GzipFavorites.cfg")
-        if os.path.isfile(GzipFavoritesFile):
+        if os.path.isfile(CompressedFavoritesFile):
+            with open(CompressedFavoritesFile, "r") as ConfigFile:
+                self.CompressedFavoritesData = json.loads(ConfigFile.read())
+        elif os.path.isfile(GzipFavoritesFile):
             with open(GzipFavoritesFile, "r") as ConfigFile:
-                self.GzipFavoritesData = json.loads(ConfigFile.read())
+                self.CompressedFavoritesData = json.loads(ConfigFile.read())
         else:
-            self.GzipFavoritesData = {}
+            self.CompressedFavoritesData = {}
 
         # Display Settings
         DisplaySettingsFile = self.GetResourcePath("DisplaySettings.cfg")
@@ -553,6 +620,21 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                         self.ZoomOut()
             if "HorizontalSplit" in DisplaySettings:
                 self.NotebookAndTextSplitter.setSizes(DisplaySettings["HorizontalSplit"])
+            if "RenderCacheByteBudget" in DisplaySettings:
+                self.TextWidgetInst.RenderCache.SetByteBudget(DisplaySettings["RenderCacheByteBudget"])
+            if "PageDocumentCacheByteBudget" in DisplaySettings:
+                self.TextWidgetInst.PageDocumentCache.SetByteBudget(DisplaySettings["PageDocumentCacheByteBudget"])
+            if "ImageResourceCacheByteBudget" in DisplaySettings:
+                self.TextWidgetInst.ImageResourceCache.SetByteBudget(DisplaySettings["ImageResourceCacheByteBudget"])
+
+        # Search Engine
+        SearchEngineFile = self.GetResourcePath("SearchEngine.cfg")
+        if os.path.isfile(SearchEngineFile):
+            with open(SearchEngineFile, "r") as ConfigFile:
+                SearchEngine = json.loads(ConfigFile.read())
+            if SearchEngine in self.SearchEngineActions:
+                self.SearchEngineActions[SearchEngine].setChecked(True)
+                self.SetSearchEngine(SearchEngine)
 
         # Keybindings
         KeybindingsFile = self.GetResourcePath("Keybindings.cfg")
@@ -577,16 +659,23 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         # Favorites
         with open(self.GetResourcePath("Favorites.cfg"), "w") as ConfigFile:
             ConfigFile.write(json.dumps(self.FavoritesData, indent=2))
-        with open(self.GetResourcePath("GzipFavorites.cfg"), "w") as ConfigFile:
-            ConfigFile.write(json.dumps(self.GzipFavoritesData, indent=2))
+        with open(self.GetResourcePath("CompressedFavorites.cfg"), "w") as ConfigFile:
+            ConfigFile.write(json.dumps(self.CompressedFavoritesData, indent=2))
 
         # Display Settings
         DisplaySettings = {}
         DisplaySettings["CurrentZoomLevel"] = self.CurrentZoomLevel
         DisplaySettings["HorizontalSplit"] = self.NotebookAndTextSplitter.sizes()
+        DisplaySettings["RenderCacheByteBudget"] = self.TextWidgetInst.RenderCache.ByteBudget
+        DisplaySettings["PageDocumentCacheByteBudget"] = self.TextWidgetInst.PageDocumentCache.ByteBudget
+        DisplaySettings["ImageResourceCacheByteBudget"] = self.TextWidgetInst.ImageResourceCache.ByteBudget
         with open(self.GetResourcePath("DisplaySettings.cfg"), "w") as ConfigFile:
             ConfigFile.write(json.dumps(DisplaySettings, indent=2))
 
+        # Search Engine
+        with open(self.GetResourcePath("SearchEngine.cfg"), "w") as ConfigFile:
+            ConfigFile.write(json.dumps(self.SearchEngine))
+
         # Keybindings
         with open(self.GetResourcePath("Keybindings.cfg"), "w") as ConfigFile:
             ConfigFile.write(json.dumps(self.Keybindings, indent=2))
@@ -594,16 +683,29 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         # Last Opened Directory
         self.SaveLastOpenedDirectory()
 
-        # Gzip Mode
-        self.SaveGzipMode()
+        # Compression Mode
+        self.SaveCompressionMode()
+
+        # Journal Mode
+        self.SaveJournalMode()
+
+        # Lazy Load Mode
+        self.SaveLazyLoadMode()
+
+        # Compact Mode
+        self.SaveCompactMode()
 
     # Notebook Methods
     def UpdateNotebook(self, Notebook):
         self.Notebook = Notebook
-        self.NotebookDisplayWidgetInst.Notebook = self.Notebook
         self.TextWidgetInst.Notebook = self.Notebook
         self.TextWidgetInst.Renderer.Notebook = self.Notebook
+        self.TextWidgetInst.RenderCache.Clear()
+        self.TextWidgetInst.ImageResourceCache.Clear()
+        self.TextWidgetInst.ClearPageDocuments()
         self.SearchWidgetInst.Notebook = self.Notebook
+        self.Notebook.SetSearchEngine(self.SearchEngine)
+        self.NotebookDisplayWidgetInst.SetNotebook(self.Notebook)
 
     def PageSelected(self, IndexPath=None, SkipUpdatingBackAndForward=False):
         IndexPath = IndexPath if IndexPath is not None else self.NotebookDisplayWidgetInst.GetCurrentPageIndexPath()
@@ -679,11 +781,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
             CurrentPage = self.Notebook.GetPageFromIndexPath(CurrentPageIndexPath)
             NewPageDialogInst = NewPageDialog(CurrentPage["Title"], self.Notebook.GetTemplateNames(), self)
             if NewPageDialogInst.NewPageAdded:
-                OldLinkData = self.GetLinkData()
-                self.Notebook.AddSubPage(NewPageDialogInst.NewPageName, "" if NewPageDialogInst.TemplateName == "None" else self.Notebook.GetTemplate(NewPageDialogInst.TemplateName), CurrentPageIndexPath)
-                NewLinkData = self.GetLinkData()
-                self.UpdateLinks(OldLinkData, NewLinkData)
-                self.NotebookDisplayWidgetInst.FillFromRootPage()
+                self.NotebookDisplayWidgetInst.NotebookTreeModelInst.AddSubPage(NewPageDialogInst.NewPageName, "" if NewPageDialogInst.TemplateName == "None" else self.Notebook.GetTemplate(NewPageDialogInst.TemplateName), CurrentPageIndexPath)
                 self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPageIndexPath, ScrollToLastChild=True)
                 self.SearchWidgetInst.RefreshSearch()
                 self.UpdateUnsavedChangesFlag(True)
@@ -696,11 +794,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
             if CurrentPage["IndexPath"] == [0]:
                 self.DisplayMessageBox("The root page of a notebook cannot be deleted.")
             elif self.DisplayMessageBox("Are you sure you want to delete this page?  This cannot be undone.", Icon=QMessageBox.Question, Buttons=(QMessageBox.Yes | QMessageBox.No)) == QMessageBox.Yes:
-                OldLinkData = self.GetLinkData()
-                self.Notebook.DeleteSubPage(CurrentPageIndexPath)
-                NewLinkData = self.GetLinkData()
-                self.UpdateLinks(OldLinkData, NewLinkData)
-                self.NotebookDisplayWidgetInst.FillFromRootPage()
+                self.NotebookDisplayWidgetInst.NotebookTreeModelInst.DeleteSubPage(CurrentPageIndexPath)
                 SelectParent = False
                 SelectDelta = 0
                 CurrentPageSuperSubPagesLength = len(self.Notebook.GetSuperOfPageFromIndexPath(CurrentPageIndexPath)["SubPages"])
@@ -717,13 +811,9 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         if not self.TextWidgetInst.ReadMode:
             CurrentPageIndexPath = self.NotebookDisplayWidgetInst.GetCurrentPageIndexPath()
             CurrentPage = self.Notebook.GetPageFromIndexPath(CurrentPageIndexPath)
-            OldLinkData = self.GetLinkData()
             if CurrentPage["IndexPath"] == [0]:
                 self.DisplayMessageBox("The root page of a notebook cannot be moved.")
-            elif self.Notebook.MoveSubPage(CurrentPageIndexPath, Delta):
-                NewLinkData = self.GetLinkData()
-                self.UpdateLinks(OldLinkData, NewLinkData)
-                self.NotebookDisplayWidgetInst.FillFromRootPage()
+            elif self.NotebookDisplayWidgetInst.NotebookTreeModelInst.MoveSubPage(CurrentPageIndexPath, Delta):
                 self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPageIndexPath, SelectDelta=Delta)
                 self.SearchWidgetInst.RefreshSearch()
                 self.UpdateUnsavedChangesFlag(True)
@@ -739,11 +829,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                 self.DisplayMessageBox("A page cannot be promoted to the same level as the root page.")
             else:
                 CurrentPage = self.Notebook.GetPageFromIndexPath(CurrentPageIndexPath)
-                OldLinkData = self.GetLinkData()
-                self.Notebook.PromoteSubPage(CurrentPageIndexPath)
-                NewLinkData = self.GetLinkData()
-                self.UpdateLinks(OldLinkData, NewLinkData)
-                self.NotebookDisplayWidgetInst.FillFromRootPage()
+                self.NotebookDisplayWidgetInst.NotebookTreeModelInst.PromoteSubPage(CurrentPageIndexPath)
                 self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPage["IndexPath"])
                 self.SearchWidgetInst.RefreshSearch()
                 self.UpdateUnsavedChangesFlag(True)
@@ -764,11 +850,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                 SiblingPageTitles = [Sibling["Title"] for Sibling in SiblingPages]
                 SiblingPageIndex = DemotePageDialog(CurrentPage, SiblingPageTitles, self).SiblingPageIndex
                 if SiblingPageIndex is not None:
-                    OldLinkData = self.GetLinkData()
-                    self.Notebook.DemoteSubPage(CurrentPageIndexPath, SiblingPageIndex)
-                    NewLinkData = self.GetLinkData()
-                    self.UpdateLinks(OldLinkData, NewLinkData)
-                    self.NotebookDisplayWidgetInst.FillFromRootPage()
+                    self.NotebookDisplayWidgetInst.NotebookTreeModelInst.DemoteSubPage(CurrentPageIndexPath, SiblingPageIndex)
                     self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPage["IndexPath"])
                     self.SearchWidgetInst.RefreshSearch()
                     self.UpdateUnsavedChangesFlag(True)
@@ -783,43 +865,12 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                 if NewName == "":
                     self.DisplayMessageBox("Page names cannot be blank.")
                 else:
-                    CurrentPage["Title"] = NewName
-                    self.NotebookDisplayWidgetInst.FillFromRootPage()
+                    self.NotebookDisplayWidgetInst.NotebookTreeModelInst.RenamePage(CurrentPageIndexPath, NewName)
                     self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPageIndexPath)
                     self.SearchWidgetInst.RefreshSearch()
                     self.UpdateUnsavedChangesFlag(True)
             self.NotebookDisplayWidgetInst.setFocus()
 
-    def GetLinkData(self, Page=None):
-        LinkData = {}
-        Page = Page if Page is not None else self.Notebook.RootPage
-        LinkData[id(Page)] = "](" + json.dumps(Page["IndexPath"], indent=None) + ")"
-        self.AddSubPageLinkData(Page, LinkData)
-        return LinkData
-
-    def AddSubPageLinkData(self, CurrentPage, LinkData):
-        for SubPage in CurrentPage["SubPages"]:
-            LinkData[id(SubPage)] = "](" + json.dumps(SubPage["IndexPath"], indent=None) + ")"
-            self.AddSubPageLinkData(SubPage, LinkData)
-
-    def UpdateLinks(self, OldLinkData, NewLinkData, Page=None):
-        ReplaceQueue = []
-        for PageID in NewLinkData:
-            if PageID in OldLinkData:
-                if NewLinkData[PageID] != OldLinkData[PageID]:
-                    ReplaceStrings = (OldLinkData[PageID], "<<LINK UPDATE TOKEN " + str(PageID) + ">>", NewLinkData[PageID])
-                    ReplaceQueue.append(ReplaceStrings)
-        for ReplaceStrings in ReplaceQueue:
-            if Page is None:
-                self.SearchWidgetInst.ReplaceAllInNotebook(SearchText=ReplaceStrings[0], ReplaceText=ReplaceStrings[1], MatchCase=True, DelayTextUpdate=True)
-            else:
-                self.SearchWidgetInst.ReplaceAllInPageAndSubPages(Page, SearchText=ReplaceStrings[0], ReplaceText=ReplaceStrings[1], MatchCase=True)
-        for ReplaceStrings in ReplaceQueue:
-            if Page is None:
-                self.SearchWidgetInst.ReplaceAllInNotebook(SearchText=ReplaceStrings[1], ReplaceText=ReplaceStrings[2], MatchCase=True, DelayTextUpdate=True)
-            else:
-                self.SearchWidgetInst.ReplaceAllInPageAndSubPages(Page, SearchText=ReplaceStrings[1], ReplaceText=ReplaceStrings[2], MatchCase=True)
-
     def ImageManager(self):
         if not self.TextWidgetInst.ReadMode:
             ImageManagerDialogInst = ImageManagerDialog(self.Notebook, self)
@@ -837,25 +888,38 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
             EditHeaderOrFooterDialogInst = EditHeaderOrFooterDialog(Mode, self.Notebook, self)
             if EditHeaderOrFooterDialogInst.UnsavedChanges:
                 if EditHeaderOrFooterDialogInst.Mode == "Header":
-                    self.Notebook.Header = EditHeaderOrFooterDialogInst.HeaderOrFooterString
+                    self.Notebook.SetHeader(EditHeaderOrFooterDialogInst.HeaderOrFooterString)
                 elif EditHeaderOrFooterDialogInst.Mode == "Footer":
-                    self.Notebook.Footer = EditHeaderOrFooterDialogInst.HeaderOrFooterString
+                    self.Notebook.SetFooter(EditHeaderOrFooterDialogInst.HeaderOrFooterString)
                 self.UpdateUnsavedChangesFlag(True)
 
+    def SetSearchEngine(self, SearchEngine):
+        self.SearchEngine = SearchEngine
+        self.Notebook.SetSearchEngine(self.SearchEngine)
+
     def SearchForLinkingPages(self):
+        self.TextWidgetInst.FlushPendingEdits()
         self.SearchAction.trigger()
-        self.SearchWidgetInst.SearchTextLineEdit.setText("](" + json.dumps(self.NotebookDisplayWidgetInst.GetCurrentPageIndexPath(), indent=None) + ")")
-        self.SearchWidgetInst.SearchButton.click()
+        CurrentPage = self.Notebook.GetPageFromIndexPath(self.NotebookDisplayWidgetInst.GetCurrentPageIndexPath())
+        self.SearchWidgetInst.SearchTextLineEdit.setText("](" + self.Notebook.GetPageLinkTarget(CurrentPage) + ")")
+        self.SearchWidgetInst.DisplayResults([(LinkingPage["Title"], LinkingPage["IndexPath"]) for LinkingPage in self.Notebook.GetLinkingPages(CurrentPage)])
+
+    def ShowBrokenLinks(self):
+        self.TextWidgetInst.FlushPendingEdits()
+        BrokenLinks = self.Notebook.GetBrokenLinks()
+        if len(BrokenLinks) < 1:
+            self.DisplayMessageBox("No broken links found.")
+            return
+        BrokenLinksDialogInst = BrokenLinksDialog(BrokenLinks, self.Notebook, self)
+        if BrokenLinksDialogInst.SelectedIndexPath is not None:
+            self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(BrokenLinksDialogInst.SelectedIndexPath)
 
     # Text Methods
-    def TextChanged(self):
-        if self.TextWidgetInst.DisplayChanging or self.TextWidgetInst.ReadMode:
-            return
-        CurrentText = self.TextWidgetInst.toPlainText()
-        if CurrentText != self.TextWidgetInst.CurrentPage["Content"]:
-            self.TextWidgetInst.CurrentPage["Content"] = CurrentText
-            self.Notebook.SearchIndexUpToDate = False
-            self.UpdateUnsavedChangesFlag(True)
+    def SyncPageContent(self, Page, Content):
+        if Content != Page["Content"]:
+            self.Notebook.SetPageContent(Page, Content)
+            if not self.UnsavedChanges:
+                self.UpdateUnsavedChangesFlag(True)
 
     def ToggleReadMode(self):
         self.TextWidgetInst.setFocus() if self.TextWidgetInst.ReadMode else self.NotebookDisplayWidgetInst.setFocus()
@@ -899,45 +963,85 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
 
     # Save and Open Methods
     def SaveActionTriggered(self, SaveAs=False):
+        self.TextWidgetInst.FlushPendingEdits()
         if self.Save(self.Notebook, SaveAs=SaveAs):
-            self.Notebook.BuildSearchIndex()
             self.SearchWidgetInst.RefreshSearch()
             self.UpdateUnsavedChangesFlag(False)
         else:
             self.UpdateWindowTitle()
 
     def OpenActionTriggered(self, FilePath=None):
-        NewNotebook = self.Open(self.Notebook, FilePath=FilePath)
+        self.TextWidgetInst.FlushPendingEdits()
+        PreviousNotebook = self.Notebook
+        NewNotebook = self.Open(self.Notebook, FilePath=FilePath, PartialDataLoaded=self.DisplayPartialNotebook)
+        if NewNotebook is None and self.Notebook is not PreviousNotebook:
+            self.UpdateNotebook(PreviousNotebook)
         if NewNotebook is not None:
             self.UpdateNotebook(NewNotebook)
-            self.NotebookDisplayWidgetInst.FillFromRootPage()
-            self.Notebook.BuildSearchIndex()
+            if self.MappedFileName is None:
+                self.Notebook.BuildSearchIndex()
             self.SearchWidgetInst.ClearSearch()
             self.ClearBackAndForward()
-            self.UpdateUnsavedChangesFlag(False)
+            self.UpdateWindowTitle()
         else:
             self.UpdateWindowTitle()
 
+    def DisplayPartialNotebook(self, PartialState):
+        if not {"Header", "Footer", "RootPage"}.issubset(PartialState):
+            return
+        # Files written before PageIDs were kept ahead of SubPages have no PageID yet at this point
+        PartialState["RootPage"].setdefault("PageID", 0)
+        PartialState["Images"] = {}
+        PartialState["PageTemplates"] = {}
+        PartialState["NextPageID"] = PartialState["RootPage"]["PageID"] + 1
+        self.UpdateNotebook(Notebook.CreateFromState(PartialState))
+
     def Favorites(self):
-        FavoritesDialogInst = FavoritesDialog(self.FavoritesData if not self.GzipMode else self.GzipFavoritesData, self)
+        FavoritesDialogInst = FavoritesDialog(self.FavoritesData if self.CompressionCodec is None else self.CompressedFavoritesData, self)
         if FavoritesDialogInst.OpenFilePath is not None:
             self.OpenActionTriggered(FavoritesDialogInst.OpenFilePath)
 
     def NewActionTriggered(self):
+        self.TextWidgetInst.FlushPendingEdits()
         if not self.New(self.Notebook):
             self.UpdateWindowTitle()
             return
         self.UpdateNotebook(Notebook())
-        self.NotebookDisplayWidgetInst.FillFromRootPage()
         self.Notebook.BuildSearchIndex()
         self.SearchWidgetInst.ClearSearch()
         self.ClearBackAndForward()
         self.UpdateUnsavedChangesFlag(False)
 
-    def ToggleGzipMode(self):
-        self.GzipMode = not self.GzipMode
+    def SetCompressionCodec(self, CodecName):
+        self.CompressionCodec = CodecName
+
+    def SetCompressionLevel(self):
+        if self.CompressionCodec is None:
+            self.DisplayMessageBox("Choose a compression format first.")
+            return
+        Codec = Compression.Codecs[self.CompressionCodec]
+        Level, OK = QInputDialog.getInt(self, "Compression Level", self.CompressionCodec + " level (higher is smaller but slower):", self.GetCompressionLevel(), Codec.MinimumLevel, Codec.MaximumLevel)
+        if OK:
+            self.CompressionLevels[self.CompressionCodec] = Level
+
+    def ToggleParallelCompression(self):
+        self.ParallelCompression = not self.ParallelCompression
+
+    def ToggleJournalMode(self):
+        self.JournalMode = not self.JournalMode
+
+    def ToggleLazyLoadMode(self):
+        self.LazyLoadMode = not self.LazyLoadMode
+
+    def ToggleCompactMode(self):
+        self.CompactMode = not self.CompactMode
+
+    def AutosaveNotebook(self):
+        self.TextWidgetInst.FlushPendingEdits()
+        self.Autosave(self.Notebook)
 
     def closeEvent(self, event):
+        self.TextWidgetInst.FlushPendingEdits()
         Close = True
         if self.UnsavedChanges:
             SavePrompt = self.DisplayMessageBox("Save unsaved work before closing?", Icon=QMessageBox.Warning, Buttons=(QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel))
@@ -948,9 +1052,13 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                 pass
             elif SavePrompt == QMessageBox.Cancel:
                 Close = False
+        if Close and not self.WaitForSave():
+            Close = False
         if not Close:
             event.ignore()
         else:
+            self.AutosaveTimer.stop()
+            self.DiscardRecovery(self.Notebook)
             self.SaveConfigs()
             event.accept()
 
@@ -960,26 +1068,25 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
 
     # Import and Export Methods
     def ExportHTML(self):
+        self.TextWidgetInst.FlushPendingEdits()
         AssetPaths = {}
         AssetPaths["TemplatePath"] = self.GetResourcePath("Assets/HTMLExportTemplate.template")
         AssetPaths["BackButtonPath"] = self.GetResourcePath("Assets/SerpentNotes Back Icon.png")
         AssetPaths["ForwardButtonPath"] = self.GetResourcePath("Assets/SerpentNotes Forward Icon.png")
         AssetPaths["ExpandButtonPath"] = self.GetResourcePath("Assets/SerpentNotes Expand All Icon.png")
         AssetPaths["CollapseButtonPath"] = self.GetResourcePath("Assets/SerpentNotes Collapse All Icon.png")
-        HTMLText = ConstructHTMLExportString(self.Notebook, AssetPaths)
+        with self.Notebook.ParallelLoadedContent(IncludeImages=True):
+            HTMLText = ConstructHTMLExportString(self.Notebook, AssetPaths)
         self.Save(HTMLText, SaveAs=True, AlternateFileDescription="HTML", AlternateFileExtension=".html", SkipSerialization=True, ExportMode=True)
 
     def ExportPage(self):
+        self.TextWidgetInst.FlushPendingEdits()
         self.Save(self.TextWidgetInst.CurrentPage, SaveAs=True, AlternateFileDescription="Page", AlternateFileExtension=".ntbkpg", ExportMode=True)
 
     def ImportPage(self):
         ImportedPage = self.Open(None, RespectUnsavedChanges=False, AlternateFileDescription="Page", AlternateFileExtension=".ntbkpg", ImportMode=True)
         if ImportedPage is not None:
-            OldLinkData = self.GetLinkData(ImportedPage)
-            self.Notebook.AddSubPage(PageToAdd=ImportedPage)
-            NewLinkData = self.GetLinkData(ImportedPage)
-            self.UpdateLinks(OldLinkData, NewLinkData, ImportedPage)
-            self.NotebookDisplayWidgetInst.FillFromRootPage()
+            self.NotebookDisplayWidgetInst.NotebookTreeModelInst.ImportPage(ImportedPage)
             self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(self.Notebook.RootPage["IndexPath"], ScrollToLastChild=True)
             self.SearchWidgetInst.RefreshSearch()
             self.UpdateUnsavedChangesFlag(True)
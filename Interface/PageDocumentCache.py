@@ -0,0 +1,86 @@
+from collections import OrderedDict
+
+
+class PageDocumentCache:
+    # Rough memory cost of a document per character, covering its text, block structure, and line layout
+    BytesPerCharacter = 16
+
+    def __init__(self, ByteBudget=64 * 1024 * 1024):
+        # Variables
+        self.ByteBudget = ByteBudget
+        self.Entries = OrderedDict()
+        self.CurrentBytes = 0
+        self.Hits = 0
+        self.Misses = 0
+        self.Evictions = 0
+
+    # Cache Methods
+    def Take(self, Page):
+        # Documents are handed out rather than shared, so the one on screen is never evicted; a page changed elsewhere gets a fresh document
+        Entry = self.Entries.pop(Page["PageID"], None)
+        if Entry is not None:
+            self.CurrentBytes -= Entry["Bytes"]
+        if Entry is None or Entry["Page"] is not Page or Entry["Content"] != Page["Content"]:
+            if Entry is not None:
+                Entry["Document"].deleteLater()
+            self.Misses += 1
+            return None
+        self.Hits += 1
+        return Entry
+
+    def Store(self, Page, Document, Cursor, ScrollPositions):
+        self.Discard(Page["PageID"])
+        EntryBytes = Document.characterCount() * self.BytesPerCharacter
+        if EntryBytes > self.ByteBudget:
+            Document.deleteLater()
+            return
+        Entry = {}
+        Entry["Page"] = Page
+        Entry["Content"] = Page["Content"]
+        Entry["Document"] = Document
+        Entry["Cursor"] = Cursor
+        Entry["ScrollPositions"] = ScrollPositions
+        Entry["Bytes"] = EntryBytes
+        self.Entries[Page["PageID"]] = Entry
+        self.CurrentBytes += EntryBytes
+        self.EvictToBudget()
+
+    def Discard(self, PageID):
+        Entry = self.Entries.pop(PageID, None)
+        if Entry is not None:
+            self.CurrentBytes -= Entry["Bytes"]
+            Entry["Document"].deleteLater()
+
+    def Clear(self):
+        for Entry in self.Entries.values():
+            Entry["Document"].deleteLater()
+        self.Entries.clear()
+        self.CurrentBytes = 0
+
+    def SetByteBudget(self, ByteBudget):
+        self.ByteBudget = ByteBudget
+        self.EvictToBudget()
+
+    def EvictToBudget(self):
+        while self.CurrentBytes > self.ByteBudget:
+            Entry = self.Entries.popitem(last=False)[1]
+            self.CurrentBytes -= Entry["Bytes"]
+            Entry["Document"].deleteLater()
+            self.Evictions += 1
+
+    # Stats Methods
+    def GetStats(self):
+        Stats = {}
+        Stats["Entries"] = len(self.Entries)
+        Stats["Bytes"] = self.CurrentBytes
+        Stats["ByteBudget"] = self.ByteBudget
+        Stats["Hits"] = self.Hits
+        Stats["Misses"] = self.Misses
+        Stats["Evictions"] = self.Evictions
+        Stats["HitRate"] = self.Hits / (self.Hits + self.Misses) if self.Hits + self.Misses > 0 else 0.0
+        return Stats
+
+    def ResetStats(self):
+        self.Hits = 0
+        self.Misses = 0
+        self.Evictions = 0
@@ -1,9 +1,12 @@
 import json
 
-from PyQt5.QtWidgets import QTreeWidget, QTreeWidgetItem, QHeaderView, QMenu
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtWidgets import QTreeView, QHeaderView, QMenu
 
 
-class NotebookDisplayWidget(QTreeWidget):
+class NotebookDisplayWidget(QTreeView):
+    PageSelectionChanged = pyqtSignal()
+
     def __init__(self, Notebook, MainWindow):
         super().__init__()
 
@@ -11,52 +14,62 @@ class NotebookDisplayWidget(QTreeWidget):
         self.Notebook = Notebook
         self.MainWindow = MainWindow
 
+        # Model Setup
+        self.NotebookTreeModelInst = NotebookTreeModel(self.Notebook)
+        self.setModel(self.NotebookTreeModelInst)
+
         # Header Setup
         self.setHeaderHidden(True)
         self.header().setStretchLastSection(False)
         self.header().setSectionResizeMode(QHeaderView.ResizeToContents)
 
-        # Fill From Root Page
-        self.FillFromRootPage()
-
-    def FillFromRootPage(self):
-        self.clear()
-        self.FillNotebookWidgetItem(self.invisibleRootItem(), self.Notebook.RootPage, IsRootPage=True)
-        self.setFocus()
-
-    def FillNotebookWidgetItem(self, CurrentTreeItem, CurrentPage, IsRootPage=False):
-        ChildTreeItem = NotebookDisplayWidgetItem(CurrentPage["Title"], CurrentPage["IndexPath"])
-        CurrentTreeItem.addChild(ChildTreeItem)
+        # Show Root Page
+        self.ShowRootPage()
 
-        for SubPage in CurrentPage["SubPages"]:
-            self.FillNotebookWidgetItem(ChildTreeItem, SubPage)
+    def SetNotebook(self, Notebook):
+        self.Notebook = Notebook
+        self.NotebookTreeModelInst.SetNotebook(self.Notebook)
+        self.ShowRootPage()
 
-        if IsRootPage:
-            ChildTreeItem.setExpanded(True)
-            self.setCurrentIndex(self.model().index(0, 0))
+    def ShowRootPage(self):
+        RootIndex = self.NotebookTreeModelInst.index(0, 0)
+        self.NotebookTreeModelInst.FetchSubPages(RootIndex)
+        self.expand(RootIndex)
+        self.setCurrentIndex(RootIndex)
+        self.setFocus()
 
     def GetCurrentPageIndexPath(self):
-        SelectedItems = self.selectedItems()
-        if len(SelectedItems) < 1:
+        SelectedIndexes = self.selectionModel().selectedIndexes()
+        if len(SelectedIndexes) < 1:
             return None
-        SelectedItem = SelectedItems[0]
-        return SelectedItem.IndexPath
+        SelectedPage = self.NotebookTreeModelInst.GetPageFromIndex(SelectedIndexes[0])
+        return SelectedPage["IndexPath"].copy() if SelectedPage is not None else None
+
+    def GetIndexFromIndexPath(self, IndexPath):
+        DestinationIndex = self.NotebookTreeModelInst.index(0, 0)
+        for Element in IndexPath[1:]:
+            self.NotebookTreeModelInst.FetchSubPages(DestinationIndex)
+            DestinationIndex = self.NotebookTreeModelInst.index(Element, 0, DestinationIndex)
+        return DestinationIndex
 
     def SelectTreeItemFromIndexPath(self, IndexPath, SelectParent=False, ScrollToLastChild=False, SelectDelta=0):
-        if SelectParent:
-            IndexPath = IndexPath[:-1]
+        IndexPath = IndexPath[:-1] if SelectParent else IndexPath.copy()
         IndexPath[-1] += SelectDelta
-        DestinationIndex = self.model().index(0, 0)
-        for Element in IndexPath[1:]:
-            DestinationIndex = DestinationIndex.child(Element, 0)
+        DestinationIndex = self.GetIndexFromIndexPath(IndexPath)
         self.setCurrentIndex(DestinationIndex)
-        self.currentItem().setExpanded(True)
-        self.scrollToItem(self.currentItem() if not ScrollToLastChild else self.currentItem().child(self.currentItem().childCount() - 1), self.PositionAtCenter)
+        self.NotebookTreeModelInst.FetchSubPages(DestinationIndex)
+        self.expand(DestinationIndex)
+        ScrollIndex = DestinationIndex if not ScrollToLastChild else self.NotebookTreeModelInst.index(self.NotebookTreeModelInst.rowCount(DestinationIndex) - 1, 0, DestinationIndex)
+        self.scrollTo(ScrollIndex, self.PositionAtCenter)
 
     def SelectTreeItemFromIndexPathString(self, IndexPathString, SelectParent=False, ScrollToLastChild=False, SelectDelta=0):
         IndexPath = json.loads(IndexPathString)
         self.SelectTreeItemFromIndexPath(IndexPath, SelectParent=SelectParent, ScrollToLastChild=ScrollToLastChild, SelectDelta=SelectDelta)
 
+    def selectionChanged(self, Selected, Deselected):
+        super().selectionChanged(Selected, Deselected)
+        self.PageSelectionChanged.emit()
+
     def contextMenuEvent(self, event):
         ContextMenu = QMenu(self)
         ContextMenu.addAction(self.MainWindow.NewPageAction)
@@ -72,14 +85,198 @@ class NotebookDisplayWidget(QTreeWidget):
         ContextMenu.addAction(self.MainWindow.CollapseAllAction)
         ContextMenu.exec_(self.mapToGlobal(event.pos()))
 
+    def expandAll(self):
+        self.NotebookTreeModelInst.FetchAllSubPages()
+        super().expandAll()
+
     def collapseAll(self):
         super().collapseAll()
-        self.itemAt(0, 0).setExpanded(True)
-        self.setCurrentIndex(self.model().index(0, 0))
+        RootIndex = self.NotebookTreeModelInst.index(0, 0)
+        self.expand(RootIndex)
+        self.setCurrentIndex(RootIndex)
 
 
-class NotebookDisplayWidgetItem(QTreeWidgetItem):
-    def __init__(self, Title, IndexPath):
+class NotebookTreeModel(QAbstractItemModel):
+    def __init__(self, Notebook):
         super().__init__()
-        self.setText(0, Title)
-        self.IndexPath = IndexPath
+
+        # Store Parameters
+        self.Notebook = Notebook
+
+        # Variables
+        self.FetchedPageIDs = set()
+
+    def SetNotebook(self, Notebook):
+        self.beginResetModel()
+        self.Notebook = Notebook
+        self.FetchedPageIDs.clear()
+        self.endResetModel()
+
+    # Model Methods
+    def index(self, Row, Column, Parent=QModelIndex()):
+        if not self.hasIndex(Row, Column, Parent):
+            return QModelIndex()
+        if not Parent.isValid():
+            return self.createIndex(Row, Column, self.Notebook.RootPage["PageID"])
+        return self.createIndex(Row, Column, self.GetPageFromIndex(Parent)["SubPages"][Row]["PageID"])
+
+    def parent(self, Index):
+        if not Index.isValid():
+            return QModelIndex()
+        Page = self.GetPageFromIndex(Index)
+        if Page is None or Page is self.Notebook.RootPage:
+            return QModelIndex()
+        return self.GetIndexFromPage(self.Notebook.GetSuperOfPageFromIndexPath(Page["IndexPath"]))
+
+    def rowCount(self, Parent=QModelIndex()):
+        if not Parent.isValid():
+            return 1
+        if Parent.column() > 0:
+            return 0
+        Page = self.GetPageFromIndex(Parent)
+        return len(Page["SubPages"]) if Page is not None and Page["PageID"] in self.FetchedPageIDs else 0
+
+    def columnCount(self, Parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, Parent=QModelIndex()):
+        if not Parent.isValid():
+            return True
+        Page = self.GetPageFromIndex(Parent)
+        return Parent.column() == 0 and Page is not None and len(Page["SubPages"]) > 0
+
+    def canFetchMore(self, Parent):
+        if not Parent.isValid():
+            return False
+        Page = self.GetPageFromIndex(Parent)
+        return Page is not None and Page["PageID"] not in self.FetchedPageIDs and len(Page["SubPages"]) > 0
+
+    def fetchMore(self, Parent):
+        if not self.canFetchMore(Parent):
+            return
+        Page = self.GetPageFromIndex(Parent)
+        self.beginInsertRows(Parent, 0, len(Page["SubPages"]) - 1)
+        self.FetchedPageIDs.add(Page["PageID"])
+        self.endInsertRows()
+
+    def data(self, Index, Role=Qt.DisplayRole):
+        Page = self.GetPageFromIndex(Index)
+        if Page is not None and Role == Qt.DisplayRole:
+            return Page["Title"]
+        return None
+
+    # Index Methods
+    def GetPageFromIndex(self, Index):
+        # Indexes hold page IDs rather than the page dictionaries themselves, so an index outliving its page finds nothing instead of a freed object
+        return self.Notebook.GetPageFromPageID(Index.internalId()) if Index.isValid() else None
+
+    def GetIndexFromPage(self, Page):
+        return self.createIndex(Page["IndexPath"][-1], 0, Page["PageID"])
+
+    def FetchSubPages(self, Index):
+        if self.canFetchMore(Index):
+            self.fetchMore(Index)
+
+    def FetchAllSubPages(self, Page=None):
+        Page = Page if Page is not None else self.Notebook.RootPage
+        self.FetchSubPages(self.GetIndexFromPage(Page))
+        for SubPage in Page["SubPages"]:
+            self.FetchAllSubPages(SubPage)
+
+    def SubPagesAreShown(self, Page):
+        # Rows only exist for sub pages of fetched pages whose ancestors are fetched too; a page without sub pages has nothing left to fetch
+        CurrentPage = self.Notebook.RootPage
+        for Index in Page["IndexPath"][1:]:
+            if CurrentPage["PageID"] not in self.FetchedPageIDs:
+                return False
+            CurrentPage = CurrentPage["SubPages"][Index]
+        return Page["PageID"] in self.FetchedPageIDs or len(Page["SubPages"]) < 1
+
+    # Page Methods
+    def AddSubPage(self, Title, Content, SuperPageIndexPath):
+        SuperPage = self.Notebook.GetPageFromIndexPath(SuperPageIndexPath)
+        self.InsertSubPage(SuperPage, lambda: self.Notebook.AddSubPage(Title, Content, SuperPageIndexPath))
+
+    def ImportPage(self, PageToImport):
+        self.InsertSubPage(self.Notebook.RootPage, lambda: self.Notebook.ImportPage(PageToImport))
+
+    def InsertSubPage(self, SuperPage, Insert):
+        Row = len(SuperPage["SubPages"])
+        NotifyInsert = self.SubPagesAreShown(SuperPage)
+        if NotifyInsert:
+            self.FetchedPageIDs.add(SuperPage["PageID"])
+            self.beginInsertRows(self.GetIndexFromPage(SuperPage), Row, Row)
+        Insert()
+        if NotifyInsert:
+            self.endInsertRows()
+
+    def DeleteSubPage(self, IndexPath):
+        Page = self.Notebook.GetPageFromIndexPath(IndexPath)
+        SuperPage = self.Notebook.GetSuperOfPageFromIndexPath(IndexPath)
+        NotifyRemove = self.SubPagesAreShown(SuperPage)
+        if NotifyRemove:
+            self.beginRemoveRows(self.GetIndexFromPage(SuperPage), Page["IndexPath"][-1], Page["IndexPath"][-1])
+        self.Notebook.DeleteSubPage(IndexPath)
+        if NotifyRemove:
+            self.endRemoveRows()
+
+    def MoveSubPage(self, IndexPath, Delta):
+        SuperPage = self.Notebook.GetSuperOfPageFromIndexPath(IndexPath)
+        if SuperPage is None:
+            return False
+        TargetPageIndex = IndexPath[-1] + Delta
+        if TargetPageIndex < 0 or TargetPageIndex > len(SuperPage["SubPages"]) - 1:
+            return False
+        if Delta not in (-1, 1):
+            return self.ChangeLayout(lambda: self.Notebook.MoveSubPage(IndexPath, Delta))
+        return self.MovePageRow(IndexPath, SuperPage, TargetPageIndex + 1 if Delta > 0 else TargetPageIndex, lambda: self.Notebook.MoveSubPage(IndexPath, Delta))
+
+    def PromoteSubPage(self, IndexPath):
+        SuperOfSuperPage = self.Notebook.GetSuperOfPageFromIndexPath(IndexPath[:-1])
+        self.MovePageRow(IndexPath, SuperOfSuperPage, len(SuperOfSuperPage["SubPages"]), lambda: self.Notebook.PromoteSubPage(IndexPath))
+
+    def DemoteSubPage(self, IndexPath, SiblingPageIndex):
+        SiblingPage = self.Notebook.GetSuperOfPageFromIndexPath(IndexPath)["SubPages"][SiblingPageIndex]
+        self.MovePageRow(IndexPath, SiblingPage, len(SiblingPage["SubPages"]), lambda: self.Notebook.DemoteSubPage(IndexPath, SiblingPageIndex))
+
+    def MovePageRow(self, IndexPath, DestinationSuperPage, DestinationRow, Move):
+        # Destination rows are counted before the move, as beginMoveRows expects
+        SourceSuperPage = self.Notebook.GetSuperOfPageFromIndexPath(IndexPath)
+        SourceRow = IndexPath[-1]
+        SourceShown = self.SubPagesAreShown(SourceSuperPage)
+        DestinationShown = self.SubPagesAreShown(DestinationSuperPage)
+        if DestinationShown:
+            self.FetchedPageIDs.add(DestinationSuperPage["PageID"])
+        SourceIndex = self.GetIndexFromPage(SourceSuperPage)
+        DestinationIndex = self.GetIndexFromPage(DestinationSuperPage)
+        if SourceShown and DestinationShown:
+            self.beginMoveRows(SourceIndex, SourceRow, SourceRow, DestinationIndex, DestinationRow)
+            Result = Move()
+            self.endMoveRows()
+        elif SourceShown:
+            self.beginRemoveRows(SourceIndex, SourceRow, SourceRow)
+            Result = Move()
+            self.endRemoveRows()
+        elif DestinationShown:
+            self.beginInsertRows(DestinationIndex, DestinationRow, DestinationRow)
+            Result = Move()
+            self.endInsertRows()
+        else:
+            Result = Move()
+        return Result
+
+    def ChangeLayout(self, Change):
+        # Pages swapped further than one row apart are not a single move, so shown rows are remapped from their new index paths instead
+        self.layoutAboutToBeChanged.emit()
+        Result = Change()
+        PersistentIndexes = self.persistentIndexList()
+        self.changePersistentIndexList(PersistentIndexes, [self.GetIndexFromPage(self.GetPageFromIndex(Index)) if self.GetPageFromIndex(Index) is not None else QModelIndex() for Index in PersistentIndexes])
+        self.layoutChanged.emit()
+        return Result
+
+    def RenamePage(self, IndexPath, NewTitle):
+        Page = self.Notebook.GetPageFromIndexPath(IndexPath)
+        self.Notebook.RenamePage(IndexPath, NewTitle)
+        if Page is self.Notebook.RootPage or self.SubPagesAreShown(self.Notebook.GetSuperOfPageFromIndexPath(IndexPath)):
+            PageIndex = self.GetIndexFromPage(Page)
+            self.dataChanged.emit(PageIndex, PageIndex, [Qt.DisplayRole])
@@ -66,12 +66,17 @@ class SearchWidget(QFrame):
         self.setVisible(False)
 
     def Search(self):
+        self.MainWindow.TextWidgetInst.FlushPendingEdits()
         SearchText = self.SearchTextLineEdit.text()
         MatchCase = self.MatchCaseCheckBox.isChecked()
         self.ResultsList.clear()
         if SearchText == "":
             return
         Results = self.Notebook.GetSearchResults(SearchText, MatchCase=MatchCase)
+        self.DisplayResults(Results)
+
+    def DisplayResults(self, Results):
+        self.ResultsList.clear()
         for Result in Results:
             self.ResultsList.addItem(SearchResult(Result[0], Result[1]))
         self.ResultsList.setCurrentIndex(self.ResultsList.model().index(0))
@@ -135,6 +140,7 @@ class SearchWidget(QFrame):
 
     def ReplaceAllInNotebook(self, SearchText=None, ReplaceText=None, MatchCase=None, DelayTextUpdate=False):
         if not self.MainWindow.TextWidgetInst.ReadMode:
+            self.MainWindow.TextWidgetInst.FlushPendingEdits()
             if SearchText is None:
                 SearchText = self.SearchTextLineEdit.text()
             if SearchText == "":
@@ -151,9 +157,11 @@ class SearchWidget(QFrame):
 
     def ReplaceAllInPageAndSubPages(self, CurrentPage, SearchText, ReplaceText, MatchCase):
         if MatchCase:
-            CurrentPage["Content"] = CurrentPage["Content"].replace(SearchText, ReplaceText)
+            NewContent = CurrentPage["Content"].replace(SearchText, ReplaceText)
         else:
-            CurrentPage["Content"] = re.sub(re.escape(SearchText), lambda x: ReplaceText, CurrentPage["Content"], flags=re.IGNORECASE)
+            NewContent = re.sub(re.escape(SearchText), lambda x: ReplaceText, CurrentPage["Content"], flags=re.IGNORECASE)
+        if NewContent != CurrentPage["Content"]:
+            self.Notebook.SetPageContent(CurrentPage, NewContent)
         for SubPage in CurrentPage["SubPages"]:
             self.ReplaceAllInPageAndSubPages(SubPage, SearchText, ReplaceText, MatchCase)
 
@@ -169,7 +177,6 @@ class SearchWidget(QFrame):
 
     def RefreshSearch(self):
         self.RefreshingSearchResults = True
-        self.Notebook.SearchIndexUpToDate = False
         self.Search()
         self.RefreshingSearchResults = False
 
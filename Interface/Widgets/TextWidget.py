@@ -1,13 +1,16 @@
-import json
+import re
 import webbrowser
 
 import mistune
 from PyQt5 import QtCore
 from PyQt5.QtCore import QTimer
-from PyQt5.QtGui import QTextCursor, QTextCharFormat
+from PyQt5.QtGui import QTextCursor, QTextCharFormat, QTextDocument
 from PyQt5.QtWidgets import QTextEdit, QInputDialog, QMessageBox
 
 from Core import MarkdownRenderers
+from Core.RenderCache import RenderCache
+from Interface.ImageResourceCache import ImageResourceCache
+from Interface.PageDocumentCache import PageDocumentCache
 from Interface.Dialogs.InsertLinksDialog import InsertLinksDialog
 from Interface.Dialogs.InsertTableDialog import InsertTableDialog, TableDimensionsDialog
 
@@ -25,11 +28,33 @@ class TextWidget(QTextEdit):
         self.DisplayChanging = False
         self.ReadMode = True
         self.DefaultCharacterFormat = QTextCharFormat()
+        self.EditSyncDelay = 300
+        self.PendingEdits = []
+        self.PlainTextCharacters = str.maketrans({"\u2029": "\n", "\u2028": "\n", "\ufdd0": "\n", "\ufdd1": "\n", "\u00a0": " "})
+        self.WideCharacterPattern = re.compile("[\U00010000-\U0010FFFF]")
 
         # Create Markdown Parser
         self.Renderer = MarkdownRenderers.Renderer(self.Notebook)
         self.MarkdownParser = mistune.Markdown(renderer=self.Renderer)
 
+        # Create Render, Image Resource, and Page Document Caches
+        self.RenderCache = RenderCache()
+        self.ImageResourceCache = ImageResourceCache()
+        self.PageDocumentCache = PageDocumentCache()
+
+        # Documents
+        self.ReadModeDocument = QTextDocument(self)
+        self.PageDocument = None
+        self.DocumentPage = None
+        self.DocumentContent = None
+        self.setDocument(self.ReadModeDocument)
+
+        # Edit Sync Timer
+        self.EditSyncTimer = QTimer(self)
+        self.EditSyncTimer.setSingleShot(True)
+        self.EditSyncTimer.setInterval(self.EditSyncDelay)
+        self.EditSyncTimer.timeout.connect(self.FlushPendingEdits)
+
         # Tab Behavior
         self.setTabChangesFocus(True)
 
@@ -43,16 +68,118 @@ class TextWidget(QTextEdit):
         self.verticalScrollBar().rangeChanged.connect(self.AutoScroll)
 
     def UpdateText(self):
+        self.FlushPendingEdits()
         self.DisplayChanging = True
         if self.ReadMode:
-            DisplayText = MarkdownRenderers.ConstructMarkdownStringFromPage(self.CurrentPage, self.Notebook)
-            HTMLText = self.MarkdownParser(DisplayText)
-            self.setHtml(HTMLText)
+            self.ShowDocument(self.ReadModeDocument)
+            self.setHtml(self.GetRenderedHTML(self.CurrentPage))
         else:
-            self.setCurrentCharFormat(self.DefaultCharacterFormat)
-            self.setPlainText(self.CurrentPage["Content"])
+            self.ShowPageDocument(self.CurrentPage)
         self.DisplayChanging = False
 
+    def ShowPageDocument(self, Page):
+        if self.DocumentPage is Page and self.DocumentContent == Page["Content"]:
+            return
+        Entry = self.PageDocumentCache.Take(Page)
+        if Entry is None:
+            Document = QTextDocument(self)
+            Document.setPlainText(Page["Content"])
+            Document.setProperty("HasWideCharacters", self.WideCharacterPattern.search(Page["Content"]) is not None)
+            Document.contentsChange.connect(self.PageDocumentContentsChange)
+            self.ShowDocument(Document, Page)
+            self.DocumentContent = Page["Content"]
+            self.setCurrentCharFormat(self.DefaultCharacterFormat)
+        else:
+            self.ShowDocument(Entry["Document"], Page)
+            self.DocumentContent = Entry["Content"]
+            self.setTextCursor(Entry["Cursor"])
+            self.horizontalScrollBar().setValue(Entry["ScrollPositions"][0])
+            self.verticalScrollBar().setValue(Entry["ScrollPositions"][1])
+
+    def ShowDocument(self, Document, Page=None):
+        # The outgoing page's document is cached only once the new one is shown, so an eviction never deletes the document on screen
+        OutgoingPageDocument = self.PageDocument
+        OutgoingPage = self.DocumentPage
+        OutgoingCursor = self.textCursor()
+        OutgoingScrollPositions = (self.horizontalScrollBar().value(), self.verticalScrollBar().value())
+        if Document.defaultFont() != self.font():
+            Document.setDefaultFont(self.font())
+        if Document is not self.document():
+            self.setDocument(Document)
+        self.PageDocument = Document if Page is not None else None
+        self.DocumentPage = Page
+        if OutgoingPageDocument is not None and OutgoingPageDocument is not Document:
+            if OutgoingPage is not None and OutgoingPage is not Page:
+                self.PageDocumentCache.Store(OutgoingPage, OutgoingPageDocument, OutgoingCursor, OutgoingScrollPositions)
+            else:
+                OutgoingPageDocument.deleteLater()
+
+    def ClearPageDocuments(self):
+        self.FlushPendingEdits()
+        self.PageDocumentCache.Clear()
+        self.DocumentPage = None
+
+    # Edit Sync Methods
+    def PageDocumentContentsChange(self, Position, CharsRemoved, CharsAdded):
+        # Showing a document marks all of it as changed without editing it
+        if self.DisplayChanging or self.DocumentPage is None:
+            return
+        LastPosition = self.PageDocument.characterCount() - 1
+        Cursor = QTextCursor(self.PageDocument)
+        Cursor.setPosition(min(Position, LastPosition))
+        Cursor.setPosition(min(Position + CharsAdded, LastPosition), QTextCursor.KeepAnchor)
+        AddedText = Cursor.selectedText().translate(self.PlainTextCharacters)
+        if self.WideCharacterPattern.search(AddedText) is not None:
+            self.PageDocument.setProperty("HasWideCharacters", True)
+        self.RecordPendingEdit(Position, CharsRemoved, AddedText)
+        self.EditSyncTimer.start()
+
+    def RecordPendingEdit(self, Position, CharsRemoved, AddedText):
+        # Typing and backspacing at the end of the last edit extend it, so a burst of keystrokes reaches the page as one edit
+        if len(self.PendingEdits) > 0:
+            LastPosition, LastCharsRemoved, LastAddedText = self.PendingEdits[-1]
+            LastEnd = LastPosition + len(LastAddedText)
+            if CharsRemoved == 0 and Position == LastEnd:
+                self.PendingEdits[-1] = (LastPosition, LastCharsRemoved, LastAddedText + AddedText)
+                return
+            if AddedText == "" and Position + CharsRemoved == LastEnd and CharsRemoved <= len(LastAddedText):
+                self.PendingEdits[-1] = (LastPosition, LastCharsRemoved, LastAddedText[:len(LastAddedText) - CharsRemoved])
+                return
+        self.PendingEdits.append((Position, CharsRemoved, AddedText))
+
+    def FlushPendingEdits(self):
+        self.EditSyncTimer.stop()
+        if len(self.PendingEdits) < 1:
+            return
+        PendingEdits = self.PendingEdits
+        self.PendingEdits = []
+        if self.DocumentPage is None:
+            return
+        if self.PageDocument.property("HasWideCharacters"):
+            # Document positions count UTF-16 code units, which only match string indices when every character is in the BMP
+            Content = self.PageDocument.toPlainText()
+            self.PageDocument.setProperty("HasWideCharacters", self.WideCharacterPattern.search(Content) is not None)
+        else:
+            Content = self.DocumentContent
+            for Position, CharsRemoved, AddedText in PendingEdits:
+                Content = Content[:Position] + AddedText + Content[Position + CharsRemoved:]
+        self.DocumentContent = Content
+        self.MainWindow.SyncPageContent(self.DocumentPage, Content)
+
+    def GetRenderedHTML(self, Page):
+        VersionKey = self.Notebook.GetRenderVersionKey(Page)
+        HTMLText = self.RenderCache.Get(Page["PageID"], VersionKey)
+        if HTMLText is None:
+            DisplayText = MarkdownRenderers.ConstructMarkdownStringFromPage(Page, self.Notebook)
+            HTMLText = self.MarkdownParser(DisplayText)
+            self.RenderCache.Store(Page["PageID"], VersionKey, HTMLText)
+        return HTMLText
+
+    def loadResource(self, Type, URL):
+        if self.ImageResourceCache.URLIsImageResource(URL):
+            return self.ImageResourceCache.GetImageFromURL(URL, self.Notebook)
+        return super().loadResource(Type, URL)
+
     def SetCurrentPage(self, Page):
         self.CurrentPage = Page
         self.UpdateText()
@@ -112,24 +239,20 @@ class TextWidget(QTextEdit):
 
     def MultipleBlockPrefix(self, Prefix):
         Cursor = self.textCursor()
-        self.SelectBlocks(Cursor)
-        Blocks = Cursor.selectedText().split("\u2029")
-        PrefixedText = ""
-
-        if Prefix == "1. ":
-            CurrentPrefixInt = 1
-            for Block in Blocks:
-                if Block != "":
-                    PrefixedText += str(CurrentPrefixInt) + ". " + Block + "\u2029"
-                    CurrentPrefixInt += 1
-                else:
-                    PrefixedText += Block + "\u2029"
-        else:
-            for Block in Blocks:
-                PrefixedText += (Prefix if Block != "" else "") + Block + "\u2029"
+        Block = self.document().findBlock(min(Cursor.anchor(), Cursor.position()))
+        LastBlock = self.document().findBlock(max(Cursor.anchor(), Cursor.position()))
+        CurrentPrefixInt = 1
 
         Cursor.beginEditBlock()
-        Cursor.insertText(PrefixedText[:-1])
+        while Block.isValid() and Block.blockNumber() <= LastBlock.blockNumber():
+            if Block.length() > 1:
+                Cursor.setPosition(Block.position())
+                if Prefix == "1. ":
+                    Cursor.insertText(str(CurrentPrefixInt) + ". ")
+                    CurrentPrefixInt += 1
+                else:
+                    Cursor.insertText(Prefix)
+            Block = Block.next()
         self.MakeCursorVisible()
         Cursor.endEditBlock()
 
@@ -156,44 +279,29 @@ class TextWidget(QTextEdit):
 
     def MoveLine(self, Delta):
         if Delta != 0:
-            LineData = self.GetLineData()
-            if (Delta < 0 and LineData[1] > 0) or (Delta > 0 and LineData[1] < len(LineData[0]) - 1):
-                CurrentLine = LineData[0][LineData[1]]
-                TargetIndex = LineData[1] + (-1 if Delta < 0 else 1)
-                TargetLine = LineData[0][TargetIndex]
-                LineData[0][LineData[1]] = TargetLine
-                LineData[0][TargetIndex] = CurrentLine
-                Text = self.GetTextFromLineData(LineData)
-                NewPosition = LineData[2] + ((len(TargetLine) + 1) * (-1 if Delta < 0 else 1))
-                self.setPlainText(Text)
-                Cursor = self.textCursor()
-                Cursor.setPosition(NewPosition)
-                self.setTextCursor(Cursor)
+            Cursor = self.textCursor()
+            CurrentBlock = Cursor.block()
+            TargetBlock = CurrentBlock.previous() if Delta < 0 else CurrentBlock.next()
+            if TargetBlock.isValid():
+                PositionInBlock = Cursor.positionInBlock()
+                UpperBlock, LowerBlock = (TargetBlock, CurrentBlock) if Delta < 0 else (CurrentBlock, TargetBlock)
+                SwappedText = LowerBlock.text() + "\n" + UpperBlock.text()
+                NewPosition = UpperBlock.position() + PositionInBlock + (0 if Delta < 0 else LowerBlock.length())
+                Cursor.beginEditBlock()
+                Cursor.setPosition(UpperBlock.position())
+                Cursor.setPosition(LowerBlock.position() + LowerBlock.length() - 1, QTextCursor.KeepAnchor)
+                Cursor.insertText(SwappedText)
+                Cursor.endEditBlock()
+                self.SetCursorPosition(NewPosition)
                 self.VerticallyCenterCursor()
 
-    def GetLineData(self):
-        Text = self.toPlainText()
-        Lines = Text.splitlines()
-        if Text.endswith("\n"):
-            Lines.append("")
+    def SetCursorPosition(self, Position):
         Cursor = self.textCursor()
-        AbsolutePosition = Cursor.position()
-        BlockPosition = Cursor.positionInBlock()
-        LineIndex = 0
-        CurrentPosition = AbsolutePosition
-        for Index in range(len(Lines)):
-            LineLength = len(Lines[Index])
-            if LineLength < CurrentPosition:
-                CurrentPosition -= LineLength + 1
-            else:
-                LineIndex = Index
-                break
-        LineData = (Lines, LineIndex, AbsolutePosition, BlockPosition)
-        return LineData
+        Cursor.setPosition(Position)
+        self.setTextCursor(Cursor)
 
-    def GetTextFromLineData(self, LineData):
-        Text = "\n".join(LineData[0])
-        return Text
+    def GetPageLinkTargetFromIndexPath(self, IndexPath):
+        return self.Notebook.GetPageLinkTarget(self.Notebook.GetPageFromIndexPath(IndexPath))
 
     def CursorOnBlankLine(self, Cursor):
         Cursor.select(QTextCursor.LineUnderCursor)
@@ -204,7 +312,7 @@ class TextWidget(QTextEdit):
         CursorVerticalPosition = self.cursorRect().top()
         ViewportHeight = self.viewport().height()
         VerticalScrollBar = self.verticalScrollBar()
-        VerticalScrollBar.setValue(VerticalScrollBar.value() + CursorVerticalPosition - (ViewportHeight / 2))
+        VerticalScrollBar.setValue(VerticalScrollBar.value() + CursorVerticalPosition - (ViewportHeight // 2))
 
     def MakeCursorVisible(self):
         QTimer.singleShot(0, self.ensureCursorVisible)
@@ -222,8 +330,9 @@ class TextWidget(QTextEdit):
     def mouseDoubleClickEvent(self, QMouseEvent):
         Anchor = self.anchorAt(QMouseEvent.pos())
         if Anchor != "":
-            if self.Notebook.StringIsValidIndexPath(Anchor):
-                self.MainWindow.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPathString(Anchor)
+            LinkedPage = self.Notebook.GetPageFromLinkTarget(Anchor)
+            if LinkedPage is not None:
+                self.MainWindow.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(LinkedPage["IndexPath"].copy())
                 QMouseEvent.accept()
             else:
                 webbrowser.open(Anchor)
@@ -295,11 +404,11 @@ class TextWidget(QTextEdit):
                 Cursor = self.textCursor()
                 Cursor.beginEditBlock()
                 if InsertLinksDialogInst.InsertIndexPath is not None:
-                    self.SelectionSpanWrap("[", "](" + json.dumps(InsertLinksDialogInst.InsertIndexPath, indent=None) + ")")
+                    self.SelectionSpanWrap("[", "](" + self.GetPageLinkTargetFromIndexPath(InsertLinksDialogInst.InsertIndexPath) + ")")
                 elif InsertLinksDialogInst.InsertIndexPaths is not None and InsertLinksDialogInst.SubPageLinksSeparator is not None:
                     InsertString = ""
                     for SubPagePath in InsertLinksDialogInst.InsertIndexPaths:
-                        InsertString += "[" + SubPagePath[0] + "](" + json.dumps(SubPagePath[1], indent=None) + ")" + InsertLinksDialogInst.SubPageLinksSeparator
+                        InsertString += "[" + SubPagePath[0] + "](" + self.GetPageLinkTargetFromIndexPath(SubPagePath[1]) + ")" + InsertLinksDialogInst.SubPageLinksSeparator
                     InsertString = InsertString.rstrip()
                     self.InsertOnBlankLine(InsertString)
                     self.MakeCursorVisible()
@@ -316,14 +425,13 @@ class TextWidget(QTextEdit):
             Cursor = self.textCursor()
             SearchText = Cursor.selectedText()
             if SearchText != "" and "\u2029" not in SearchText:
-                SearchResults = self.Notebook.GetSearchResults(SearchText, ExactTitleOnly=True)
-                SearchResultsLength = len(SearchResults)
-                if SearchResultsLength > 0:
-                    if SearchResultsLength > 1:
+                MatchingPages = self.Notebook.GetPagesWithTitle(SearchText)
+                MatchingPagesLength = len(MatchingPages)
+                if MatchingPagesLength > 0:
+                    if MatchingPagesLength > 1:
                         self.MainWindow.DisplayMessageBox("Multiple pages found.  Use the full link dialog to insert a link.", Icon=QMessageBox.Warning)
                     else:
-                        TopResultIndexPath = SearchResults[0][1]
-                        self.SelectionSpanWrap("[", "](" + json.dumps(TopResultIndexPath, indent=None) + ")")
+                        self.SelectionSpanWrap("[", "](" + self.Notebook.GetPageLinkTarget(MatchingPages[0]) + ")")
                 else:
                     self.MainWindow.DisplayMessageBox("No pages with this title found.")
 
@@ -361,30 +469,31 @@ class TextWidget(QTextEdit):
 
     def DuplicateLines(self):
         if not self.ReadMode and self.hasFocus():
-            LineData = self.GetLineData()
-            CurrentLine = LineData[0][LineData[1]]
-            LineData[0].insert(LineData[1] + 1, CurrentLine)
-            Text = self.GetTextFromLineData(LineData)
-            NewPosition = LineData[2] + len(CurrentLine) + 1
-            self.setPlainText(Text)
             Cursor = self.textCursor()
-            Cursor.setPosition(NewPosition)
-            self.setTextCursor(Cursor)
+            Block = Cursor.block()
+            NewPosition = Cursor.position() + Block.length()
+            Cursor.beginEditBlock()
+            Cursor.setPosition(Block.position() + Block.length() - 1)
+            Cursor.insertText("\n" + Block.text())
+            Cursor.endEditBlock()
+            self.SetCursorPosition(NewPosition)
             self.VerticallyCenterCursor()
 
     def DeleteLine(self):
         if not self.ReadMode and self.hasFocus():
-            LineData = self.GetLineData()
-            if len(LineData[0]) > 0:
-                del LineData[0][LineData[1]]
-                Text = self.GetTextFromLineData(LineData)
-                self.setPlainText(Text)
-                PositionOfLineStart = LineData[2] - LineData[3]
-                if LineData[1] < len(LineData[0]):
-                    NewPosition = PositionOfLineStart + len(LineData[0][LineData[1]])
-                else:
-                    NewPosition = PositionOfLineStart - 1
-                NewPosition = max(0, NewPosition)
+            if self.document().characterCount() > 1:
                 Cursor = self.textCursor()
-                Cursor.setPosition(NewPosition)
-                self.setTextCursor(Cursor)
+                Block = Cursor.block()
+                NextBlock = Block.next()
+                Cursor.beginEditBlock()
+                if NextBlock.isValid():
+                    NewPosition = Block.position() + NextBlock.length() - 1
+                    Cursor.setPosition(Block.position())
+                    Cursor.setPosition(NextBlock.position(), QTextCursor.KeepAnchor)
+                else:
+                    NewPosition = max(0, Block.position() - 1)
+                    Cursor.setPosition(NewPosition)
+                    Cursor.setPosition(Block.position() + Block.length() - 1, QTextCursor.KeepAnchor)
+                Cursor.removeSelectedText()
+                Cursor.endEditBlock()
+                self.SetCursorPosition(NewPosition)
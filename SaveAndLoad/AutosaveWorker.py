@@ -0,0 +1,41 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from Core import Base64Converters
+from SaveAndLoad import Journal
+
+
+class AutosaveWorker(QThread):
+    Completed = pyqtSignal(bool, str)
+
+    def __init__(self, RecoveryPath, RecoveryHeader, Records, CompactionThreshold):
+        super().__init__()
+
+        # Store Parameters
+        self.RecoveryPath = RecoveryPath
+        self.RecoveryHeader = RecoveryHeader
+        self.Records = Records
+        self.CompactionThreshold = CompactionThreshold
+
+        # Variables
+        self.Succeeded = False
+        self.ErrorString = ""
+        self.RecoverySize = 0
+        self.Compacted = False
+
+    def run(self):
+        try:
+            self.EncodeImages()
+            self.RecoverySize = Journal.AppendJournalRecords(self.RecoveryPath, self.RecoveryHeader, self.Records)
+            if self.RecoverySize > self.CompactionThreshold:
+                CompactedRecords = Journal.CompactJournalRecords(Journal.ReadJournalRecords(self.RecoveryPath, self.RecoveryHeader))
+                self.RecoverySize = Journal.RewriteJournal(self.RecoveryPath, self.RecoveryHeader, CompactedRecords)
+                self.Compacted = True
+            self.Succeeded = True
+        except Exception as Error:
+            self.ErrorString = str(Error)
+        self.Completed.emit(self.Succeeded, self.ErrorString)
+
+    def EncodeImages(self):
+        for Record in self.Records:
+            if "Data" in Record:
+                Record["Base64String"] = Base64Converters.GetBase64StringFromBinary(Record.pop("Data"))
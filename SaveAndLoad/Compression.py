@@ -0,0 +1,108 @@
+import abc
+import bz2
+import gzip
+import lzma
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CompressionCodec(metaclass=abc.ABCMeta):
+    Extension = ""
+    Magic = b""
+    MinimumLevel = 1
+    MaximumLevel = 9
+    DefaultLevel = 9
+
+    # Codec Methods
+    @abc.abstractmethod
+    def Compress(self, Data, Level):
+        pass
+
+    @abc.abstractmethod
+    def Decompress(self, Data):
+        pass
+
+    @abc.abstractmethod
+    def OpenStream(self, RawFile):
+        pass
+
+    def GetLevel(self, Level):
+        return self.DefaultLevel if Level is None else max(self.MinimumLevel, min(self.MaximumLevel, Level))
+
+
+class GzipCodec(CompressionCodec):
+    Extension = ".gz"
+    Magic = b"\x1f\x8b"
+
+    def Compress(self, Data, Level):
+        return gzip.compress(Data, compresslevel=Level, mtime=0)
+
+    def Decompress(self, Data):
+        return gzip.decompress(Data)
+
+    def OpenStream(self, RawFile):
+        return gzip.GzipFile(fileobj=RawFile)
+
+
+class Bzip2Codec(CompressionCodec):
+    Extension = ".bz2"
+    Magic = b"BZh"
+
+    def Compress(self, Data, Level):
+        return bz2.compress(Data, compresslevel=Level)
+
+    def Decompress(self, Data):
+        return bz2.decompress(Data)
+
+    def OpenStream(self, RawFile):
+        return bz2.BZ2File(RawFile)
+
+
+class LZMACodec(CompressionCodec):
+    Extension = ".xz"
+    Magic = b"\xfd7zXZ\x00"
+    MinimumLevel = 0
+    DefaultLevel = 6
+
+    def Compress(self, Data, Level):
+        return lzma.compress(Data, preset=Level)
+
+    def Decompress(self, Data):
+        return lzma.decompress(Data)
+
+    def OpenStream(self, RawFile):
+        return lzma.LZMAFile(RawFile)
+
+
+Codecs = {}
+Codecs["Gzip"] = GzipCodec()
+Codecs["Bzip2"] = Bzip2Codec()
+Codecs["LZMA"] = LZMACodec()
+
+MagicLength = max(len(Codec.Magic) for Codec in Codecs.values())
+BlockSize = 4 * 1024 * 1024
+
+
+def GetCodecNameFromMagic(Header):
+    for CodecName, Codec in Codecs.items():
+        if Header[:len(Codec.Magic)] == Codec.Magic:
+            return CodecName
+    return None
+
+
+def CompressData(Data, CodecName, Level=None, Parallel=False):
+    if not Parallel or len(Data) <= BlockSize:
+        return CompressBlocks([Data], CodecName, Level=Level)[0]
+
+    # Each block is a complete stream, and all three formats read concatenated streams back as one
+    DataView = memoryview(Data)
+    return b"".join(CompressBlocks([DataView[Offset:Offset + BlockSize] for Offset in range(0, len(Data), BlockSize)], CodecName, Level=Level, Parallel=True))
+
+
+def CompressBlocks(Blocks, CodecName, Level=None, Parallel=False):
+    Codec = Codecs[CodecName]
+    Level = Codec.GetLevel(Level)
+    if not Parallel or len(Blocks) < 2:
+        return [Codec.Compress(Block, Level) for Block in Blocks]
+    with ThreadPoolExecutor(max_workers=min(len(Blocks), os.cpu_count() or 1)) as Executor:
+        return list(Executor.map(lambda Block: Codec.Compress(Block, Level), Blocks))
@@ -10,7 +10,7 @@ class JSONSerializer:
 
     Likewise, data returned by the GetState method of SerializableMixin inheritors must adhere to these restrictions.
 
-    To serialize data, just call the SerializeDataToJSONString method, which returns the JSON string.
+    To serialize data, just call the SerializeDataToJSONString method, which returns the JSON string.  Pass Compact=True to leave out whitespace and anything the objects can recompute on load.
 
     To deserialize data from a JSON string, call the DeserializeDataFromJSONString method, which returns the reconstituted data structure.
     """
@@ -21,14 +21,22 @@ class JSONSerializer:
         """
         self.ObjectClasses = ObjectClasses
         self.ObjectTypeCalls = {}
+        self.FlatObjectTypes = set()
         for ObjectClass in ObjectClasses:
             self.ObjectTypeCalls[ObjectClass.__name__] = lambda State, ObjectClass=ObjectClass: ObjectClass.CreateFromState(State)
+            if not ObjectClass.StateContainsObjects:
+                self.FlatObjectTypes.add(ObjectClass.__name__)
 
-    def SerializeDataToJSONString(self, Data, Indent=2):
+    def SerializeDataToJSONString(self, Data, Indent=2, Compact=False):
+        if Compact:
+            return json.dumps(Data, cls=CompactEncoder, separators=(",", ":"))
         return json.dumps(Data, cls=Encoder, indent=Indent)
 
     def DeserializeDataFromJSONString(self, JSONString):
-        return json.loads(JSONString, cls=lambda: Decoder(self.ObjectTypeCalls))
+        return self.CreateDecoder().DecodeWithoutHook(JSONString)
+
+    def CreateDecoder(self):
+        return Decoder(self.ObjectTypeCalls, self.FlatObjectTypes)
 
 
 class SerializableMixin(metaclass=abc.ABCMeta):
@@ -36,8 +44,12 @@ class SerializableMixin(metaclass=abc.ABCMeta):
     Inherit from this class, call its __init__ method, and implement its abstract methods to allow any custom object to be serialized and deserialized.
 
     See the docstrings of the abstract methods for details on what they should do.
+
+    Set StateContainsObjects to False in classes whose states never contain other serializable objects, so that they can be decoded without checking every nested dictionary.
     """
 
+    StateContainsObjects = True
+
     @abc.abstractmethod
     def SetState(self, NewState):
         """
@@ -64,6 +76,12 @@ class SerializableMixin(metaclass=abc.ABCMeta):
         """
         pass
 
+    def GetCompactState(self):
+        """
+        This method is used instead of GetState by compact serialization, and can be overridden to leave out anything SetState can recompute.
+        """
+        return self.GetState()
+
 
 class Encoder(json.JSONEncoder):
     def default(self, EncodedObject):
@@ -75,9 +93,21 @@ class Encoder(json.JSONEncoder):
         return super().default(EncodedObject)
 
 
+class CompactEncoder(json.JSONEncoder):
+    def default(self, EncodedObject):
+        if isinstance(EncodedObject, SerializableMixin):
+            Data = {}
+            Data["ObjectData"] = EncodedObject.GetCompactState()
+            Data["ObjectType"] = EncodedObject.__class__.__name__
+            return Data
+        return super().default(EncodedObject)
+
+
 class Decoder(json.JSONDecoder):
-    def __init__(self, ObjectTypeCalls):
+    def __init__(self, ObjectTypeCalls, FlatObjectTypes=()):
         self.ObjectTypeCalls = ObjectTypeCalls
+        self.FlatObjectTypes = FlatObjectTypes
+        self.PlainDecoder = json.JSONDecoder()
         super().__init__(object_hook=self.ObjectHook)
 
     def ObjectHook(self, DecodedObject):
@@ -85,3 +115,16 @@ class Decoder(json.JSONDecoder):
             return DecodedObject
         ObjectType = DecodedObject["ObjectType"]
         return self.ObjectTypeCalls[ObjectType](DecodedObject["ObjectData"])
+
+    def DecodeWithoutHook(self, JSONString):
+        return self.ReconstructObjects(self.PlainDecoder.decode(JSONString))
+
+    def ReconstructObjects(self, DecodedData):
+        # A flat object only needs its own wrapper reconstructed; anything else gets the same bottom-up pass as the object hook
+        if isinstance(DecodedData, dict):
+            if isinstance(DecodedData.get("ObjectType"), str) and DecodedData["ObjectType"] in self.FlatObjectTypes and "ObjectData" in DecodedData:
+                return self.ObjectHook(DecodedData)
+            return self.ObjectHook({Key: self.ReconstructObjects(Value) for Key, Value in DecodedData.items()})
+        if isinstance(DecodedData, list):
+            return [self.ReconstructObjects(Value) for Value in DecodedData]
+        return DecodedData
@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+
+
+def GetJournalPath(SaveFileName):
+    return SaveFileName + ".journal"
+
+
+def GetRecoveryPath(SaveFileName):
+    return SaveFileName + ".recovery"
+
+
+def GetJournalHeader(JournalID):
+    return {"JournalID": JournalID}
+
+
+def GetRecoveryHeader(SaveFileName):
+    SaveFileStat = os.stat(SaveFileName)
+    JournalPath = GetJournalPath(SaveFileName)
+    JournalSize = os.path.getsize(JournalPath) if os.path.isfile(JournalPath) else 0
+    return {"RecoveryFor": os.path.basename(SaveFileName), "SaveFileSize": SaveFileStat.st_size, "SaveFileModifiedTime": SaveFileStat.st_mtime_ns, "JournalSize": JournalSize}
+
+
+def ReadJournalHeader(JournalPath):
+    try:
+        with open(JournalPath, "rb") as JournalFile:
+            Header = json.loads(JournalFile.readline().decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+    return Header if type(Header) == dict else None
+
+
+def AppendJournalRecords(JournalPath, Header, Records):
+    Lines = [json.dumps(Record) for Record in Records]
+    if ReadJournalHeader(JournalPath) != Header:
+        Mode = "wb"
+        Lines.insert(0, json.dumps(Header))
+    else:
+        Mode = "r+b"
+    with open(JournalPath, Mode) as JournalFile:
+        if Mode == "r+b":
+            TruncateTornRecord(JournalFile)
+            if JournalFile.tell() == 0:
+                Lines.insert(0, json.dumps(Header))
+        JournalFile.write(("\n".join(Lines) + "\n").encode("utf-8"))
+        JournalFile.flush()
+        os.fsync(JournalFile.fileno())
+    return os.path.getsize(JournalPath)
+
+
+def RewriteJournal(JournalPath, Header, Records):
+    Lines = [json.dumps(Header)] + [json.dumps(Record) for Record in Records]
+    TemporaryFileDescriptor, TemporaryFileName = tempfile.mkstemp(prefix="." + os.path.basename(JournalPath) + ".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(JournalPath)))
+    try:
+        with os.fdopen(TemporaryFileDescriptor, "wb") as JournalFile:
+            JournalFile.write(("\n".join(Lines) + "\n").encode("utf-8"))
+            JournalFile.flush()
+            os.fsync(JournalFile.fileno())
+        os.replace(TemporaryFileName, JournalPath)
+    except OSError:
+        if os.path.isfile(TemporaryFileName):
+            os.remove(TemporaryFileName)
+        raise
+    return os.path.getsize(JournalPath)
+
+
+def CompactJournalRecords(Records):
+    # A value is dropped when a later record replaces it, unless a rename in between could have moved it
+    CompactedRecords = []
+    SupersededKeys = set()
+    for Record in reversed(Records):
+        Operation = Record["Operation"]
+        if Operation == "RenameImage":
+            SupersededKeys.difference_update({("Image", Record["FileName"]), ("Image", Record["NewFileName"])})
+        elif Operation == "RenameTemplate":
+            SupersededKeys.difference_update({("Template", Record["TemplateName"]), ("Template", Record["NewTemplateName"])})
+        else:
+            ValueKey = GetRecordValueKey(Record)
+            if ValueKey is not None:
+                if ValueKey in SupersededKeys:
+                    continue
+                SupersededKeys.add(ValueKey)
+        CompactedRecords.append(Record)
+    CompactedRecords.reverse()
+    return CompactedRecords
+
+
+def GetRecordValueKey(Record):
+    Operation = Record["Operation"]
+    if Operation == "SetPageContent":
+        return ("Page", Record["PageID"])
+    elif Operation in ("SetImage", "DeleteImage"):
+        return ("Image", Record["FileName"])
+    elif Operation in ("AddTemplate", "DeleteTemplate"):
+        return ("Template", Record["TemplateName"])
+    elif Operation in ("SetHeader", "SetFooter"):
+        return (Operation,)
+    return None
+
+
+def TruncateTornRecord(JournalFile):
+    JournalFile.seek(0, os.SEEK_END)
+    End = JournalFile.tell()
+    Position = End
+    while Position > 0:
+        ChunkStart = max(0, Position - 4096)
+        JournalFile.seek(ChunkStart)
+        Chunk = JournalFile.read(Position - ChunkStart)
+        NewlineIndex = Chunk.rfind(b"\n")
+        if NewlineIndex != -1:
+            Position = ChunkStart + NewlineIndex + 1
+            break
+        Position = ChunkStart
+    if Position != End:
+        JournalFile.seek(Position)
+        JournalFile.truncate()
+    JournalFile.seek(Position)
+
+
+def ReadJournalRecords(JournalPath, Header):
+    Records = []
+    if ReadJournalHeader(JournalPath) != Header:
+        return Records
+    with open(JournalPath, "rb") as JournalFile:
+        JournalFile.readline()
+        for Line in JournalFile:
+            if not Line.endswith(b"\n"):
+                break
+            try:
+                Records.append(json.loads(Line.decode("utf-8")))
+            except ValueError:
+                break
+    return Records
+
+
+def DeleteJournal(JournalPath):
+    if os.path.isfile(JournalPath):
+        os.remove(JournalPath)
@@ -0,0 +1,142 @@
+import io
+import mmap
+import os
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from Core.LazyContent import LazyDict
+from SaveAndLoad import Compression, NotebookContainer
+from SaveAndLoad.MappedJSONReader import MappedJSONReader
+from SaveAndLoad.StreamingJSONReader import StreamingJSONReader
+
+
+class LoadWorker(QThread):
+    Progress = pyqtSignal(str)
+    PartialDataLoaded = pyqtSignal(object)
+    Completed = pyqtSignal(bool, str)
+
+    def __init__(self, OpenFileName, JSONSerializer, LazyMode=False):
+        super().__init__()
+
+        # Store Parameters
+        self.OpenFileName = OpenFileName
+        self.JSONSerializer = JSONSerializer
+        self.LazyMode = LazyMode
+
+        # Variables
+        self.Data = None
+        self.Succeeded = False
+        self.ErrorString = ""
+        self.Decoder = self.JSONSerializer.CreateDecoder()
+        self.Reader = None
+        self.RawFile = None
+        self.FileSize = 0
+        self.LastReportedPercentage = None
+        self.MappedMode = False
+        self.CodecName = None
+
+    def run(self):
+        try:
+            Header = self.ReadHeader()
+            self.CodecName = Compression.GetCodecNameFromMagic(Header)
+            self.LazyMode = self.LazyMode and self.CodecName is None
+            if NotebookContainer.StartsWithContainerMagic(Header):
+                self.ReadContainerFile()
+            elif self.LazyMode:
+                self.ReadMappedFile()
+            else:
+                self.ReadStreamedFile()
+            self.Succeeded = True
+        except Exception as Error:
+            self.ErrorString = str(Error)
+        self.Reader = None
+        self.Completed.emit(self.Succeeded, self.ErrorString)
+
+    def ReadHeader(self):
+        with open(self.OpenFileName, "rb") as RawFile:
+            return RawFile.read(max(len(NotebookContainer.ContainerMagic), Compression.MagicLength))
+
+    def ReadContainerFile(self):
+        self.Progress.emit("Loading " + os.path.basename(self.OpenFileName) + "...")
+        with open(self.OpenFileName, "rb") as RawFile:
+            Buffer = mmap.mmap(RawFile.fileno(), 0, access=mmap.ACCESS_READ)
+        self.Data = NotebookContainer.ReadContainer(Buffer, self.Decoder)
+        self.MappedMode = True
+
+    def ReadMappedFile(self):
+        self.Reader = MappedJSONReader(self.OpenFileName, self.Decoder.PlainDecoder)
+        self.FileSize = len(self.Reader.Buffer)
+        self.Data = self.ReadDocument()
+        self.Reader.ReadEnd()
+        self.MappedMode = True
+
+    def ReadStreamedFile(self):
+        with open(self.OpenFileName, "rb") as RawFile:
+            self.RawFile = RawFile
+            self.FileSize = os.fstat(RawFile.fileno()).st_size
+            Stream = Compression.Codecs[self.CodecName].OpenStream(RawFile) if self.CodecName is not None else RawFile
+            with io.TextIOWrapper(Stream, encoding="utf-8") as TextStream:
+                self.Reader = StreamingJSONReader(TextStream, self.Decoder.PlainDecoder)
+                self.Data = self.ReadDocument()
+                self.Reader.ReadEnd()
+
+    def ReportProgress(self):
+        Position = self.Reader.Position if self.LazyMode else self.RawFile.tell()
+        Percentage = min(100, (100 * Position) // max(1, self.FileSize))
+        if Percentage != self.LastReportedPercentage:
+            self.LastReportedPercentage = Percentage
+            self.Progress.emit("Loading " + os.path.basename(self.OpenFileName) + "...  " + str(Percentage) + "%")
+
+    # Structure Methods
+    def ReadDocument(self):
+        if self.Reader.PeekCharacter() != "{":
+            return self.Decoder.ReconstructObjects(self.Reader.ReadValue())
+        Document = {}
+        for Key in self.Reader.ReadObjectKeys():
+            if Key == "ObjectData" and self.Reader.PeekCharacter() == "{":
+                Document[Key] = self.ReadObjectData()
+            else:
+                Document[Key] = self.Reader.ReadValue()
+        return self.Decoder.ReconstructObjects(Document)
+
+    def ReadObjectData(self):
+        ObjectData = {}
+        for Key in self.Reader.ReadObjectKeys():
+            if Key == "RootPage" and self.Reader.PeekCharacter() == "{":
+                ObjectData[Key] = self.ReadPage(ObjectData)
+            elif Key == "Images" and self.Reader.PeekCharacter() == "{":
+                ObjectData[Key] = self.ReadImages()
+            else:
+                ObjectData[Key] = self.Reader.ReadValue()
+        return ObjectData
+
+    def ReadPage(self, ObjectData=None):
+        Page = LazyDict() if self.LazyMode else {}
+        for Key in self.Reader.ReadObjectKeys():
+            if Key == "SubPages" and self.Reader.PeekCharacter() == "[":
+                if ObjectData is not None:
+                    self.EmitPartialData(ObjectData, Page)
+                SubPages = []
+                for SubPageIndex in self.Reader.ReadArrayItems():
+                    SubPages.append(self.ReadPage() if self.LazyMode and self.Reader.PeekCharacter() == "{" else self.Reader.ReadValue())
+                    if ObjectData is not None:
+                        self.ReportProgress()
+                Page[Key] = SubPages
+            elif Key == "Content" and self.LazyMode and self.Reader.PeekCharacter() == "\"":
+                Page[Key] = self.Reader.ReadMappedString()
+            else:
+                Page[Key] = self.Reader.ReadValue()
+        return Page
+
+    def EmitPartialData(self, ObjectData, RootPage):
+        PartialData = ObjectData.copy()
+        PartialData["RootPage"] = RootPage.copy()
+        PartialData["RootPage"]["SubPages"] = []
+        self.PartialDataLoaded.emit(PartialData)
+
+    def ReadImages(self):
+        Images = LazyDict() if self.LazyMode else {}
+        for Key in self.Reader.ReadObjectKeys():
+            Images[Key] = self.Reader.ReadMappedString() if self.LazyMode and self.Reader.PeekCharacter() == "\"" else self.Reader.ReadValue()
+            self.ReportProgress()
+        return Images
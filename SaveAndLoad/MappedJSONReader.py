@@ -0,0 +1,115 @@
+import mmap
+import re
+
+from Core.LazyContent import MappedString
+
+
+class MappedJSONReader:
+    def __init__(self, OpenFileName, Decoder):
+        # Store Parameters
+        self.OpenFileName = OpenFileName
+        self.Decoder = Decoder
+
+        # Variables
+        with open(self.OpenFileName, "rb") as MappedFile:
+            self.Buffer = mmap.mmap(MappedFile.fileno(), 0, access=mmap.ACCESS_READ)
+        self.Position = 0
+        self.WhitespacePattern = re.compile(rb"[ \t\n\r]*")
+        self.StructurePattern = re.compile(rb"[\"{}\[\]]")
+        self.ScalarPattern = re.compile(rb"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null")
+
+    # Span Methods
+    def SkipWhitespace(self):
+        self.Position = self.WhitespacePattern.match(self.Buffer, self.Position).end()
+
+    def FindStringEnd(self, Start):
+        QuoteIndex = Start
+        while True:
+            QuoteIndex = self.Buffer.find(b"\"", QuoteIndex + 1)
+            if QuoteIndex == -1:
+                raise ValueError("Unterminated string starting at byte " + str(Start) + ".")
+            BackslashIndex = QuoteIndex
+            while self.Buffer[BackslashIndex - 1] == 92:
+                BackslashIndex -= 1
+            if (QuoteIndex - BackslashIndex) % 2 == 0:
+                return QuoteIndex + 1
+
+    def FindValueEnd(self, Start):
+        Character = self.Buffer[Start:Start + 1]
+        if Character == b"\"":
+            return self.FindStringEnd(Start)
+        if Character not in (b"{", b"["):
+            ScalarMatch = self.ScalarPattern.match(self.Buffer, Start)
+            if ScalarMatch is None:
+                raise ValueError("Expected a value at byte " + str(Start) + ".")
+            return ScalarMatch.end()
+        Depth = 0
+        Position = Start
+        while True:
+            StructureMatch = self.StructurePattern.search(self.Buffer, Position)
+            if StructureMatch is None:
+                raise ValueError("Unterminated container starting at byte " + str(Start) + ".")
+            Character = StructureMatch.group()
+            if Character == b"\"":
+                Position = self.FindStringEnd(StructureMatch.start())
+                continue
+            Position = StructureMatch.end()
+            Depth += 1 if Character in (b"{", b"[") else -1
+            if Depth == 0:
+                return Position
+
+    # Token Methods
+    def PeekCharacter(self):
+        self.SkipWhitespace()
+        return self.Buffer[self.Position:self.Position + 1].decode("ascii", errors="replace")
+
+    def ReadCharacter(self, ExpectedCharacters):
+        Character = self.PeekCharacter()
+        if Character == "" or Character not in ExpectedCharacters:
+            raise ValueError("Expected one of " + repr(ExpectedCharacters) + " but found " + repr(Character) + ".")
+        self.Position += 1
+        return Character
+
+    def ReadValue(self):
+        self.SkipWhitespace()
+        End = self.FindValueEnd(self.Position)
+        Value = self.Decoder.decode(self.Buffer[self.Position:End].decode("utf-8"))
+        self.Position = End
+        return Value
+
+    def ReadMappedString(self):
+        self.SkipWhitespace()
+        End = self.FindStringEnd(self.Position)
+        Value = MappedString(self.Buffer, self.Position, End)
+        self.Position = End
+        return Value
+
+    def ReadObjectKeys(self):
+        self.ReadCharacter("{")
+        if self.PeekCharacter() == "}":
+            self.Position += 1
+            return
+        while True:
+            Key = self.ReadValue()
+            if type(Key) != str:
+                raise ValueError("Expected an object key but found " + repr(Key) + ".")
+            self.ReadCharacter(":")
+            yield Key
+            if self.ReadCharacter(",}") == "}":
+                return
+
+    def ReadArrayItems(self):
+        self.ReadCharacter("[")
+        if self.PeekCharacter() == "]":
+            self.Position += 1
+            return
+        Index = 0
+        while True:
+            yield Index
+            if self.ReadCharacter(",]") == "]":
+                return
+            Index += 1
+
+    def ReadEnd(self):
+        if self.PeekCharacter() != "":
+            raise ValueError("Extra data after the end of the JSON document.")
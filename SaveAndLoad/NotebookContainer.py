@@ -0,0 +1,153 @@
+import json
+import struct
+
+from Core.ImageStore import ImageStore
+from Core.LazyContent import LazyDict, LazyValue, PeekPageContent
+from SaveAndLoad import Compression
+
+
+ContainerMagic = b"SNTBKBIN"
+ContainerVersion = 1
+TrailerFormat = "<QQ"
+
+
+class CompressedBlock(LazyValue):
+    def __init__(self, Buffer, Start, End, CodecName, Text=False):
+        # Store Parameters
+        self.Buffer = Buffer
+        self.Start = Start
+        self.End = End
+        self.CodecName = CodecName
+        self.Text = Text
+
+        # Variables
+        self.ParallelLoad = CodecName is not None
+
+    def Load(self):
+        Data = self.GetStoredData()
+        if self.CodecName is not None:
+            Data = Compression.Codecs[self.CodecName].Decompress(Data)
+        return Data.decode("utf-8") if self.Text else Data
+
+    def Detach(self):
+        StoredData = self.GetStoredData()
+        return CompressedBlock(StoredData, 0, len(StoredData), self.CodecName, Text=self.Text)
+
+    def GetStoredData(self):
+        return bytes(self.Buffer[self.Start:self.End])
+
+
+class BlockWriter:
+    def __init__(self, ContainerFile, CodecName, Level, Parallel):
+        # Store Parameters
+        self.ContainerFile = ContainerFile
+        self.CodecName = CodecName
+        self.Level = Level
+        self.Parallel = Parallel
+
+        # Variables
+        self.PendingBlocks = []
+        self.PendingSize = 0
+
+    def AddBlock(self, Spans, Key, StoredValue, GetData):
+        # Blocks still compressed the same way in the file they came from are copied as they are
+        if isinstance(StoredValue, CompressedBlock) and StoredValue.CodecName == self.CodecName:
+            self.PendingBlocks.append((Spans, Key, StoredValue.GetStoredData(), True))
+        else:
+            Data = GetData()
+            self.PendingBlocks.append((Spans, Key, Data, self.CodecName is None))
+            self.PendingSize += len(Data)
+        if self.PendingSize >= Compression.BlockSize:
+            self.Flush()
+
+    def Flush(self):
+        UncompressedBlocks = [Data for Spans, Key, Data, Compressed in self.PendingBlocks if not Compressed]
+        CompressedBlocks = iter(Compression.CompressBlocks(UncompressedBlocks, self.CodecName, Level=self.Level, Parallel=self.Parallel) if len(UncompressedBlocks) > 0 else [])
+        for Spans, Key, Data, Compressed in self.PendingBlocks:
+            Spans[Key] = WriteSection(self.ContainerFile, Data if Compressed else next(CompressedBlocks))
+        self.PendingBlocks.clear()
+        self.PendingSize = 0
+
+
+def StartsWithContainerMagic(Data):
+    return Data[:len(ContainerMagic)] == ContainerMagic
+
+
+def WriteSection(ContainerFile, Data):
+    Offset = ContainerFile.tell()
+    ContainerFile.write(Data)
+    return [Offset, len(Data)]
+
+
+def WriteContainer(ContainerFile, Notebook, JSONSerializer, CodecName=None, Level=None, Parallel=False):
+    # Layout:  magic, page tree JSON, one block per page's content, one block per distinct image, index JSON, then the index span and the magic again
+    ContainerFile.write(ContainerMagic)
+    Index = {"Version": ContainerVersion, "Codec": CodecName, "Pages": {}, "Images": {}, "Payloads": {}}
+    Writer = BlockWriter(ContainerFile, CodecName, Level, Parallel)
+    State = Notebook.GetState()
+    State["RootPage"] = GetPageTree(State["RootPage"])
+    State["Images"] = {}
+    Document = {"ObjectData": State, "ObjectType": Notebook.__class__.__name__}
+    Writer.AddBlock(Index, "Tree", None, lambda: JSONSerializer.SerializeDataToJSONString(Document, Compact=True).encode("utf-8"))
+    for Page in GetPagesInOrder(Notebook.RootPage):
+        Writer.AddBlock(Index["Pages"], str(Page["PageID"]), dict.get(Page, "Content"), lambda: PeekPageContent(Page).encode("utf-8"))
+    for FileName in Notebook.GetImageNames():
+        ImageKey = Notebook.Images.GetImageKey(FileName)
+        Index["Images"][FileName] = ImageKey
+        if ImageKey not in Index["Payloads"]:
+            Index["Payloads"][ImageKey] = None
+            Writer.AddBlock(Index["Payloads"], ImageKey, Notebook.Images.GetStoredPayload(FileName), lambda: Notebook.Images.PeekImage(FileName))
+    Writer.Flush()
+    IndexOffset, IndexLength = WriteSection(ContainerFile, json.dumps(Index).encode("utf-8"))
+    ContainerFile.write(struct.pack(TrailerFormat, IndexOffset, IndexLength) + ContainerMagic)
+
+
+def GetPageTree(Page):
+    # Content is written to its own block, so the tree keeps a placeholder to preserve key order; index paths are recomputed on load
+    PageTree = {}
+    for Key in Page:
+        if Key == "IndexPath":
+            continue
+        elif Key == "Content":
+            PageTree[Key] = None
+        elif Key == "SubPages":
+            PageTree[Key] = [GetPageTree(SubPage) for SubPage in Page["SubPages"]]
+        else:
+            PageTree[Key] = Page[Key]
+    return PageTree
+
+
+def GetPagesInOrder(Page):
+    yield Page
+    for SubPage in Page["SubPages"]:
+        yield from GetPagesInOrder(SubPage)
+
+
+def ReadContainer(Buffer, Decoder):
+    TrailerSize = struct.calcsize(TrailerFormat) + len(ContainerMagic)
+    if not StartsWithContainerMagic(Buffer) or len(Buffer) < len(ContainerMagic) + TrailerSize or Buffer[-len(ContainerMagic):] != ContainerMagic:
+        raise ValueError("The binary notebook is incomplete or damaged.")
+    IndexOffset, IndexLength = struct.unpack_from(TrailerFormat, Buffer, len(Buffer) - TrailerSize)
+    Index = json.loads(Buffer[IndexOffset:IndexOffset + IndexLength].decode("utf-8"))
+    if Index["Version"] != ContainerVersion:
+        raise ValueError("The binary notebook was saved by an unsupported version.")
+    CodecName = Index.get("Codec")
+    if CodecName is not None and CodecName not in Compression.Codecs:
+        raise ValueError("The binary notebook uses an unknown compression format.")
+    Document = json.loads(GetBlock(Buffer, Index["Tree"], CodecName, Text=True).Load())
+    Document["ObjectData"]["RootPage"] = CreateLazyPage(Document["ObjectData"]["RootPage"], Buffer, Index["Pages"], CodecName)
+    Payloads = {ImageKey: GetBlock(Buffer, Span, CodecName) for ImageKey, Span in Index["Payloads"].items()}
+    Document["ObjectData"]["Images"] = ImageStore.CreateFromPayloads(Index["Images"], Payloads)
+    return Decoder.ReconstructObjects(Document)
+
+
+def GetBlock(Buffer, Span, CodecName, Text=False):
+    Offset, Length = Span
+    return CompressedBlock(Buffer, Offset, Offset + Length, CodecName, Text=Text)
+
+
+def CreateLazyPage(PageTree, Buffer, PageSpans, CodecName):
+    Page = LazyDict(PageTree)
+    Page["Content"] = GetBlock(Buffer, PageSpans[str(Page["PageID"])], CodecName, Text=True)
+    Page["SubPages"] = [CreateLazyPage(SubPageTree, Buffer, PageSpans, CodecName) for SubPageTree in Page["SubPages"]]
+    return Page
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import sqlite3
+import threading
+
+from Core import Base64Converters
+from Core.ImageStore import ImageStore
+from Core.LazyContent import DeferredValue, LazyDict, PeekPageContent
+
+
+class NotebookDatabase:
+    ApplicationID = 0x534E4442
+    SchemaVersion = 1
+    MinimumSQLiteVersion = (3, 34, 0)
+    Supported = None
+
+    def __init__(self, FileName):
+        # Store Parameters
+        self.FileName = FileName
+
+        # Variables
+        self.Connection = sqlite3.connect(self.FileName, check_same_thread=False)
+        self.Lock = threading.RLock()
+
+    def Close(self):
+        with self.Lock:
+            self.Connection.close()
+
+    @classmethod
+    def IsSupported(cls):
+        # The trigram tokenizer needs SQLite 3.34 and an FTS5 build
+        if cls.Supported is None:
+            cls.Supported = sqlite3.sqlite_version_info >= cls.MinimumSQLiteVersion
+            if cls.Supported:
+                Connection = sqlite3.connect(":memory:")
+                try:
+                    Connection.execute("CREATE VIRTUAL TABLE PageSearch USING fts5(Title, content='', tokenize='trigram case_sensitive 1')")
+                except sqlite3.Error:
+                    cls.Supported = False
+                finally:
+                    Connection.close()
+        return cls.Supported
+
+    @classmethod
+    def GetUnsupportedMessage(cls):
+        return "Notebook databases need SQLite " + ".".join(str(Part) for Part in cls.MinimumSQLiteVersion) + " or newer with FTS5, but this system has SQLite " + sqlite3.sqlite_version + "."
+
+    # Schema Methods
+    def CreateSchema(self):
+        with self.Lock:
+            self.Connection.executescript("""
+                PRAGMA application_id = """ + str(self.ApplicationID) + """;
+                PRAGMA user_version = """ + str(self.SchemaVersion) + """;
+                CREATE TABLE Settings (Name TEXT PRIMARY KEY, Value TEXT NOT NULL);
+                CREATE TABLE Pages (PageID INTEGER PRIMARY KEY, ParentID INTEGER, SortOrder INTEGER NOT NULL, Title TEXT NOT NULL, Content TEXT NOT NULL);
+                CREATE INDEX PagesByParent ON Pages (ParentID, SortOrder);
+                CREATE TABLE Images (FileName TEXT PRIMARY KEY, ImageKey TEXT NOT NULL);
+                CREATE TABLE ImagePayloads (ImageKey TEXT PRIMARY KEY, Data BLOB NOT NULL);
+                CREATE TABLE PageTemplates (TemplateName TEXT PRIMARY KEY, Content TEXT NOT NULL);
+                CREATE VIRTUAL TABLE PageSearch USING fts5(Title, Content, content='', tokenize='trigram case_sensitive 1');
+            """)
+
+    def CheckSchema(self):
+        with self.Lock:
+            ApplicationID = self.Connection.execute("PRAGMA application_id").fetchone()[0]
+            SchemaVersion = self.Connection.execute("PRAGMA user_version").fetchone()[0]
+        if ApplicationID != self.ApplicationID:
+            raise ValueError(self.FileName + " is not a notebook database.")
+        if SchemaVersion > self.SchemaVersion:
+            raise ValueError(self.FileName + " was saved by a newer version.")
+
+    # Write Methods
+    def WriteNotebook(self, Notebook):
+        with self.Lock:
+            self.CreateSchema()
+            with self.Connection:
+                self.WriteSettings(Notebook)
+                PagesToInsert = [(Notebook.RootPage, None, 0)]
+                while len(PagesToInsert) > 0:
+                    Page, ParentID, SortOrder = PagesToInsert.pop()
+                    self.InsertPage(Page, ParentID, SortOrder)
+                    PagesToInsert.extend((SubPage, Page["PageID"], SubPageIndex) for SubPageIndex, SubPage in enumerate(Page["SubPages"]))
+                for FileName in Notebook.GetImageNames():
+                    ImageKey = Notebook.Images.GetImageKey(FileName)
+                    if not self.HasImagePayload(ImageKey):
+                        self.WriteImagePayload(ImageKey, Notebook.Images.PeekImage(FileName))
+                    self.WriteImageKey(FileName, ImageKey)
+                for TemplateName in Notebook.GetTemplateNames():
+                    self.WriteTemplate(TemplateName, Notebook.GetTemplate(TemplateName))
+
+    def ApplyChanges(self, Notebook, Records):
+        with self.Lock, self.Connection:
+            RefreshedPageIDs = set()
+            for Record in Records:
+                Operation = Record["Operation"]
+                if Operation in ("SetPageContent", "RenamePage"):
+                    RefreshedPageIDs.add(Record["PageID"])
+                elif Operation == "SetImage":
+                    Data = Base64Converters.GetBinaryFromBase64String(Record["Base64String"])
+                    ImageKey = hashlib.sha256(Data).hexdigest()
+                    if not self.HasImagePayload(ImageKey):
+                        self.WriteImagePayload(ImageKey, Data)
+                    self.WriteImageKey(Record["FileName"], ImageKey)
+                elif Operation == "RenameImage":
+                    self.Connection.execute("DELETE FROM Images WHERE FileName = ?", (Record["NewFileName"],))
+                    self.Connection.execute("UPDATE Images SET FileName = ? WHERE FileName = ?", (Record["NewFileName"], Record["FileName"]))
+                elif Operation == "DeleteImage":
+                    self.Connection.execute("DELETE FROM Images WHERE FileName = ?", (Record["FileName"],))
+                elif Operation == "AddTemplate":
+                    self.WriteTemplate(Record["TemplateName"], Record["TemplateContent"])
+                elif Operation == "RenameTemplate":
+                    self.Connection.execute("DELETE FROM PageTemplates WHERE TemplateName = ?", (Record["NewTemplateName"],))
+                    self.Connection.execute("UPDATE PageTemplates SET TemplateName = ? WHERE TemplateName = ?", (Record["NewTemplateName"], Record["TemplateName"]))
+                elif Operation == "DeleteTemplate":
+                    self.Connection.execute("DELETE FROM PageTemplates WHERE TemplateName = ?", (Record["TemplateName"],))
+            self.Connection.execute("DELETE FROM ImagePayloads WHERE ImageKey NOT IN (SELECT ImageKey FROM Images)")
+            self.WriteSettings(Notebook)
+            self.SyncPages(Notebook, RefreshedPageIDs)
+
+    def SyncPages(self, Notebook, RefreshedPageIDs):
+        StoredPages = {PageID: (ParentID, SortOrder) for PageID, ParentID, SortOrder in self.Connection.execute("SELECT PageID, ParentID, SortOrder FROM Pages")}
+        CurrentPageIDs = set()
+        PagesToSync = [(Notebook.RootPage, None, 0)]
+        while len(PagesToSync) > 0:
+            Page, ParentID, SortOrder = PagesToSync.pop()
+            PageID = Page["PageID"]
+            CurrentPageIDs.add(PageID)
+            if PageID not in StoredPages:
+                self.InsertPage(Page, ParentID, SortOrder)
+            else:
+                if StoredPages[PageID] != (ParentID, SortOrder):
+                    self.Connection.execute("UPDATE Pages SET ParentID = ?, SortOrder = ? WHERE PageID = ?", (ParentID, SortOrder, PageID))
+                if PageID in RefreshedPageIDs:
+                    self.UpdatePage(Page)
+            PagesToSync.extend((SubPage, PageID, SubPageIndex) for SubPageIndex, SubPage in enumerate(Page["SubPages"]))
+        for PageID in StoredPages.keys() - CurrentPageIDs:
+            self.DeletePage(PageID)
+
+    def InsertPage(self, Page, ParentID, SortOrder):
+        Content = PeekPageContent(Page)
+        self.Connection.execute("INSERT INTO Pages (PageID, ParentID, SortOrder, Title, Content) VALUES (?, ?, ?, ?, ?)", (Page["PageID"], ParentID, SortOrder, Page["Title"], Content))
+        self.AddSearchRow(Page["PageID"], Page["Title"], Content)
+
+    def UpdatePage(self, Page):
+        Content = PeekPageContent(Page)
+        self.RemoveSearchRow(Page["PageID"])
+        self.Connection.execute("UPDATE Pages SET Title = ?, Content = ? WHERE PageID = ?", (Page["Title"], Content, Page["PageID"]))
+        self.AddSearchRow(Page["PageID"], Page["Title"], Content)
+
+    def DeletePage(self, PageID):
+        self.RemoveSearchRow(PageID)
+        self.Connection.execute("DELETE FROM Pages WHERE PageID = ?", (PageID,))
+
+    def AddSearchRow(self, PageID, Title, Content):
+        self.Connection.execute("INSERT INTO PageSearch (rowid, Title, Content) VALUES (?, ?, ?)", (PageID, Title.casefold(), Content.casefold()))
+
+    def RemoveSearchRow(self, PageID):
+        # Contentless FTS5 tables can only delete a row given the exact values it was indexed with
+        Title, Content = self.Connection.execute("SELECT Title, Content FROM Pages WHERE PageID = ?", (PageID,)).fetchone()
+        self.Connection.execute("INSERT INTO PageSearch (PageSearch, rowid, Title, Content) VALUES ('delete', ?, ?, ?)", (PageID, Title.casefold(), Content.casefold()))
+
+    def WriteSettings(self, Notebook):
+        Settings = {}
+        Settings["ObjectType"] = Notebook.__class__.__name__
+        Settings["Header"] = Notebook.Header
+        Settings["Footer"] = Notebook.Footer
+        Settings["NextPageID"] = Notebook.NextPageID
+        self.Connection.executemany("INSERT OR REPLACE INTO Settings (Name, Value) VALUES (?, ?)", ((Name, json.dumps(Value)) for Name, Value in Settings.items()))
+
+    def HasImagePayload(self, ImageKey):
+        return self.Connection.execute("SELECT 1 FROM ImagePayloads WHERE ImageKey = ?", (ImageKey,)).fetchone() is not None
+
+    def WriteImagePayload(self, ImageKey, Data):
+        self.Connection.execute("INSERT INTO ImagePayloads (ImageKey, Data) VALUES (?, ?)", (ImageKey, Data))
+
+    def WriteImageKey(self, FileName, ImageKey):
+        self.Connection.execute("INSERT OR REPLACE INTO Images (FileName, ImageKey) VALUES (?, ?)", (FileName, ImageKey))
+
+    def WriteTemplate(self, TemplateName, TemplateContent):
+        self.Connection.execute("INSERT OR REPLACE INTO PageTemplates (TemplateName, Content) VALUES (?, ?)", (TemplateName, TemplateContent))
+
+    # Read Methods
+    def ReadNotebookState(self):
+        with self.Lock:
+            self.CheckSchema()
+            Settings = {Name: json.loads(Value) for Name, Value in self.Connection.execute("SELECT Name, Value FROM Settings")}
+            PagesByParentID = {}
+            for PageID, ParentID, Title in self.Connection.execute("SELECT PageID, ParentID, Title FROM Pages ORDER BY ParentID, SortOrder"):
+                Page = LazyDict()
+                Page["Title"] = Title
+                Page["Content"] = DeferredValue(self.LoadPageContent, PageID)
+                Page["PageID"] = PageID
+                Page["IndexPath"] = None
+                Page["SubPages"] = []
+                PagesByParentID.setdefault(ParentID, []).append(Page)
+            ImageKeys = dict(self.Connection.execute("SELECT FileName, ImageKey FROM Images"))
+            Payloads = {ImageKey: DeferredValue(self.LoadImagePayload, ImageKey) for ImageKey, in self.Connection.execute("SELECT ImageKey FROM ImagePayloads")}
+            PageTemplates = dict(self.Connection.execute("SELECT TemplateName, Content FROM PageTemplates"))
+        if len(PagesByParentID.get(None, [])) != 1:
+            raise ValueError(self.FileName + " does not have exactly one root page.")
+        RootPage = PagesByParentID[None][0]
+        RootPage["IndexPath"] = [0]
+        PagesToAssemble = [RootPage]
+        while len(PagesToAssemble) > 0:
+            Page = PagesToAssemble.pop()
+            Page["SubPages"] = PagesByParentID.get(Page["PageID"], [])
+            for SubPageIndex, SubPage in enumerate(Page["SubPages"]):
+                SubPage["IndexPath"] = Page["IndexPath"] + [SubPageIndex]
+            PagesToAssemble.extend(Page["SubPages"])
+        State = {}
+        State["Header"] = Settings["Header"]
+        State["Footer"] = Settings["Footer"]
+        State["RootPage"] = RootPage
+        State["Images"] = ImageStore.CreateFromPayloads(ImageKeys, Payloads)
+        State["PageTemplates"] = PageTemplates
+        State["NextPageID"] = Settings["NextPageID"]
+        return Settings["ObjectType"], State
+
+    def LoadPageContent(self, PageID):
+        with self.Lock:
+            Row = self.Connection.execute("SELECT Content FROM Pages WHERE PageID = ?", (PageID,)).fetchone()
+        if Row is None:
+            raise sqlite3.DatabaseError(self.FileName + " has no content for page " + str(PageID) + ".")
+        return Row[0]
+
+    def LoadImagePayload(self, ImageKey):
+        with self.Lock:
+            Row = self.Connection.execute("SELECT Data FROM ImagePayloads WHERE ImageKey = ?", (ImageKey,)).fetchone()
+        if Row is None:
+            raise sqlite3.DatabaseError(self.FileName + " has no data for image " + ImageKey + ".")
+        return Row[0]
+
+    # Search Methods
+    def FindPageIDs(self, CasefoldedSearchTermString):
+        if len(CasefoldedSearchTermString) < 3:
+            return None
+        Phrase = "\"" + CasefoldedSearchTermString.replace("\"", "\"\"") + "\""
+        with self.Lock:
+            return {PageID for PageID, in self.Connection.execute("SELECT rowid FROM PageSearch WHERE PageSearch MATCH ?", (Phrase,))}
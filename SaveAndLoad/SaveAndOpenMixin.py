@@ -1,10 +1,17 @@
+import copy
 import os
-import gzip
 import json
+import sqlite3
 
+from PyQt5.QtCore import QEventLoop
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
 
+from SaveAndLoad import Compression, Journal
+from SaveAndLoad.AutosaveWorker import AutosaveWorker
 from SaveAndLoad.JSONSerializer import JSONSerializer
+from SaveAndLoad.LoadWorker import LoadWorker
+from SaveAndLoad.NotebookDatabase import NotebookDatabase
+from SaveAndLoad.SaveWorker import SaveWorker
 
 
 class SaveAndOpenMixin:
@@ -13,11 +20,30 @@ class SaveAndOpenMixin:
         self.UnsavedChanges = False
         self.CurrentOpenFileName = ""
         self.LastOpenedDirectory = None
-        self.GzipMode = False
+        self.CompressionCodec = None
+        self.CompressionLevels = {}
+        self.ParallelCompression = False
+        self.JournalMode = False
+        self.LazyLoadMode = False
+        self.CompactMode = False
+        self.MappedFileName = None
+        self.JournalBaseFileName = None
+        self.JournalCompactionThreshold = 8 * 1024 * 1024
+        self.SaveWorkers = []
+        self.RecoveryCheckpoints = {}
+        self.AutosaveInterval = 30000
+        self.AutosaveBaseFileName = None
+        self.AutosaveWorkerInst = None
+        self.RecoveryCompactionThreshold = 8 * 1024 * 1024
+        self.CompactedRecoverySize = 0
+        self.NotebookDatabaseInst = None
 
         # Load from Config
         self.LoadLastOpenedDirectory()
-        self.LoadGzipMode()
+        self.LoadCompressionMode()
+        self.LoadJournalMode()
+        self.LoadLazyLoadMode()
+        self.LoadCompactMode()
 
     def Save(self, ObjectToSave, SaveAs=False, AlternateFileDescription=None, AlternateFileExtension=None, SkipSerialization=False, ExportMode=False):
         from Interface.MainWindow import MainWindow
@@ -25,28 +51,44 @@ class SaveAndOpenMixin:
         ActionString = "Save " if not ExportMode else "Export "
         ActionDoneString = "saved" if not ExportMode else "exported"
         Caption = ActionString + (self.FileDescription if AlternateFileDescription is None else AlternateFileDescription) + " File"
-        ExtensionWithoutGzip = self.FileExtension if AlternateFileExtension is None else AlternateFileExtension
-        GzipExtension = ".gz"
-        Extension = ExtensionWithoutGzip + ("" if not self.GzipMode else GzipExtension)
+        ExtensionWithoutCompression = self.FileExtension if AlternateFileExtension is None else AlternateFileExtension
+        Extension = self.GetCompressedExtension(ExtensionWithoutCompression)
         Filter = (self.FileDescription if AlternateFileDescription is None else AlternateFileDescription) + " files (*" + Extension + ")"
-        ModeAndExtensionMatch = (self.CurrentOpenFileName.endswith(".ntbk") and not self.GzipMode) or (self.CurrentOpenFileName.endswith(".ntbk.gz") and self.GzipMode)
-        SaveFileName = self.CurrentOpenFileName if self.CurrentOpenFileName != "" and not SaveAs and ModeAndExtensionMatch else QFileDialog.getSaveFileName(caption=Caption, filter=Filter, directory=self.LastOpenedDirectory)[0]
+        FormatFilters = self.GetFormatFilters() if AlternateFileExtension is None else {}
+        for FormatFilter in FormatFilters:
+            Filter += ";;" + FormatFilter
+        ModeAndExtensionMatch = self.CurrentOpenFileName.endswith(self.GetCompressedExtension(self.FileExtension)) or self.GetFormatExtension(self.CurrentOpenFileName) is not None
+        SaveFileName, SelectedFilter = (self.CurrentOpenFileName, None) if self.CurrentOpenFileName != "" and not SaveAs and ModeAndExtensionMatch else QFileDialog.getSaveFileName(caption=Caption, filter=Filter, directory=self.LastOpenedDirectory)
         if SaveFileName != "":
-            if not SaveFileName.endswith(Extension):
-                if SaveFileName.endswith(ExtensionWithoutGzip):
-                    SaveFileName += GzipExtension
+            if not ExportMode and self.IsDatabaseFileName(SaveFileName) and not NotebookDatabase.IsSupported():
+                self.FlashStatusBar("No file " + ActionDoneString + ".")
+                self.DisplayMessageBox("Could not save " + os.path.basename(SaveFileName) + ":\n\n" + NotebookDatabase.GetUnsupportedMessage(), Icon=QMessageBox.Warning)
+                return False
+            FormatExtension = (self.GetFormatExtension(SaveFileName) or FormatFilters.get(SelectedFilter)) if len(FormatFilters) > 0 else None
+            if FormatExtension is not None:
+                if not SaveFileName.endswith(FormatExtension):
+                    SaveFileName += FormatExtension
+            elif not SaveFileName.endswith(Extension):
+                if SaveFileName.endswith(ExtensionWithoutCompression):
+                    SaveFileName += Extension[len(ExtensionWithoutCompression):]
                 else:
                     SaveFileName += Extension
-            SaveString = self.JSONSerializer.SerializeDataToJSONString(ObjectToSave) if not SkipSerialization else ObjectToSave
-            if self.GzipMode:
-                with gzip.open(SaveFileName, "wt") as SaveFile:
-                    SaveFile.write(SaveString)
+            self.WaitForSave()
+            if not ExportMode:
+                self.CheckpointRecovery(ObjectToSave)
+            if not ExportMode and self.IsDatabaseFileName(SaveFileName) and SaveFileName == self.JournalBaseFileName and hasattr(ObjectToSave, "TakeJournalRecords"):
+                if not self.UpdateDatabase(ObjectToSave, SaveFileName):
+                    self.RestoreRecoveryCheckpoint(ObjectToSave)
+                    return False
+                self.RecoveryCheckpointSaved(ObjectToSave, SaveFileName)
+            elif not ExportMode and self.JournalMode and SaveFileName == self.JournalBaseFileName and hasattr(ObjectToSave, "TakeJournalRecords"):
+                if not self.AppendToJournal(ObjectToSave, SaveFileName):
+                    self.RestoreRecoveryCheckpoint(ObjectToSave)
+                    return False
+                self.RecoveryCheckpointSaved(ObjectToSave, SaveFileName)
             else:
-                with open(SaveFileName, "w") as SaveFile:
-                    SaveFile.write(SaveString)
-            SaveFileNameShort = os.path.basename(SaveFileName)
+                self.StartSaveWorker(ObjectToSave, SaveFileName, SkipSerialization=SkipSerialization, ExportMode=ExportMode, RecoveryCheckpoint=not ExportMode)
             self.LastOpenedDirectory = os.path.dirname(SaveFileName)
-            self.FlashStatusBar("File " + ActionDoneString + " as:  " + SaveFileNameShort)
             if not ExportMode:
                 self.CurrentOpenFileName = SaveFileName
                 self.UnsavedChanges = False
@@ -55,7 +97,186 @@ class SaveAndOpenMixin:
             self.FlashStatusBar("No file " + ActionDoneString + ".")
             return False
 
-    def Open(self, ObjectToSave, FilePath=None, RespectUnsavedChanges=True, AlternateFileDescription=None, AlternateFileExtension=None, ImportMode=False):
+    def StartSaveWorker(self, ObjectToSave, SaveFileName, SkipSerialization=False, ExportMode=False, RecoveryCheckpoint=False):
+        if not ExportMode and SaveFileName == self.MappedFileName and hasattr(ObjectToSave, "DetachContent"):
+            ObjectToSave.DetachContent()
+            self.MappedFileName = None
+            if self.NotebookDatabaseInst is not None and self.NotebookDatabaseInst.FileName == SaveFileName:
+                self.CloseNotebookDatabase()
+                ObjectToSave.SetSearchDatabase(None)
+        ObsoleteJournalPath = None
+        if not ExportMode and hasattr(ObjectToSave, "StartNewJournal"):
+            ObjectToSave.StartNewJournal()
+            ObsoleteJournalPath = Journal.GetJournalPath(SaveFileName)
+            self.JournalBaseFileName = SaveFileName
+        ObjectSnapshot = ObjectToSave.GetSnapshot() if hasattr(ObjectToSave, "GetSnapshot") else copy.deepcopy(ObjectToSave)
+        SaveWorkerInst = SaveWorker(ObjectSnapshot, SaveFileName, self.JSONSerializer, CompressionCodec=self.CompressionCodec, CompressionLevel=self.GetCompressionLevel(), ParallelCompression=self.ParallelCompression, CompactMode=self.CompactMode, SkipSerialization=SkipSerialization, ExportMode=ExportMode, ObsoleteJournalPath=ObsoleteJournalPath, DatabaseMode=self.IsDatabaseFileName(SaveFileName) and not ExportMode, BinaryMode=self.IsBinaryFileName(SaveFileName) and not ExportMode)
+        SaveWorkerInst.Progress.connect(lambda Status: self.FlashStatusBar(Status, Duration=10000))
+        SaveWorkerInst.Completed.connect(lambda: self.SaveCompleted(SaveWorkerInst))
+        self.SaveWorkers.append(SaveWorkerInst)
+        if RecoveryCheckpoint:
+            self.RecoveryCheckpoints[SaveWorkerInst] = ObjectToSave
+        SaveWorkerInst.start()
+
+    def AppendToJournal(self, ObjectToSave, SaveFileName):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        JournalPath = Journal.GetJournalPath(SaveFileName)
+        JournalRecords = ObjectToSave.TakeJournalRecords()
+        SaveFileNameShort = os.path.basename(SaveFileName)
+        try:
+            JournalSize = Journal.AppendJournalRecords(JournalPath, Journal.GetJournalHeader(ObjectToSave.JournalID), JournalRecords) if len(JournalRecords) > 0 else 0
+        except OSError as Error:
+            self.JournalBaseFileName = None
+            self.FlashStatusBar("No file saved.")
+            self.DisplayMessageBox("Could not save " + SaveFileNameShort + ":\n\n" + str(Error), Icon=QMessageBox.Warning)
+            return False
+        self.FlashStatusBar("File saved as:  " + SaveFileNameShort)
+        if JournalSize > self.JournalCompactionThreshold:
+            self.StartSaveWorker(ObjectToSave, SaveFileName)
+        return True
+
+    def UpdateDatabase(self, ObjectToSave, SaveFileName):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        SaveFileNameShort = os.path.basename(SaveFileName)
+        try:
+            if self.NotebookDatabaseInst is not None and self.NotebookDatabaseInst.FileName == SaveFileName:
+                self.NotebookDatabaseInst.ApplyChanges(ObjectToSave, ObjectToSave.TakeJournalRecords())
+                ObjectToSave.SearchDatabaseSynced()
+            else:
+                DatabaseInst = NotebookDatabase(SaveFileName)
+                try:
+                    DatabaseInst.ApplyChanges(ObjectToSave, ObjectToSave.TakeJournalRecords())
+                finally:
+                    DatabaseInst.Close()
+        except sqlite3.Error as Error:
+            self.JournalBaseFileName = None
+            self.FlashStatusBar("No file saved.")
+            self.DisplayMessageBox("Could not save " + SaveFileNameShort + ":\n\n" + str(Error), Icon=QMessageBox.Warning)
+            return False
+        self.FlashStatusBar("File saved as:  " + SaveFileNameShort)
+        return True
+
+    def SaveCompleted(self, SaveWorkerInst):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        if SaveWorkerInst not in self.SaveWorkers:
+            return
+        SaveWorkerInst.wait()
+        SaveWorkerInst.Progress.disconnect()
+        SaveWorkerInst.Completed.disconnect()
+        self.SaveWorkers.remove(SaveWorkerInst)
+        CheckpointedObject = self.RecoveryCheckpoints.pop(SaveWorkerInst, None)
+        ActionString = "save" if not SaveWorkerInst.ExportMode else "export"
+        ActionDoneString = "saved" if not SaveWorkerInst.ExportMode else "exported"
+        SaveFileNameShort = os.path.basename(SaveWorkerInst.SaveFileName)
+        if SaveWorkerInst.Succeeded:
+            self.FlashStatusBar("File " + ActionDoneString + " as:  " + SaveFileNameShort)
+            if CheckpointedObject is not None:
+                self.RecoveryCheckpointSaved(CheckpointedObject, SaveWorkerInst.SaveFileName)
+        else:
+            if CheckpointedObject is not None:
+                self.RestoreRecoveryCheckpoint(CheckpointedObject)
+            self.FlashStatusBar("No file " + ActionDoneString + ".")
+            if not SaveWorkerInst.ExportMode and SaveWorkerInst.SaveFileName == self.CurrentOpenFileName:
+                self.UnsavedChanges = True
+                self.UpdateWindowTitle()
+            if SaveWorkerInst.SaveFileName == self.JournalBaseFileName:
+                self.JournalBaseFileName = None
+            self.DisplayMessageBox("Could not " + ActionString + " " + SaveFileNameShort + ":\n\n" + SaveWorkerInst.ErrorString, Icon=QMessageBox.Warning)
+
+    def WaitForSave(self):
+        Succeeded = True
+        for SaveWorkerInst in self.SaveWorkers.copy():
+            SaveWorkerInst.wait()
+            Succeeded = Succeeded and SaveWorkerInst.Succeeded
+            self.SaveCompleted(SaveWorkerInst)
+        return Succeeded
+
+    def Autosave(self, ObjectToSave):
+        if self.AutosaveBaseFileName is None or len(self.SaveWorkers) > 0 or self.AutosaveWorkerInst is not None or not ObjectToSave.HasAutosaveChanges():
+            return
+        try:
+            RecoveryHeader = Journal.GetRecoveryHeader(self.AutosaveBaseFileName)
+        except OSError:
+            return
+        # A recovery file that is still large after compaction is left to grow before it is rewritten again
+        CompactionThreshold = max(self.RecoveryCompactionThreshold, 2 * self.CompactedRecoverySize)
+        AutosaveWorkerInst = AutosaveWorker(Journal.GetRecoveryPath(self.AutosaveBaseFileName), RecoveryHeader, ObjectToSave.TakeAutosaveRecords(), CompactionThreshold)
+        AutosaveWorkerInst.Completed.connect(lambda: self.AutosaveCompleted(AutosaveWorkerInst))
+        self.AutosaveWorkerInst = AutosaveWorkerInst
+        AutosaveWorkerInst.start()
+
+    def AutosaveCompleted(self, AutosaveWorkerInst):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        if AutosaveWorkerInst is not self.AutosaveWorkerInst:
+            return
+        AutosaveWorkerInst.wait()
+        AutosaveWorkerInst.Completed.disconnect()
+        self.AutosaveWorkerInst = None
+        if AutosaveWorkerInst.Compacted:
+            self.CompactedRecoverySize = AutosaveWorkerInst.RecoverySize
+        if not AutosaveWorkerInst.Succeeded:
+            self.AutosaveBaseFileName = None
+            self.FlashStatusBar("Autosave failed:  " + AutosaveWorkerInst.ErrorString, Duration=10000)
+
+    def WaitForAutosave(self):
+        if self.AutosaveWorkerInst is not None:
+            self.AutosaveWorkerInst.wait()
+            self.AutosaveCompleted(self.AutosaveWorkerInst)
+
+    def CheckpointRecovery(self, ObjectToSave):
+        self.WaitForAutosave()
+        if hasattr(ObjectToSave, "CheckpointAutosaveRecords"):
+            ObjectToSave.CheckpointAutosaveRecords()
+
+    def RestoreRecoveryCheckpoint(self, ObjectToSave):
+        # The file on disk is unchanged, so the recovery file stays valid and picks up the set-aside changes next autosave
+        if hasattr(ObjectToSave, "RestoreAutosaveCheckpoint"):
+            ObjectToSave.RestoreAutosaveCheckpoint()
+
+    def RecoveryCheckpointSaved(self, ObjectToSave, SaveFileName):
+        if hasattr(ObjectToSave, "ClearAutosaveCheckpoint"):
+            ObjectToSave.ClearAutosaveCheckpoint()
+        if self.AutosaveBaseFileName is not None:
+            try:
+                Journal.DeleteJournal(Journal.GetRecoveryPath(self.AutosaveBaseFileName))
+            except OSError:
+                pass
+        self.CompactedRecoverySize = 0
+        self.AutosaveBaseFileName = SaveFileName if hasattr(ObjectToSave, "TakeAutosaveRecords") else None
+
+    def DiscardRecovery(self, ObjectToSave):
+        self.WaitForSave()
+        self.WaitForAutosave()
+        if hasattr(ObjectToSave, "ClearAutosaveRecords"):
+            ObjectToSave.ClearAutosaveRecords()
+        if self.AutosaveBaseFileName is not None:
+            try:
+                Journal.DeleteJournal(Journal.GetRecoveryPath(self.AutosaveBaseFileName))
+            except OSError:
+                pass
+        self.CompactedRecoverySize = 0
+        self.AutosaveBaseFileName = None
+
+    def RecoverChanges(self, Data, OpenFileName):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        RecoveryPath = Journal.GetRecoveryPath(OpenFileName)
+        RecoveryRecords = Journal.ReadJournalRecords(RecoveryPath, Journal.GetRecoveryHeader(OpenFileName))
+        if len(RecoveryRecords) == 0:
+            return False
+        RecoveryPrompt = self.DisplayMessageBox("Unsaved changes to " + os.path.basename(OpenFileName) + " were recovered from an autosave.  Restore them?", Icon=QMessageBox.Question, Buttons=(QMessageBox.Yes | QMessageBox.No))
+        if RecoveryPrompt == QMessageBox.Yes:
+            Data.ApplyJournalRecords(RecoveryRecords)
+            self.JournalBaseFileName = None
+            return True
+        Journal.DeleteJournal(RecoveryPath)
+        return False
+
+    def Open(self, ObjectToSave, FilePath=None, RespectUnsavedChanges=True, AlternateFileDescription=None, AlternateFileExtension=None, ImportMode=False, PartialDataLoaded=None):
         from Interface.MainWindow import MainWindow
         assert isinstance(self, MainWindow)
         ActionString = "Open " if not ImportMode else "Import "
@@ -65,51 +286,144 @@ class SaveAndOpenMixin:
         if self.UnsavedChanges and RespectUnsavedChanges:
             SavePrompt = self.DisplayMessageBox("Save unsaved work before " + ActionInProgressString + "?", Icon=QMessageBox.Warning, Buttons=(QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel))
             if SavePrompt == QMessageBox.Yes:
-                if not self.Save(ObjectToSave):
+                if not self.Save(ObjectToSave) or not self.WaitForSave():
                     return None
             elif SavePrompt == QMessageBox.No:
                 pass
             elif SavePrompt == QMessageBox.Cancel:
                 return None
         Caption = ActionString + (self.FileDescription if AlternateFileDescription is None else AlternateFileDescription) + " File"
-        Filter = (self.FileDescription if AlternateFileDescription is None else AlternateFileDescription) + " files (*" + (self.FileExtension if AlternateFileExtension is None else AlternateFileExtension) + ("" if not self.GzipMode else ".gz") + ")"
+        Filter = (self.FileDescription if AlternateFileDescription is None else AlternateFileDescription) + " files (" + self.GetOpenPatterns(self.FileExtension if AlternateFileExtension is None else AlternateFileExtension) + ")"
+        if AlternateFileExtension is None and not ImportMode:
+            for FormatFilter in self.GetFormatFilters():
+                Filter += ";;" + FormatFilter
         OpenFileName = FilePath if FilePath is not None else QFileDialog.getOpenFileName(caption=Caption, filter=Filter, directory=self.LastOpenedDirectory)[0]
         if OpenFileName != "":
-            if self.GzipMode:
-                with gzip.open(OpenFileName, "rt") as LoadFile:
-                    JSONString = LoadFile.read()
-            else:
-                with open(OpenFileName, "r") as LoadFile:
-                    JSONString = LoadFile.read()
             OpenFileNameShort = os.path.basename(OpenFileName)
-            try:
-                Data = self.JSONSerializer.DeserializeDataFromJSONString(JSONString)
-            except KeyError:
+            DatabaseInst = None
+            if self.IsDatabaseFileName(OpenFileName) and not ImportMode:
+                if not NotebookDatabase.IsSupported():
+                    self.FlashStatusBar("No file " + ActionDoneString + ".")
+                    self.DisplayMessageBox("Could not open " + OpenFileNameShort + ":\n\n" + NotebookDatabase.GetUnsupportedMessage(), Icon=QMessageBox.Warning)
+                    return None
+                DatabaseInst, Data = self.LoadDatabase(OpenFileName)
+                Succeeded = DatabaseInst is not None
+                LazyMode = Succeeded
+            else:
+                LoadWorkerInst = self.Load(OpenFileName, PartialDataLoaded=PartialDataLoaded, LazyMode=self.LazyLoadMode and not ImportMode)
+                Succeeded = LoadWorkerInst.Succeeded
+                Data = LoadWorkerInst.Data
+                LazyMode = LoadWorkerInst.MappedMode
+            if not Succeeded:
+                self.FlashStatusBar("No file " + ActionDoneString + ".")
                 self.DisplayMessageBox("There was an error " + ActionInProgressString + " " + OpenFileNameShort + ".")
                 return None
             self.LastOpenedDirectory = os.path.dirname(OpenFileName)
             self.FlashStatusBar(ActionDoneStringCapitalized + " file:  " + OpenFileNameShort)
             if not ImportMode:
-                self.CurrentOpenFileName = OpenFileName
+                self.DiscardRecovery(ObjectToSave)
+                self.CloseNotebookDatabase()
+                self.NotebookDatabaseInst = DatabaseInst
+                self.MappedFileName = OpenFileName if LazyMode else None
+                self.JournalBaseFileName = OpenFileName if DatabaseInst is not None else None
+                if getattr(Data, "JournalID", None) is not None:
+                    Data.ApplyJournalRecords(Journal.ReadJournalRecords(Journal.GetJournalPath(OpenFileName), Journal.GetJournalHeader(Data.JournalID)))
+                    self.JournalBaseFileName = OpenFileName
                 self.UnsavedChanges = False
+                if hasattr(Data, "TakeAutosaveRecords"):
+                    self.UnsavedChanges = self.RecoverChanges(Data, OpenFileName)
+                    self.AutosaveBaseFileName = OpenFileName
+                self.CurrentOpenFileName = OpenFileName
             return Data
         else:
             self.FlashStatusBar("No file " + ActionDoneString + ".")
             return None
 
+    def Load(self, OpenFileName, PartialDataLoaded=None, LazyMode=False):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        LoadWorkerInst = LoadWorker(OpenFileName, self.JSONSerializer, LazyMode=LazyMode)
+        LoadWorkerInst.Progress.connect(lambda Status: self.FlashStatusBar(Status, Duration=10000))
+        if PartialDataLoaded is not None:
+            LoadWorkerInst.PartialDataLoaded.connect(PartialDataLoaded)
+        LoadLoop = QEventLoop()
+        LoadWorkerInst.finished.connect(LoadLoop.quit)
+        LoadWorkerInst.start()
+        LoadLoop.exec_(QEventLoop.ExcludeUserInputEvents)
+        LoadWorkerInst.wait()
+        return LoadWorkerInst
+
+    def LoadDatabase(self, OpenFileName):
+        if not os.path.isfile(OpenFileName):
+            return None, None
+        DatabaseInst = None
+        try:
+            DatabaseInst = NotebookDatabase(OpenFileName)
+            ObjectType, State = DatabaseInst.ReadNotebookState()
+            Data = self.JSONSerializer.ObjectTypeCalls[ObjectType](State)
+            if hasattr(Data, "SetSearchDatabase"):
+                Data.SetSearchDatabase(DatabaseInst)
+        except (sqlite3.Error, ValueError, KeyError):
+            if DatabaseInst is not None:
+                DatabaseInst.Close()
+            return None, None
+        return DatabaseInst, Data
+
+    def CloseNotebookDatabase(self):
+        if self.NotebookDatabaseInst is not None:
+            self.WaitForSave()
+            self.NotebookDatabaseInst.Close()
+            self.NotebookDatabaseInst = None
+
+    def IsDatabaseFileName(self, FileName):
+        return self.DatabaseExtension is not None and FileName.endswith(self.DatabaseExtension)
+
+    def IsBinaryFileName(self, FileName):
+        return self.BinaryExtension is not None and FileName.endswith(self.BinaryExtension)
+
+    def GetFormatFilters(self):
+        FormatFilters = {}
+        if self.BinaryExtension is not None:
+            FormatFilters[self.FileDescription + " Binary files (*" + self.BinaryExtension + ")"] = self.BinaryExtension
+        if self.DatabaseExtension is not None and NotebookDatabase.IsSupported():
+            FormatFilters[self.FileDescription + " Database files (*" + self.DatabaseExtension + ")"] = self.DatabaseExtension
+        return FormatFilters
+
+    def GetFormatExtension(self, FileName):
+        for FormatExtension in self.GetFormatFilters().values():
+            if FileName.endswith(FormatExtension):
+                return FormatExtension
+        return None
+
+    def GetCompressedExtension(self, Extension):
+        return Extension + (Compression.Codecs[self.CompressionCodec].Extension if self.CompressionCodec is not None else "")
+
+    def GetOpenPatterns(self, Extension):
+        # Compressed files are recognized by their contents, so any of them can be opened in any mode
+        return " ".join("*" + Extension + CompressedExtension for CompressedExtension in [""] + [Codec.Extension for Codec in Compression.Codecs.values()])
+
+    def GetCompressionLevel(self):
+        if self.CompressionCodec is None:
+            return None
+        return Compression.Codecs[self.CompressionCodec].GetLevel(self.CompressionLevels.get(self.CompressionCodec))
+
     def New(self, ObjectToSave, RespectUnsavedChanges=True):
         from Interface.MainWindow import MainWindow
         assert isinstance(self, MainWindow)
         if self.UnsavedChanges and RespectUnsavedChanges:
             SavePrompt = self.DisplayMessageBox("Save unsaved work before starting a new file?", Icon=QMessageBox.Warning, Buttons=(QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel))
             if SavePrompt == QMessageBox.Yes:
-                if not self.Save(ObjectToSave):
+                if not self.Save(ObjectToSave) or not self.WaitForSave():
                     return False
             elif SavePrompt == QMessageBox.No:
                 pass
             elif SavePrompt == QMessageBox.Cancel:
                 return False
+        self.DiscardRecovery(ObjectToSave)
+        self.CloseNotebookDatabase()
         self.CurrentOpenFileName = ""
+        self.MappedFileName = None
+        self.JournalBaseFileName = None
         self.FlashStatusBar("New file opened.")
         self.UnsavedChanges = False
         return True
@@ -120,19 +434,29 @@ class SaveAndOpenMixin:
         if self.UnsavedChanges:
             SavePrompt = self.DisplayMessageBox("There are unsaved changes.  Close anyway?", Icon=QMessageBox.Warning, Buttons=(QMessageBox.Yes | QMessageBox.No))
             if SavePrompt == QMessageBox.Yes:
+                self.DiscardRecovery(None)
                 self.SaveLastOpenedDirectory()
-                self.SaveGzipMode()
+                self.SaveCompressionMode()
+                self.SaveJournalMode()
+                self.SaveLazyLoadMode()
+                self.SaveCompactMode()
                 event.accept()
             elif SavePrompt == QMessageBox.No:
                 event.ignore()
         else:
+            self.DiscardRecovery(None)
             self.SaveLastOpenedDirectory()
-            self.SaveGzipMode()
+            self.SaveCompressionMode()
+            self.SaveJournalMode()
+            self.SaveLazyLoadMode()
+            self.SaveCompactMode()
             event.accept()
 
-    def SetUpSaveAndOpen(self, FileExtension, FileDescription, ObjectClasses):
+    def SetUpSaveAndOpen(self, FileExtension, FileDescription, ObjectClasses, DatabaseExtension=None, BinaryExtension=None):
         self.FileExtension = FileExtension
         self.FileDescription = FileDescription
+        self.DatabaseExtension = DatabaseExtension
+        self.BinaryExtension = BinaryExtension
         self.JSONSerializer = JSONSerializer(ObjectClasses)
 
     def LoadLastOpenedDirectory(self):
@@ -145,13 +469,21 @@ class SaveAndOpenMixin:
                 if os.path.isdir(LastOpenedDirectory):
                     self.LastOpenedDirectory = LastOpenedDirectory
 
-    def LoadGzipMode(self):
+    def LoadCompressionMode(self):
         from Interface.MainWindow import MainWindow
         assert isinstance(self, MainWindow)
+        CompressionModeConfig = self.GetResourcePath("CompressionMode.cfg")
         GzipModeConfig = self.GetResourcePath("GzipMode.cfg")
-        if os.path.isfile(GzipModeConfig):
+        if os.path.isfile(CompressionModeConfig):
+            with open(CompressionModeConfig, "r") as OpenedConfig:
+                CompressionMode = json.loads(OpenedConfig.read())
+            if CompressionMode["Codec"] in Compression.Codecs:
+                self.CompressionCodec = CompressionMode["Codec"]
+            self.CompressionLevels = {CodecName: Level for CodecName, Level in CompressionMode["Levels"].items() if CodecName in Compression.Codecs}
+            self.ParallelCompression = CompressionMode["Parallel"]
+        elif os.path.isfile(GzipModeConfig):
             with open(GzipModeConfig, "r") as OpenedConfig:
-                self.GzipMode = json.loads(OpenedConfig.read())
+                self.CompressionCodec = "Gzip" if json.loads(OpenedConfig.read()) else None
 
     def SaveLastOpenedDirectory(self):
         from Interface.MainWindow import MainWindow
@@ -162,9 +494,54 @@ class SaveAndOpenMixin:
                 with open(FileSavingConfig, "w") as OpenedConfig:
                     OpenedConfig.write(self.LastOpenedDirectory)
 
-    def SaveGzipMode(self):
+    def SaveCompressionMode(self):
         from Interface.MainWindow import MainWindow
         assert isinstance(self, MainWindow)
-        GzipModeConfig = self.GetResourcePath("GzipMode.cfg")
-        with open(GzipModeConfig, "w") as OpenedConfig:
-            OpenedConfig.write(json.dumps(self.GzipMode))
+        CompressionModeConfig = self.GetResourcePath("CompressionMode.cfg")
+        with open(CompressionModeConfig, "w") as OpenedConfig:
+            OpenedConfig.write(json.dumps({"Codec": self.CompressionCodec, "Levels": self.CompressionLevels, "Parallel": self.ParallelCompression}, indent=2))
+
+    def LoadJournalMode(self):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        JournalModeConfig = self.GetResourcePath("JournalMode.cfg")
+        if os.path.isfile(JournalModeConfig):
+            with open(JournalModeConfig, "r") as OpenedConfig:
+                self.JournalMode = json.loads(OpenedConfig.read())
+
+    def SaveJournalMode(self):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        JournalModeConfig = self.GetResourcePath("JournalMode.cfg")
+        with open(JournalModeConfig, "w") as OpenedConfig:
+            OpenedConfig.write(json.dumps(self.JournalMode))
+
+    def LoadLazyLoadMode(self):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        LazyLoadModeConfig = self.GetResourcePath("LazyLoadMode.cfg")
+        if os.path.isfile(LazyLoadModeConfig):
+            with open(LazyLoadModeConfig, "r") as OpenedConfig:
+                self.LazyLoadMode = json.loads(OpenedConfig.read())
+
+    def SaveLazyLoadMode(self):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        LazyLoadModeConfig = self.GetResourcePath("LazyLoadMode.cfg")
+        with open(LazyLoadModeConfig, "w") as OpenedConfig:
+            OpenedConfig.write(json.dumps(self.LazyLoadMode))
+
+    def LoadCompactMode(self):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        CompactModeConfig = self.GetResourcePath("CompactMode.cfg")
+        if os.path.isfile(CompactModeConfig):
+            with open(CompactModeConfig, "r") as OpenedConfig:
+                self.CompactMode = json.loads(OpenedConfig.read())
+
+    def SaveCompactMode(self):
+        from Interface.MainWindow import MainWindow
+        assert isinstance(self, MainWindow)
+        CompactModeConfig = self.GetResourcePath("CompactMode.cfg")
+        with open(CompactModeConfig, "w") as OpenedConfig:
+            OpenedConfig.write(json.dumps(self.CompactMode))
@@ -0,0 +1,104 @@
+import os
+import tempfile
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from SaveAndLoad import Compression, NotebookContainer
+from SaveAndLoad.NotebookDatabase import NotebookDatabase
+
+
+class SaveWorker(QThread):
+    Progress = pyqtSignal(str)
+    Completed = pyqtSignal(bool, str)
+
+    def __init__(self, ObjectToSave, SaveFileName, JSONSerializer, CompressionCodec=None, CompressionLevel=None, ParallelCompression=False, CompactMode=False, SkipSerialization=False, ExportMode=False, ObsoleteJournalPath=None, DatabaseMode=False, BinaryMode=False):
+        super().__init__()
+
+        # Store Parameters
+        self.ObjectToSave = ObjectToSave
+        self.SaveFileName = SaveFileName
+        self.JSONSerializer = JSONSerializer
+        self.CompressionCodec = CompressionCodec
+        self.CompressionLevel = CompressionLevel
+        self.ParallelCompression = ParallelCompression
+        self.CompactMode = CompactMode
+        self.SkipSerialization = SkipSerialization
+        self.ExportMode = ExportMode
+        self.ObsoleteJournalPath = ObsoleteJournalPath
+        self.DatabaseMode = DatabaseMode
+        self.BinaryMode = BinaryMode
+
+        # Variables
+        self.Succeeded = False
+        self.ErrorString = ""
+        self.Umask = self.GetUmask()
+
+    def run(self):
+        TemporaryFileName = None
+        try:
+            SaveDirectory = os.path.dirname(os.path.abspath(self.SaveFileName))
+            TemporaryFileDescriptor, TemporaryFileName = tempfile.mkstemp(prefix="." + os.path.basename(self.SaveFileName) + ".", suffix=".tmp", dir=SaveDirectory)
+            if self.DatabaseMode:
+                os.close(TemporaryFileDescriptor)
+                self.WriteDatabase(TemporaryFileName)
+            elif self.BinaryMode:
+                self.WriteBinary(TemporaryFileDescriptor)
+            else:
+                self.WriteJSON(TemporaryFileDescriptor)
+            if os.path.isfile(self.SaveFileName):
+                os.chmod(TemporaryFileName, os.stat(self.SaveFileName).st_mode & 0o777)
+            else:
+                os.chmod(TemporaryFileName, 0o666 & ~self.Umask)
+            os.replace(TemporaryFileName, self.SaveFileName)
+            TemporaryFileName = None
+            if self.ObsoleteJournalPath is not None and os.path.isfile(self.ObsoleteJournalPath):
+                os.remove(self.ObsoleteJournalPath)
+            self.SyncDirectory(SaveDirectory)
+            self.Succeeded = True
+        except Exception as Error:
+            self.ErrorString = str(Error)
+            if TemporaryFileName is not None and os.path.isfile(TemporaryFileName):
+                os.remove(TemporaryFileName)
+        self.Completed.emit(self.Succeeded, self.ErrorString)
+
+    def WriteJSON(self, TemporaryFileDescriptor):
+        with os.fdopen(TemporaryFileDescriptor, "wb") as TemporaryFile:
+            self.Progress.emit("Serializing " + os.path.basename(self.SaveFileName) + "...")
+            SaveString = self.JSONSerializer.SerializeDataToJSONString(self.ObjectToSave, Compact=self.CompactMode) if not self.SkipSerialization else self.ObjectToSave
+            SaveBytes = SaveString.encode("utf-8")
+            if self.CompressionCodec is not None:
+                self.Progress.emit("Compressing " + os.path.basename(self.SaveFileName) + "...")
+                SaveBytes = Compression.CompressData(SaveBytes, self.CompressionCodec, Level=self.CompressionLevel, Parallel=self.ParallelCompression)
+            self.Progress.emit("Writing " + os.path.basename(self.SaveFileName) + "...")
+            TemporaryFile.write(SaveBytes)
+            TemporaryFile.flush()
+            os.fsync(TemporaryFile.fileno())
+
+    def WriteBinary(self, TemporaryFileDescriptor):
+        with os.fdopen(TemporaryFileDescriptor, "wb") as TemporaryFile:
+            self.Progress.emit("Writing " + os.path.basename(self.SaveFileName) + "...")
+            NotebookContainer.WriteContainer(TemporaryFile, self.ObjectToSave, self.JSONSerializer, CodecName=self.CompressionCodec, Level=self.CompressionLevel, Parallel=self.ParallelCompression)
+            TemporaryFile.flush()
+            os.fsync(TemporaryFile.fileno())
+
+    def WriteDatabase(self, TemporaryFileName):
+        self.Progress.emit("Writing " + os.path.basename(self.SaveFileName) + "...")
+        DatabaseInst = NotebookDatabase(TemporaryFileName)
+        try:
+            DatabaseInst.WriteNotebook(self.ObjectToSave)
+        finally:
+            DatabaseInst.Close()
+
+    def SyncDirectory(self, Directory):
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        DirectoryDescriptor = os.open(Directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(DirectoryDescriptor)
+        finally:
+            os.close(DirectoryDescriptor)
+
+    def GetUmask(self):
+        Umask = os.umask(0)
+        os.umask(Umask)
+        return Umask
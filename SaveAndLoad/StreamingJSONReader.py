@@ -0,0 +1,89 @@
+import json
+import re
+
+
+class StreamingJSONReader:
+    def __init__(self, TextStream, Decoder, ChunkSize=1 << 16):
+        # Store Parameters
+        self.TextStream = TextStream
+        self.Decoder = Decoder
+        self.ChunkSize = ChunkSize
+
+        # Variables
+        self.Buffer = ""
+        self.Position = 0
+        self.EndOfStream = False
+        self.WhitespacePattern = re.compile(r"[ \t\n\r]*")
+
+    # Buffer Methods
+    def ReadChunk(self, MinimumSize=0):
+        Chunk = self.TextStream.read(max(self.ChunkSize, MinimumSize))
+        if Chunk == "":
+            self.EndOfStream = True
+            return False
+        self.Buffer = self.Buffer[self.Position:] + Chunk
+        self.Position = 0
+        return True
+
+    def SkipWhitespace(self):
+        while True:
+            self.Position = self.WhitespacePattern.match(self.Buffer, self.Position).end()
+            if self.Position < len(self.Buffer) or not self.ReadChunk():
+                return
+
+    # Token Methods
+    def PeekCharacter(self):
+        self.SkipWhitespace()
+        return self.Buffer[self.Position] if self.Position < len(self.Buffer) else ""
+
+    def ReadCharacter(self, ExpectedCharacters):
+        Character = self.PeekCharacter()
+        if Character == "" or Character not in ExpectedCharacters:
+            raise ValueError("Expected one of " + repr(ExpectedCharacters) + " but found " + repr(Character) + ".")
+        self.Position += 1
+        return Character
+
+    def ReadValue(self):
+        self.SkipWhitespace()
+        while True:
+            try:
+                Value, End = self.Decoder.raw_decode(self.Buffer, self.Position)
+                if End < len(self.Buffer) or self.EndOfStream:
+                    self.Position = End
+                    return Value
+            except json.JSONDecodeError:
+                if self.EndOfStream:
+                    raise
+
+            # Grow the unread buffer geometrically so large values are not rescanned once per chunk
+            self.ReadChunk(len(self.Buffer) - self.Position)
+
+    def ReadObjectKeys(self):
+        self.ReadCharacter("{")
+        if self.PeekCharacter() == "}":
+            self.Position += 1
+            return
+        while True:
+            Key = self.ReadValue()
+            if type(Key) != str:
+                raise ValueError("Expected an object key but found " + repr(Key) + ".")
+            self.ReadCharacter(":")
+            yield Key
+            if self.ReadCharacter(",}") == "}":
+                return
+
+    def ReadArrayItems(self):
+        self.ReadCharacter("[")
+        if self.PeekCharacter() == "]":
+            self.Position += 1
+            return
+        Index = 0
+        while True:
+            yield Index
+            if self.ReadCharacter(",]") == "]":
+                return
+            Index += 1
+
+    def ReadEnd(self):
+        if self.PeekCharacter() != "":
+            raise ValueError("Extra data after the end of the JSON document.")